@@ -0,0 +1,339 @@
+"""
+Benchmarks for the vexen-user repository and service layers.
+
+Runs each operation against a seeded aiosqlite database at several concurrency
+levels and reports ops/sec and latency percentiles. Seeded databases are kept
+in benchmarks/.data and reused, so only the first run for a size pays for it;
+each run works on a throwaway copy, so writes never leak into the next run.
+
+Usage:
+	python benchmarks/run.py --users 10k --concurrency 1,8,32
+	python benchmarks/run.py --users 1m --layer repository --ops get_by_id,list_deep
+	python benchmarks/run.py --save-baseline benchmarks/baseline.json
+	python benchmarks/run.py --baseline benchmarks/baseline.json --tolerance 0.15
+
+With --baseline the exit code is 1 when an operation is slower than the
+baseline by more than the tolerance (lower ops/sec or higher p99).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vexen_user import VexenUser  # noqa: E402
+from vexen_user.application.dto import CreateUserRequest, UpdateUserRequest  # noqa: E402
+from vexen_user.domain.entity import User  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+SEED_BATCH = 5_000
+SEED = 20240101
+NAMES = ["Ana", "Bruno", "Carla", "Diego", "Elena", "Franco", "Gabriela", "Hugo", "Irene", "Juan"]
+SURNAMES = ["García", "López", "Martínez", "Pérez", "Sánchez", "Romero", "Torres", "Díaz"]
+
+Operation = Callable[[VexenUser, random.Random], Awaitable[object]]
+
+
+@dataclass
+class Result:
+	"""Measurements of one operation at one concurrency level"""
+
+	operation: str
+	concurrency: int
+	ops: int
+	seconds: float
+	ops_per_sec: float
+	p50_ms: float
+	p95_ms: float
+	p99_ms: float
+	max_ms: float
+
+	@property
+	def key(self) -> str:
+		return f"{self.operation}@{self.concurrency}"
+
+
+def parse_size(value: str) -> int:
+	"""Parse 10k / 1m / 2500 style dataset sizes"""
+	value = value.strip().lower()
+	multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1], 1)
+	return int(float(value.rstrip("km")) * multiplier)
+
+
+def percentile(ordered: list[float], quantile: float) -> float:
+	return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def seed(vexen_user: VexenUser, size: int) -> None:
+	"""Insert size deterministic users (skipped when the database already has them)"""
+	existing = (await vexen_user.repository.get_stats())["total"]
+	if existing >= size:
+		return
+
+	rng = random.Random(SEED)
+	start = datetime(2023, 1, 1)
+	print(f"Seeding {size - existing:,} users...", file=sys.stderr)
+	for offset in range(existing, size, SEED_BATCH):
+		users = [
+			User(
+				id=None,
+				email=f"user{index}@bench.example",
+				name=f"{rng.choice(NAMES)} {rng.choice(SURNAMES)} {index}",
+				status="active" if rng.random() < 0.8 else "inactive",
+				created_at=start + timedelta(seconds=index * 30),
+				last_login=start + timedelta(days=rng.randint(0, 700)),
+				user_metadata={"department": rng.choice(["sales", "it", "ops", "hr"])},
+			)
+			for index in range(offset, min(offset + SEED_BATCH, size))
+		]
+		await vexen_user.repository.bulk_create(users)
+
+
+async def sample_ids(vexen_user: VexenUser, count: int) -> list[str]:
+	"""Collect existing user ids to look up"""
+	ids: list[str] = []
+	# Closing the stream releases its connection when we stop early
+	async with aclosing(vexen_user.repository.stream_all(batch_size=count)) as users:
+		async for user in users:
+			ids.append(str(user.id))
+			if len(ids) >= count:
+				break
+	return ids
+
+
+async def seeded_database(size_label: str, size: int, search_backend: str) -> Path:
+	"""Path of the pristine seeded database for a size, seeding it first if needed"""
+	DATA_DIR.mkdir(exist_ok=True)
+	database = DATA_DIR / f"users_{size_label.lower()}_{search_backend}.db"
+	vexen_user = VexenUser(
+		database_url=f"sqlite+aiosqlite:///{database}", search_backend=search_backend
+	)
+	await vexen_user.init()
+	try:
+		await seed(vexen_user, size)
+	finally:
+		await vexen_user.close()
+	return database
+
+
+def build_operations(
+	layer: str, size: int, ids: list[str], created: itertools.count
+) -> dict[str, Operation]:
+	"""Operations by name, calling either the repository or the service"""
+	page_size = 20
+	deep_page = max(1, size // page_size - 1)
+
+	def email(rng: random.Random) -> str:
+		return f"user{rng.randrange(size)}@bench.example"
+
+	def new_email() -> str:
+		return f"bench-{time.time_ns()}-{next(created)}@bench.example"
+
+	if layer == "repository":
+		return {
+			"get_by_id": lambda vu, rng: vu.repository.get_by_id(rng.choice(ids)),
+			"get_by_email": lambda vu, rng: vu.repository.get_by_email(email(rng)),
+			"create": lambda vu, rng: vu.repository.save(
+				User(id=None, email=new_email(), name="Bench User")
+			),
+			"update": lambda vu, rng: vu.repository.update_partial(
+				rng.choice(ids), {"name": f"Renamed {rng.random():.6f}"}
+			),
+			"list_shallow": lambda vu, rng: vu.repository.list_paginated(
+				rng.randint(1, 5), page_size
+			),
+			"list_deep": lambda vu, rng: vu.repository.list_paginated(deep_page, page_size),
+			"list_search": lambda vu, rng: vu.repository.list_paginated(
+				1, page_size, search=rng.choice(SURNAMES)
+			),
+			"get_stats": lambda vu, rng: vu.repository.get_stats(),
+		}
+
+	async def checked(response_awaitable: Awaitable) -> object:
+		response = await response_awaitable
+		if not response.success:
+			raise RuntimeError(response.error)
+		return response
+
+	return {
+		"get_by_id": lambda vu, rng: checked(vu.service.get(rng.choice(ids))),
+		# The service has no email lookup; this one goes through the repository
+		"get_by_email": lambda vu, rng: vu.repository.get_by_email(email(rng)),
+		"create": lambda vu, rng: checked(
+			vu.service.create(CreateUserRequest(email=new_email(), name="Bench", password="x"))
+		),
+		"update": lambda vu, rng: checked(
+			vu.service.update(rng.choice(ids), UpdateUserRequest(name=f"Renamed {rng.random()}"))
+		),
+		"list_shallow": lambda vu, rng: checked(
+			vu.service.list(page=rng.randint(1, 5), page_size=page_size)
+		),
+		"list_deep": lambda vu, rng: checked(vu.service.list(page=deep_page, page_size=page_size)),
+		"list_search": lambda vu, rng: checked(
+			vu.service.list(page=1, page_size=page_size, search=rng.choice(SURNAMES))
+		),
+		"get_stats": lambda vu, rng: checked(vu.service.stats()),
+	}
+
+
+async def measure(
+	vexen_user: VexenUser,
+	name: str,
+	operation: Operation,
+	concurrency: int,
+	total_ops: int,
+	warmup: int,
+) -> Result:
+	"""Run total_ops calls spread over concurrency workers"""
+	rng = random.Random(SEED)
+	for _ in range(warmup):
+		await operation(vexen_user, rng)
+
+	remaining = total_ops
+	latencies: list[float] = []
+
+	async def worker(worker_rng: random.Random) -> None:
+		nonlocal remaining
+		while remaining > 0:
+			remaining -= 1
+			started = time.perf_counter()
+			await operation(vexen_user, worker_rng)
+			latencies.append(time.perf_counter() - started)
+
+	started = time.perf_counter()
+	await asyncio.gather(*(worker(random.Random(SEED + i)) for i in range(concurrency)))
+	seconds = time.perf_counter() - started
+
+	latencies.sort()
+	return Result(
+		operation=name,
+		concurrency=concurrency,
+		ops=len(latencies),
+		seconds=seconds,
+		ops_per_sec=len(latencies) / seconds,
+		p50_ms=percentile(latencies, 0.50) * 1000,
+		p95_ms=percentile(latencies, 0.95) * 1000,
+		p99_ms=percentile(latencies, 0.99) * 1000,
+		max_ms=latencies[-1] * 1000,
+	)
+
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> list[str]:
+	"""Regressions of results against a stored baseline"""
+	regressions = []
+	for result in results:
+		reference = baseline.get("results", {}).get(result.key)
+		if reference is None:
+			continue
+		throughput = result.ops_per_sec / reference["ops_per_sec"] - 1
+		tail = result.p99_ms / reference["p99_ms"] - 1 if reference["p99_ms"] else 0.0
+		print(f"  {result.key:<24} ops/s {throughput:+7.1%}   p99 {tail:+7.1%}")
+		if throughput < -tolerance or tail > tolerance:
+			regressions.append(result.key)
+	return regressions
+
+
+def print_results(results: list[Result]) -> None:
+	header = f"{'operation':<14}{'conc':>5}{'ops/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+	print(header)
+	print("-" * len(header))
+	for r in results:
+		print(
+			f"{r.operation:<14}{r.concurrency:>5}{r.ops_per_sec:>11.1f}"
+			f"{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}{r.p99_ms:>9.2f}"
+		)
+
+
+async def main(args: argparse.Namespace) -> int:
+	size = parse_size(args.users)
+	pristine = await seeded_database(args.users, size, args.search_backend)
+
+	concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+	with tempfile.TemporaryDirectory(dir=DATA_DIR) as scratch:
+		# create and update write to the copy; the seeded file stays as seeded
+		database = Path(scratch) / pristine.name
+		shutil.copyfile(pristine, database)
+		vexen_user = VexenUser(
+			database_url=f"sqlite+aiosqlite:///{database}",
+			search_backend=args.search_backend,
+			pool_size=max(concurrency_levels),
+			max_overflow=0,
+		)
+		await vexen_user.init()
+		try:
+			ids = await sample_ids(vexen_user, 1_000)
+			operations = build_operations(args.layer, size, ids, itertools.count())
+			selected = args.ops.split(",") if args.ops else list(operations)
+
+			results = []
+			for name in selected:
+				for concurrency in concurrency_levels:
+					results.append(
+						await measure(
+							vexen_user,
+							name,
+							operations[name],
+							concurrency,
+							args.ops_count,
+							args.warmup,
+						)
+					)
+		finally:
+			await vexen_user.close()
+
+	print(f"\n{size:,} users, {args.layer} layer, search={args.search_backend}\n")
+	print_results(results)
+
+	report = {
+		"users": size,
+		"layer": args.layer,
+		"search_backend": args.search_backend,
+		"python": platform.python_version(),
+		"machine": platform.machine(),
+		"results": {result.key: asdict(result) for result in results},
+	}
+	if args.save_baseline:
+		Path(args.save_baseline).write_text(json.dumps(report, indent=2))
+		print(f"\nBaseline saved to {args.save_baseline}")
+
+	if args.baseline:
+		baseline = json.loads(Path(args.baseline).read_text())
+		print(f"\nAgainst {args.baseline} (tolerance {args.tolerance:.0%}):")
+		for setting in ("users", "layer", "search_backend", "machine"):
+			if baseline.get(setting) != report[setting]:
+				print(
+					f"  note: baseline {setting}={baseline.get(setting)!r}, now {report[setting]!r}"
+				)
+		regressions = compare(results, baseline, args.tolerance)
+		if regressions:
+			print(f"\nRegressions: {', '.join(regressions)}")
+			return 1
+	return 0
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+	parser.add_argument("--users", default="10k", help="Seeded dataset size (10k, 1m, ...)")
+	parser.add_argument("--layer", choices=["service", "repository"], default="service")
+	parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated levels")
+	parser.add_argument("--ops", default="", help="Comma-separated operations (default: all)")
+	parser.add_argument("--ops-count", type=int, default=500, help="Calls per measurement")
+	parser.add_argument("--warmup", type=int, default=20, help="Untimed calls before measuring")
+	parser.add_argument("--search-backend", default="ilike", choices=["ilike", "fts5"])
+	parser.add_argument("--baseline", help="Baseline JSON to compare against")
+	parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression")
+	parser.add_argument("--save-baseline", help="Write results as a baseline JSON")
+	sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,33 @@
+"""Shared fixtures: VexenUser instances on a temporary SQLite database."""
+
+import pytest
+
+from vexen_user import VexenUser
+
+
+@pytest.fixture
+def database_url(tmp_path) -> str:
+	return f"sqlite+aiosqlite:///{tmp_path / 'users.db'}"
+
+
+@pytest.fixture
+async def make_vexen_user(database_url):
+	"""Build initialized VexenUser instances, on the temporary database unless overridden"""
+	systems: list[VexenUser] = []
+
+	async def make(**options) -> VexenUser:
+		options.setdefault("database_url", database_url)
+		system = VexenUser(**options)
+		await system.init()
+		systems.append(system)
+		return system
+
+	yield make
+
+	for system in systems:
+		await system.close()
+
+
+@pytest.fixture
+async def vexen_user(make_vexen_user) -> VexenUser:
+	return await make_vexen_user()
@@ -0,0 +1,18 @@
+"""Request builders shared by the tests."""
+
+from vexen_user.application.dto import CreateUserRequest, ExternalLoginRequest
+
+
+def new_user(index: int, **fields) -> CreateUserRequest:
+	"""CreateUserRequest with a unique email per index"""
+	fields.setdefault("email", f"user{index}@example.com")
+	fields.setdefault("name", f"User {index}")
+	fields.setdefault("password", "secret")
+	return CreateUserRequest(**fields)
+
+
+def external_login(provider_user_id: str, email: str, **fields) -> ExternalLoginRequest:
+	"""ExternalLoginRequest for the "google" provider"""
+	fields.setdefault("provider", "google")
+	fields.setdefault("name", email.partition("@")[0])
+	return ExternalLoginRequest(provider_user_id=provider_user_id, email=email, **fields)
@@ -0,0 +1,46 @@
+"""Bulk create and upsert of user imports."""
+
+from tests.factories import new_user
+from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.user_repository import (
+	BULK_CHUNK_SIZE,
+)
+
+
+async def test_bulk_create_reports_each_row(vexen_user):
+	await vexen_user.service.create(new_user(1))
+
+	response = await vexen_user.service.bulk_create(
+		[new_user(1), new_user(2), new_user(2, name="Again")]
+	)
+
+	assert response.success
+	assert [(result.success, result.error) for result in response.data] == [
+		(False, "User with email user1@example.com already exists"),
+		(True, None),
+		(False, "Duplicate email user2@example.com in batch"),
+	]
+	assert response.data[1].data.name == "User 2"
+	assert (await vexen_user.service.stats()).data.total == 2
+
+
+async def test_bulk_upsert_updates_existing_users_across_chunks(vexen_user):
+	existing = await vexen_user.service.create(new_user(0, name="Old"))
+	batch = [new_user(index, name=f"Imported {index}") for index in range(BULK_CHUNK_SIZE + 5)]
+
+	response = await vexen_user.service.bulk_upsert(batch)
+
+	assert all(result.success for result in response.data)
+	assert response.data[0].data.id == existing.data.id
+	assert response.data[0].data.name == "Imported 0"
+	assert (await vexen_user.service.stats()).data.total == BULK_CHUNK_SIZE + 5
+
+
+async def test_bulk_create_reuses_the_email_of_a_soft_deleted_user(make_vexen_user):
+	vexen_user = await make_vexen_user(soft_delete=True)
+	gone = await vexen_user.service.create(new_user(1))
+	await vexen_user.service.remove(gone.data.id)
+
+	response = await vexen_user.service.bulk_create([new_user(1)])
+
+	assert response.data[0].success, response.data[0].error
+	assert response.data[0].data.id != gone.data.id
@@ -0,0 +1,68 @@
+"""Hard delete, soft delete and purging of tombstones."""
+
+import sqlite3
+from datetime import timedelta
+
+from tests.factories import external_login, new_user
+
+
+def _count_identities(tmp_path) -> int:
+	connection = sqlite3.connect(tmp_path / "users.db")
+	try:
+		return connection.execute("SELECT count(*) FROM user_external_identities").fetchone()[0]
+	finally:
+		connection.close()
+
+
+async def test_hard_delete_removes_identities_so_the_login_provisions_again(vexen_user, tmp_path):
+	old = await vexen_user.identities.login(external_login("g1", "ann@example.com"))
+
+	removed = await vexen_user.service.remove(old.data.user.id)
+
+	assert removed.success
+	assert _count_identities(tmp_path) == 0
+	again = await vexen_user.identities.login(external_login("g1", "ann@example.com"))
+	assert again.success, again.error
+	assert again.data.created and again.data.user.id != old.data.user.id
+
+
+async def test_soft_deleted_user_is_hidden_and_frees_the_email(make_vexen_user):
+	vexen_user = await make_vexen_user(soft_delete=True)
+	kept = await vexen_user.service.create(new_user(1))
+	gone = await vexen_user.service.create(new_user(2, email="bob@example.com"))
+
+	await vexen_user.service.remove(gone.data.id)
+
+	assert not (await vexen_user.service.get(gone.data.id)).success
+	assert not (await vexen_user.service.remove(gone.data.id)).success
+	listed = await vexen_user.service.list(page_size=10)
+	assert [user.id for user in listed.data] == [kept.data.id]
+	assert (await vexen_user.service.stats()).data.total == 1
+	reused = await vexen_user.service.create(new_user(3, email="bob@example.com"))
+	assert reused.success, reused.error
+
+
+async def test_purge_removes_expired_tombstones_in_batches(make_vexen_user, tmp_path):
+	vexen_user = await make_vexen_user(soft_delete=True)
+	for index in range(5):
+		login = await vexen_user.identities.login(
+			external_login(f"g{index}", f"user{index}@example.com")
+		)
+		await vexen_user.service.remove(login.data.user.id)
+
+	kept = await vexen_user.service.purge_deleted(timedelta(days=1), batch_size=2)
+	purged = await vexen_user.service.purge_deleted(timedelta(0), batch_size=2)
+
+	assert kept.data == 0
+	assert purged.data == 5
+	assert _count_identities(tmp_path) == 0
+	assert (await vexen_user.service.purge_deleted(timedelta(0))).data == 0
+
+
+async def test_purge_rejects_an_empty_batch(make_vexen_user):
+	vexen_user = await make_vexen_user(soft_delete=True)
+
+	response = await vexen_user.service.purge_deleted(timedelta(0), batch_size=0)
+
+	assert not response.success
+	assert "batch_size" in response.error
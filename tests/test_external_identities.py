@@ -0,0 +1,103 @@
+"""External identity login, provisioning and linking."""
+
+import sqlite3
+
+from tests.factories import external_login, new_user
+from vexen_user.application.dto import LinkIdentityRequest
+
+
+async def test_first_login_provisions_and_later_logins_reuse_the_user(vexen_user):
+	first = await vexen_user.identities.login(external_login("g1", "ann@example.com"))
+	second = await vexen_user.identities.login(external_login("g1", "ann@example.com"))
+
+	assert first.success and first.data.created
+	assert second.success and not second.data.created
+	assert second.data.user.id == first.data.user.id
+	assert second.data.user.last_login > first.data.user.last_login
+	identities = await vexen_user.identities.list(first.data.user.id)
+	assert [identity.provider_user_id for identity in identities.data] == ["g1"]
+
+
+async def test_login_with_a_taken_email_needs_link_existing_email(vexen_user):
+	existing = await vexen_user.service.create(new_user(1, email="bob@example.com"))
+
+	refused = await vexen_user.identities.login(external_login("g2", "bob@example.com"))
+	linked = await vexen_user.identities.login(
+		external_login("g2", "bob@example.com", link_existing_email=True)
+	)
+
+	assert not refused.success
+	assert linked.success and not linked.data.created
+	assert linked.data.user.id == existing.data.id
+	found = await vexen_user.identities.find_user("google", "g2")
+	assert found.data.id == existing.data.id
+
+
+async def test_identity_of_a_live_user_cannot_be_linked_to_another(vexen_user):
+	owner = await vexen_user.identities.login(external_login("g3", "cy@example.com"))
+	other = await vexen_user.service.create(new_user(2))
+
+	response = await vexen_user.identities.link(
+		other.data.id, LinkIdentityRequest(provider="google", provider_user_id="g3")
+	)
+
+	assert not response.success
+	assert "already linked" in response.error
+	found = await vexen_user.identities.find_user("google", "g3")
+	assert found.data.id == owner.data.user.id
+
+
+async def test_relinking_the_same_user_refreshes_provider_data(vexen_user):
+	login = await vexen_user.identities.login(external_login("g4", "dee@example.com"))
+
+	response = await vexen_user.identities.link(
+		login.data.user.id,
+		LinkIdentityRequest(provider="google", provider_user_id="g4", provider_data={"v": 2}),
+	)
+
+	assert response.success
+	assert response.data.provider_data == {"v": 2}
+
+
+async def test_login_refreshes_the_cached_user(make_vexen_user):
+	vexen_user = await make_vexen_user(cache=True)
+	first = await vexen_user.identities.login(external_login("g5", "eve@example.com"))
+	user_id = first.data.user.id
+	await vexen_user.service.get(user_id)
+
+	second = await vexen_user.identities.login(external_login("g5", "eve@example.com"))
+	cached = await vexen_user.service.get(user_id)
+
+	assert cached.data.last_login == second.data.user.last_login
+	assert cached.data.last_login > first.data.user.last_login
+
+
+async def test_identity_of_a_soft_deleted_user_moves_to_the_new_account(make_vexen_user):
+	vexen_user = await make_vexen_user(soft_delete=True)
+	# Other live owners must not matter, only the one the identity points to
+	await vexen_user.identities.login(external_login("g5", "eve@example.com"))
+	old = await vexen_user.identities.login(external_login("g6", "fay@example.com"))
+	await vexen_user.service.remove(old.data.user.id)
+
+	again = await vexen_user.identities.login(external_login("g6", "fay@example.com"))
+
+	assert again.success and again.data.created
+	assert again.data.user.id != old.data.user.id
+	found = await vexen_user.identities.find_user("google", "g6")
+	assert found.data.id == again.data.user.id
+
+
+async def test_identity_left_behind_by_a_missing_user_can_be_linked_again(vexen_user, tmp_path):
+	old = await vexen_user.identities.login(external_login("g7", "gus@example.com"))
+	# A user removed without its identities (e.g. SQLite without enforced foreign keys)
+	connection = sqlite3.connect(tmp_path / "users.db")
+	connection.execute("DELETE FROM users")
+	connection.commit()
+	connection.close()
+
+	again = await vexen_user.identities.login(external_login("g7", "gus@example.com"))
+
+	assert again.success, again.error
+	assert again.data.created and again.data.user.id != old.data.user.id
+	found = await vexen_user.identities.find_user("google", "g7")
+	assert found.data.id == again.data.user.id
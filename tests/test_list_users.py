@@ -0,0 +1,100 @@
+"""Offset and keyset pagination of ListUsers."""
+
+import json
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from tests.factories import new_user
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.dialect import (
+	ExplainJson,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.metadata_filters import (  # noqa: E501
+	metadata_filter_clause,
+)
+
+
+async def _create_users(vexen_user, count: int) -> list[str]:
+	ids = []
+	for index in range(count):
+		response = await vexen_user.service.create(new_user(index))
+		assert response.success, response.error
+		ids.append(response.data.id)
+	return ids
+
+
+async def test_cursor_pages_walk_every_user_once_in_list_order(vexen_user):
+	await _create_users(vexen_user, 7)
+	# SQLite's CURRENT_TIMESTAMP has second resolution: ties are broken by id
+	expected = [user.id for user in (await vexen_user.service.list(page_size=100)).data]
+
+	first = await vexen_user.service.list(page_size=3)
+	assert first.pagination.has_prev is False
+	seen = [user.id for user in first.data]
+	cursor = first.pagination.next_cursor
+
+	while cursor is not None:
+		page = await vexen_user.service.list(page_size=3, cursor=cursor)
+		assert page.success, page.error
+		assert page.pagination.has_prev is None
+		assert page.pagination.total_items is None
+		seen.extend(user.id for user in page.data)
+		cursor = page.pagination.next_cursor
+
+	assert seen == expected
+	assert len(set(seen)) == 7
+
+
+async def test_cursor_page_skips_users_deleted_before_the_cursor(vexen_user):
+	ids = await _create_users(vexen_user, 4)
+	first = await vexen_user.service.list(page_size=2)
+
+	for user in first.data:
+		await vexen_user.service.remove(user.id)
+	page = await vexen_user.service.list(page_size=2, cursor=first.pagination.next_cursor)
+
+	assert {user.id for user in page.data} == set(ids) - {user.id for user in first.data}
+	assert page.pagination.has_next is False
+	assert page.pagination.next_cursor is None
+
+
+async def test_offset_page_reports_has_prev_and_totals(vexen_user):
+	await _create_users(vexen_user, 5)
+
+	page = await vexen_user.service.list(page=2, page_size=2)
+
+	assert page.pagination.has_prev is True
+	assert page.pagination.has_next is True
+	assert page.pagination.total_items == 5
+	assert page.pagination.total_pages == 3
+
+
+async def test_invalid_cursor_fails(vexen_user):
+	response = await vexen_user.service.list(cursor="not-a-cursor")
+
+	assert not response.success
+
+
+async def test_estimated_count_with_metadata_filters(vexen_user):
+	await vexen_user.service.create(new_user(1, user_metadata={"department": "eng"}))
+	await vexen_user.service.create(new_user(2, user_metadata={"department": "ops"}))
+
+	page = await vexen_user.service.list(
+		count_mode="estimated", metadata_filters={"department": "eng"}
+	)
+
+	assert page.success, page.error
+	assert page.pagination.total_items == 1
+	assert [user.email for user in page.data] == ["user1@example.com"]
+
+
+def test_postgresql_estimate_serializes_jsonb_filters():
+	stmt = select(UserModel.id).where(metadata_filter_clause("postgresql", {"department": "eng"}))
+
+	compiled = ExplainJson(stmt).compile(dialect=asyncpg.dialect())
+
+	assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT users.id")
+	# The bind processors applied on execution turn the filter into JSON text for asyncpg
+	((name, value),) = compiled.construct_params().items()
+	assert json.loads(compiled._bind_processors[name](value)) == {"department": "eng"}
@@ -0,0 +1,119 @@
+"""Schema bootstrap run by init()."""
+
+import asyncio
+import sqlite3
+
+from tests.factories import new_user
+from vexen_user import VexenUser
+from vexen_user.infraestructure.output.persistence.sqlalchemy.schema import SCHEMA_VERSION
+from vexen_user.infraestructure.output.persistence.sqlalchemy.search import (
+	IlikeSearchBackend,
+	TrigramSearchBackend,
+)
+
+
+class _IndexedSearchBackend(IlikeSearchBackend):
+	"""ILIKE search declaring a partial index, like the trigram backend on PostgreSQL"""
+
+	def indexes(self) -> dict[str, str]:
+		return {"ix_users_live_name_lower": "ON users (lower(name)) WHERE deleted_at IS NULL"}
+
+
+async def test_concurrent_cold_starts_do_not_collide(database_url, tmp_path):
+	systems = [VexenUser(database_url=database_url) for _ in range(4)]
+	try:
+		await asyncio.gather(
+			*(
+				system.init(create_schema="check" if index % 2 else "create")
+				for index, system in enumerate(systems)
+			)
+		)
+	finally:
+		for system in systems:
+			await system.close()
+
+	connection = sqlite3.connect(tmp_path / "users.db")
+	versions = dict(connection.execute("SELECT component, version FROM vexen_user_schema_version"))
+	connection.close()
+	assert versions == {"schema": SCHEMA_VERSION, "search:ilike": SCHEMA_VERSION}
+
+
+def _downgrade_to_old_layout(path) -> None:
+	"""Turn the users table into the layout of a release without soft delete"""
+	connection = sqlite3.connect(path)
+	for name in (
+		"ux_users_live_email",
+		"ix_users_live_created_at_id",
+		"ix_users_live_status_created_at",
+		"ix_users_live_role_status_created_at",
+		"ix_users_deleted_at",
+	):
+		connection.execute(f"DROP INDEX {name}")
+	connection.execute("ALTER TABLE users DROP COLUMN deleted_at")
+	connection.execute("CREATE UNIQUE INDEX ix_users_email ON users (email)")
+	connection.execute("CREATE INDEX ix_users_status ON users (status)")
+	connection.execute("UPDATE vexen_user_schema_version SET version = 4")
+	connection.commit()
+	connection.close()
+
+
+def _index_names(path) -> set[str]:
+	connection = sqlite3.connect(path)
+	rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+	connection.close()
+	return {name for (name,) in rows}
+
+
+async def test_init_adds_columns_and_leaves_indexes_to_migrate_schema(
+	make_vexen_user, database_url, tmp_path, caplog
+):
+	path = tmp_path / "users.db"
+	await (await make_vexen_user()).close()
+	_downgrade_to_old_layout(path)
+
+	vexen_user = VexenUser(database_url=database_url)
+	try:
+		await vexen_user.init(create_schema="check")
+		assert "index ix_users_deleted_at" in caplog.text
+		assert "ix_users_email" in _index_names(path)
+		assert (await vexen_user.service.create(new_user(1))).success
+		assert (await vexen_user.service.list()).pagination.total_items == 1
+
+		assert await vexen_user.migrate_schema()
+		indexes = _index_names(path)
+		assert {"ux_users_live_email", "ix_users_deleted_at"} <= indexes
+		assert not {"ix_users_email", "ix_users_status"} & indexes
+		assert (await vexen_user.service.create(new_user(2))).success
+		assert not await vexen_user.migrate_schema()
+		connection = sqlite3.connect(path)
+		(version,) = connection.execute(
+			"SELECT version FROM vexen_user_schema_version WHERE component = 'schema'"
+		).fetchone()
+		connection.close()
+		assert version == SCHEMA_VERSION
+	finally:
+		await vexen_user.close()
+
+
+async def test_search_indexes_are_built_by_migrate_schema_not_init(database_url, tmp_path, caplog):
+	vexen_user = VexenUser(database_url=database_url, search_backend=_IndexedSearchBackend())
+	try:
+		await vexen_user.init()
+		assert "index ix_users_live_name_lower" in caplog.text
+		assert "ix_users_live_name_lower" not in _index_names(tmp_path / "users.db")
+
+		assert await vexen_user.migrate_schema()
+		assert "ix_users_live_name_lower" in _index_names(tmp_path / "users.db")
+		assert not await vexen_user.migrate_schema()
+	finally:
+		await vexen_user.close()
+
+
+def test_trigram_indexes_cover_only_live_users():
+	definitions = TrigramSearchBackend().indexes()
+
+	assert set(definitions) == {"ix_users_live_name_trgm", "ix_users_live_email_trgm"}
+	assert all(
+		"gin_trgm_ops" in definition and definition.endswith("WHERE deleted_at IS NULL")
+		for definition in definitions.values()
+	)
@@ -0,0 +1,82 @@
+"""SQLite FTS5 search backend."""
+
+import sqlite3
+
+from tests.factories import new_user
+
+
+async def _names(vexen_user, search: str) -> list[str]:
+	response = await vexen_user.service.list(search=search, page_size=100)
+	assert response.success, response.error
+	return sorted(user.name for user in response.data)
+
+
+async def test_fts_search_follows_inserts_updates_and_deletes(make_vexen_user):
+	vexen_user = await make_vexen_user(search_backend="fts5")
+	alice = await vexen_user.service.create(new_user(1, name="Alice Liddell"))
+	await vexen_user.service.create(new_user(2, name="Bob Alison"))
+	await vexen_user.service.create(new_user(3, name="Carol"))
+
+	assert await _names(vexen_user, "Ali") == ["Alice Liddell", "Bob Alison"]
+
+	await vexen_user.repository.update_partial(alice.data.id, {"name": "Dora"})
+	assert await _names(vexen_user, "Ali") == ["Bob Alison"]
+	assert await _names(vexen_user, "Dora") == ["Dora"]
+
+	await vexen_user.service.remove(alice.data.id)
+	assert await _names(vexen_user, "Dora") == []
+
+
+async def test_fts_search_survives_renumbered_rowids(make_vexen_user, tmp_path):
+	vexen_user = await make_vexen_user(search_backend="fts5")
+	ids = []
+	for index in range(6):
+		response = await vexen_user.service.create(
+			new_user(index, name=f"Person{index} Zeta{index}")
+		)
+		ids.append(response.data.id)
+	for user_id in ids[:3]:
+		await vexen_user.service.remove(user_id)
+	await vexen_user.close()
+
+	# VACUUM may renumber the implicit rowids of tables without INTEGER PRIMARY KEY
+	connection = sqlite3.connect(tmp_path / "users.db")
+	connection.execute("UPDATE users SET rowid = rowid + 1000")
+	connection.commit()
+	connection.execute("VACUUM")
+	connection.close()
+
+	vexen_user = await make_vexen_user(search_backend="fts5")
+	for index in range(3, 6):
+		assert await _names(vexen_user, f"Zeta{index}") == [f"Person{index} Zeta{index}"]
+
+
+async def test_fts_setup_replaces_the_rowid_keyed_layout(make_vexen_user, tmp_path):
+	vexen_user = await make_vexen_user()
+	await vexen_user.service.create(new_user(1, name="Legacy Person"))
+	await vexen_user.close()
+
+	connection = sqlite3.connect(tmp_path / "users.db")
+	connection.executescript(
+		"""
+		CREATE VIRTUAL TABLE users_fts USING fts5(
+			name, email, content='users', content_rowid='rowid', tokenize='trigram');
+		CREATE TRIGGER users_fts_ai AFTER INSERT ON users BEGIN
+			INSERT INTO users_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email);
+		END;
+		INSERT INTO users_fts(users_fts) VALUES ('rebuild');
+		"""
+	)
+	connection.close()
+
+	vexen_user = await make_vexen_user(search_backend="fts5")
+	await vexen_user.service.create(new_user(2, name="Fresh Person"))
+
+	assert await _names(vexen_user, "Person") == ["Fresh Person", "Legacy Person"]
+	connection = sqlite3.connect(tmp_path / "users.db")
+	triggers = {
+		row[0]
+		for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+	}
+	connection.close()
+	assert "users_fts_ai" not in triggers
@@ -0,0 +1,85 @@
+"""ShardedUserRepositoryAdapter over two SQLite databases."""
+
+import pytest
+
+from tests.factories import external_login, new_user
+from vexen_user import ShardMap
+
+
+@pytest.fixture
+def shard_map(tmp_path) -> ShardMap:
+	return ShardMap(
+		{name: f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("eu", "us")},
+		routes={"eu.example": "eu", "us.example": "us"},
+	)
+
+
+async def test_forgotten_locations_are_found_on_every_shard(make_vexen_user, shard_map):
+	vexen_user = await make_vexen_user(
+		database_url=None, shard_map=shard_map, shard_location_cache_size=1
+	)
+	eu = await vexen_user.service.create(new_user(1, email="ann@eu.example"))
+	us = await vexen_user.service.create(new_user(2, email="bob@us.example"))
+
+	assert len(vexen_user.repository._locations) == 1
+	assert (await vexen_user.service.get(eu.data.id)).data.email == "ann@eu.example"
+	assert (await vexen_user.service.get(us.data.id)).data.email == "bob@us.example"
+	assert await vexen_user.repository.locate(eu.data.id) == "eu"
+
+
+async def test_deep_offset_pages_point_to_cursors(make_vexen_user, shard_map):
+	vexen_user = await make_vexen_user(
+		database_url=None, shard_map=shard_map, shard_max_offset_rows=4
+	)
+	for index, region in enumerate(("eu", "us", "eu", "us", "eu")):
+		await vexen_user.service.create(new_user(index, email=f"user{index}@{region}.example"))
+
+	second = await vexen_user.service.list(page=2, page_size=2)
+	too_deep = await vexen_user.service.list(page=3, page_size=2)
+	first = await vexen_user.service.list(page_size=2)
+	rest = await vexen_user.service.list(page_size=10, cursor=first.pagination.next_cursor)
+
+	assert second.success and len(second.data) == 2
+	assert not too_deep.success and "cursor" in too_deep.error
+	assert len(first.data) + len(rest.data) == 5
+
+
+@pytest.fixture
+def tenant_shard_map(tmp_path) -> ShardMap:
+	return ShardMap(
+		{name: f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("acme", "globex")},
+		key="tenant",
+		routes={"acme": "acme", "globex": "globex"},
+	)
+
+
+async def test_first_external_login_is_placed_by_its_tenant(make_vexen_user, tenant_shard_map):
+	vexen_user = await make_vexen_user(database_url=None, shard_map=tenant_shard_map)
+
+	first = await vexen_user.identities.login(
+		external_login("g1", "ann@example.com", user_metadata={"tenant": "globex"})
+	)
+	again = await vexen_user.identities.login(external_login("g1", "ann@example.com"))
+	missing = await vexen_user.identities.login(external_login("g2", "bob@example.com"))
+
+	assert first.success and first.data.created, first.error
+	assert await vexen_user.repository.locate(first.data.user.id) == "globex"
+	assert again.success and again.data.user.id == first.data.user.id
+	assert not missing.success and "tenant" in missing.error
+
+
+async def test_user_read_without_metadata_is_saved_on_its_shard(make_vexen_user, tenant_shard_map):
+	vexen_user = await make_vexen_user(database_url=None, shard_map=tenant_shard_map)
+	created = await vexen_user.service.create(
+		new_user(1, email="ann@example.com", user_metadata={"tenant": "acme", "plan": "pro"})
+	)
+	repository = vexen_user.repository
+
+	user = await repository.get_by_email("ann@example.com")
+	user.name = "Ann B"
+	await repository.save(user)
+
+	stored = await repository.get_by_id(created.data.id)
+	assert stored.name == "Ann B"
+	assert stored.user_metadata == {"tenant": "acme", "plan": "pro"}
+	assert await repository.locate(created.data.id) == "acme"
@@ -0,0 +1,77 @@
+"""Coalescing of concurrent lookups and its interaction with writes."""
+
+import asyncio
+
+from tests.factories import new_user
+from vexen_user.shared.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+	single_flight = SingleFlight()
+	gate = asyncio.Event()
+	calls = 0
+
+	async def fetch():
+		nonlocal calls
+		calls += 1
+		await gate.wait()
+		return {"value": calls}
+
+	first = asyncio.create_task(single_flight.do("key", fetch))
+	second = asyncio.create_task(single_flight.do("key", fetch))
+	await asyncio.sleep(0)
+	gate.set()
+
+	assert await first == await second == {"value": 1}
+	assert calls == 1
+	assert len(single_flight) == 0
+
+
+async def test_forget_makes_later_callers_start_a_new_call():
+	single_flight = SingleFlight()
+	gate = asyncio.Event()
+	calls = 0
+
+	async def fetch():
+		nonlocal calls
+		calls += 1
+		result = calls
+		await gate.wait()
+		return result
+
+	first = asyncio.create_task(single_flight.do("key", fetch))
+	await asyncio.sleep(0)
+	single_flight.forget("key")
+	second = asyncio.create_task(single_flight.do("key", fetch))
+	await asyncio.sleep(0)
+	gate.set()
+
+	assert (await first, await second) == (1, 2)
+
+
+async def test_lookup_after_write_does_not_join_a_read_started_before_it(vexen_user):
+	adapter = vexen_user.repository
+	created = await vexen_user.service.create(new_user(1, name="Before"))
+	user_id = created.data.id
+
+	read_done = asyncio.Event()
+	gate = asyncio.Event()
+	get_by_id = adapter._get_by_id
+
+	async def slow_get_by_id(user_id, primary=False):
+		user = await get_by_id(user_id, primary)
+		read_done.set()
+		await gate.wait()
+		return user
+
+	adapter._get_by_id = slow_get_by_id
+	stale = asyncio.create_task(adapter.get_by_id(user_id))
+	await read_done.wait()
+
+	await adapter.update_partial(user_id, {"name": "After"})
+	fresh = asyncio.create_task(adapter.get_by_id(user_id))
+	await asyncio.sleep(0)
+	gate.set()
+
+	assert (await stale).name == "Before"
+	assert (await fresh).name == "After"
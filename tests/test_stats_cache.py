@@ -0,0 +1,45 @@
+"""Caching of get_stats() and its invalidation by writes."""
+
+import asyncio
+
+import pytest
+
+from tests.factories import new_user
+from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.user_repository import (
+	UserRepository,
+)
+
+
+@pytest.fixture
+async def cached_stats(make_vexen_user):
+	return await make_vexen_user(stats_cache_ttl=60.0)
+
+
+async def test_stats_are_cached_until_a_write(cached_stats):
+	await cached_stats.service.create(new_user(1))
+	assert (await cached_stats.service.stats()).data.total == 1
+
+	await cached_stats.service.create(new_user(2))
+
+	assert (await cached_stats.service.stats()).data.total == 2
+
+
+async def test_stats_read_overlapping_a_write_are_not_cached(cached_stats, monkeypatch):
+	read_done = asyncio.Event()
+	gate = asyncio.Event()
+	get_stats = UserRepository.get_stats
+
+	async def slow_get_stats(self):
+		result = await get_stats(self)
+		read_done.set()
+		await gate.wait()
+		return result
+
+	monkeypatch.setattr(UserRepository, "get_stats", slow_get_stats)
+	stale = asyncio.create_task(cached_stats.service.stats())
+	await read_done.wait()
+	await cached_stats.service.create(new_user(1))
+	gate.set()
+
+	assert (await stale).data.total == 0
+	assert (await cached_stats.service.stats()).data.total == 1
@@ -0,0 +1,91 @@
+"""CachedUserRepository hits, invalidation and stale-read protection."""
+
+import asyncio
+
+import pytest
+
+from tests.factories import new_user
+from vexen_user.application.dto import UpdateUserRequest
+
+
+@pytest.fixture
+async def cached(make_vexen_user):
+	return await make_vexen_user(cache=True)
+
+
+async def test_lookups_are_served_from_the_cache_until_a_write(cached):
+	created = await cached.service.create(new_user(1, name="Ann"))
+	user_id = created.data.id
+
+	await cached.repository.get_by_id(user_id)
+	await cached.repository.get_by_id(user_id)
+	assert cached.repository.cache_info()["hits"] == 1
+
+	await cached.service.update(user_id, UpdateUserRequest(name="Ann B"))
+	assert (await cached.repository.get_by_id(user_id)).name == "Ann B"
+
+	await cached.service.remove(user_id)
+	assert await cached.repository.get_by_id(user_id) is None
+
+
+async def test_reads_inside_a_transaction_are_not_cached(cached):
+	created = await cached.service.create(new_user(1, name="Ann"))
+	user_id = created.data.id
+
+	with pytest.raises(RuntimeError):
+		async with cached.transaction():
+			await cached.repository.update_partial(user_id, {"name": "Rolled back"})
+			assert (await cached.repository.get_by_id(user_id)).name == "Rolled back"
+			assert cached.repository.cache_info()["size"] == 0
+			raise RuntimeError("abort")
+
+	assert cached.repository.cache_info()["size"] == 0
+	assert (await cached.repository.get_by_id(user_id)).name == "Ann"
+
+
+async def test_transaction_writes_invalidate_on_commit(cached):
+	created = await cached.service.create(new_user(1, name="Ann"))
+	user_id = created.data.id
+	await cached.repository.get_by_id(user_id)
+
+	async with cached.transaction() as service:
+		await service.update(user_id, UpdateUserRequest(name="Committed"))
+
+	assert (await cached.repository.get_by_id(user_id)).name == "Committed"
+
+
+async def test_read_overlapping_a_write_does_not_store_the_old_row(cached):
+	created = await cached.service.create(new_user(1, name="Before"))
+	user_id = created.data.id
+
+	repository = cached.repository
+	adapter = repository._repository
+	read_done = asyncio.Event()
+	gate = asyncio.Event()
+	get_by_id = adapter.get_by_id
+
+	async def slow_get_by_id(user_id):
+		user = await get_by_id(user_id)
+		read_done.set()
+		await gate.wait()
+		return user
+
+	adapter.get_by_id = slow_get_by_id
+	stale = asyncio.create_task(repository.get_by_id(user_id))
+	await read_done.wait()
+	await repository.update_partial(user_id, {"name": "After"})
+	gate.set()
+
+	assert (await stale).name == "Before"
+	adapter.get_by_id = get_by_id
+	assert (await repository.get_by_id(user_id)).name == "After"
+
+
+async def test_email_lookups_share_the_id_entry(cached):
+	created = await cached.service.create(new_user(1, email="ann@example.com"))
+
+	await cached.repository.get_by_id(created.data.id)
+	user = await cached.repository.get_by_email("ann@example.com")
+
+	assert user.id is not None and str(user.id) == created.data.id
+	assert cached.repository.cache_info()["hits"] == 1
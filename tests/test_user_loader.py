@@ -0,0 +1,73 @@
+"""Batched and memoized lookups of UserLoader."""
+
+import asyncio
+
+import pytest
+
+from tests.factories import new_user
+
+
+async def test_lookups_in_one_tick_share_one_query(vexen_user):
+	created = [(await vexen_user.service.create(new_user(index))).data for index in range(3)]
+	adapter = vexen_user.repository
+	batches = []
+	get_many_by_ids = adapter.get_many_by_ids
+
+	async def counting_get_many_by_ids(user_ids):
+		batches.append(list(user_ids))
+		return await get_many_by_ids(user_ids)
+
+	adapter.get_many_by_ids = counting_get_many_by_ids
+	loader = vexen_user.service.loader()
+
+	users = await loader.load_many([user.id for user in created] + ["not-an-id"])
+	again = await loader.load(created[0].id)
+
+	assert [str(user.id) for user in users[:3]] == [user.id for user in created]
+	assert users[3] is None
+	assert again is users[0]
+	assert len(batches) == 1
+
+
+async def test_cancelling_one_caller_does_not_fail_the_others(vexen_user):
+	created = await vexen_user.service.create(new_user(1))
+	user_id = created.data.id
+	adapter = vexen_user.repository
+	gate = asyncio.Event()
+	get_many_by_ids = adapter.get_many_by_ids
+
+	async def slow_get_many_by_ids(user_ids):
+		await gate.wait()
+		return await get_many_by_ids(user_ids)
+
+	adapter.get_many_by_ids = slow_get_many_by_ids
+	loader = vexen_user.service.loader()
+	cancelled = asyncio.create_task(loader.load(user_id))
+	waiting = asyncio.create_task(loader.load(user_id))
+	await asyncio.sleep(0)
+
+	cancelled.cancel()
+	gate.set()
+
+	with pytest.raises(asyncio.CancelledError):
+		await cancelled
+	assert str((await waiting).id) == user_id
+	assert str((await loader.load(user_id)).id) == user_id
+
+
+async def test_interrupted_fetch_is_not_memoized(vexen_user):
+	created = await vexen_user.service.create(new_user(1))
+	user_id = created.data.id
+	adapter = vexen_user.repository
+	get_many_by_ids = adapter.get_many_by_ids
+
+	async def interrupted_get_many_by_ids(user_ids):
+		raise asyncio.CancelledError
+
+	adapter.get_many_by_ids = interrupted_get_many_by_ids
+	loader = vexen_user.service.loader()
+	with pytest.raises(asyncio.CancelledError):
+		await loader.load(user_id)
+
+	adapter.get_many_by_ids = get_many_by_ids
+	assert str((await loader.load(user_id)).id) == user_id
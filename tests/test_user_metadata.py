@@ -0,0 +1,30 @@
+"""Reads that leave user_metadata out and writes of the users they return."""
+
+from tests.factories import new_user
+
+
+async def test_saving_a_user_read_without_metadata_keeps_the_stored_metadata(vexen_user):
+	created = await vexen_user.service.create(
+		new_user(1, email="ann@example.com", user_metadata={"department": "eng"})
+	)
+	repository = vexen_user.repository
+
+	user = await repository.get_by_email("ann@example.com")
+	assert not user.metadata_loaded and user.user_metadata == {}
+	user.name = "Ann B"
+	await repository.save(user)
+
+	stored = await repository.get_by_id(created.data.id)
+	assert stored.name == "Ann B"
+	assert stored.user_metadata == {"department": "eng"}
+
+
+async def test_list_reads_metadata_only_when_asked(vexen_user):
+	await vexen_user.service.create(new_user(1, user_metadata={"department": "eng"}))
+	repository = vexen_user.repository
+
+	bare, _, _ = await repository.list_paginated(1, 10)
+	full, _, _ = await repository.list_paginated(1, 10, with_metadata=True)
+
+	assert [user.metadata_loaded for user in bare] == [False]
+	assert full[0].user_metadata == {"department": "eng"}
@@ -3,5 +3,15 @@ vexen-user - User management system with hexagonal architecture.
 """
 
 from .core import VexenUser, VexenUserConfig
+from .infraestructure.output.cache import UserCacheConfig
+from .infraestructure.output.persistence.sqlalchemy.adapters.shard_map import ShardMap
+from .shared.instrumentation import Instrumentation, OperationRecord
 
-__all__ = ["VexenUser", "VexenUserConfig"]
+__all__ = [
+	"VexenUser",
+	"VexenUserConfig",
+	"UserCacheConfig",
+	"ShardMap",
+	"Instrumentation",
+	"OperationRecord",
+]
@@ -1,7 +1,14 @@
 """Application DTOs."""
 
 from .base import BaseResponse, PaginatedResponse, PaginationResponse
+from .external_identity_dto import (
+	ExternalIdentityResponse,
+	ExternalLoginRequest,
+	ExternalLoginResponse,
+	LinkIdentityRequest,
+)
 from .user_dto import (
+	BulkUserResult,
 	CreateUserRequest,
 	PatchUserRequest,
 	UpdateUserRequest,
@@ -20,4 +27,9 @@ __all__ = [
 	"UpdateUserRequest",
 	"PatchUserRequest",
 	"UserStatsResponse",
+	"BulkUserResult",
+	"ExternalIdentityResponse",
+	"LinkIdentityRequest",
+	"ExternalLoginRequest",
+	"ExternalLoginResponse",
 ]
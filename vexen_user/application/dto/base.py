@@ -6,7 +6,7 @@ from typing import Generic, TypeVar
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseResponse(Generic[T]):
 	"""
 	Generic response wrapper.
@@ -34,19 +34,29 @@ class BaseResponse(Generic[T]):
 		return cls(success=False, data=None, error=error)
 
 
-@dataclass
+@dataclass(slots=True)
 class PaginationResponse:
-	"""Pagination metadata"""
+	"""
+	Pagination metadata.
+
+	total_pages and total_items are None when the total was not computed
+	(count_mode "none" or cursor pagination) and approximate when count_mode
+	is "estimated". next_cursor can be passed back to fetch the next page.
+	has_prev is None for cursor pages: a keyset seek only reads forward, so
+	whether rows precede the cursor is unknown.
+	"""
 
 	page: int
 	page_size: int
-	total_pages: int
-	total_items: int
+	total_pages: int | None
+	total_items: int | None
 	has_next: bool
-	has_prev: bool
+	has_prev: bool | None
+	next_cursor: str | None = None
+	count_mode: str = "exact"
 
 
-@dataclass
+@dataclass(slots=True)
 class PaginatedResponse(Generic[T]):
 	"""Paginated response with data and pagination info"""
 
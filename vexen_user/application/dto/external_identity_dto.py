@@ -0,0 +1,59 @@
+"""DTOs for external identity operations."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .user_dto import UserResponse
+
+
+@dataclass(slots=True)
+class ExternalIdentityResponse:
+	"""External identity linked to a user"""
+
+	id: str
+	user_id: str
+	provider: str
+	provider_user_id: str
+	email: str | None
+	provider_data: dict
+	created_at: datetime
+	updated_at: datetime | None
+
+
+@dataclass(slots=True)
+class LinkIdentityRequest:
+	"""Request to link a provider identity to a user"""
+
+	provider: str
+	provider_user_id: str
+	email: str | None = None
+	provider_data: dict | None = None
+
+
+@dataclass(slots=True)
+class ExternalLoginRequest:
+	"""
+	Request to log in with a provider identity, provisioning the user if needed.
+
+	link_existing_email links the identity to an existing user with the same
+	email; only enable it for providers that verify email addresses.
+	user_metadata is stored on a user provisioned by this login, e.g. the
+	tenant that places it on a shard with ShardMap(key="tenant").
+	"""
+
+	provider: str
+	provider_user_id: str
+	email: str
+	name: str
+	avatar: str | None = None
+	provider_data: dict | None = None
+	link_existing_email: bool = False
+	user_metadata: dict | None = None
+
+
+@dataclass(slots=True)
+class ExternalLoginResponse:
+	"""Result of a login with a provider identity"""
+
+	user: UserResponse
+	created: bool
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class UserResponse:
 	"""Standard user response for list operations"""
 
@@ -15,9 +15,10 @@ class UserResponse:
 	status: str
 	created_at: datetime
 	last_login: datetime | None
+	role_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UserExpandedResponse:
 	"""Expanded user response with all details"""
 
@@ -30,9 +31,10 @@ class UserExpandedResponse:
 	updated_at: datetime | None
 	last_login: datetime | None
 	user_metadata: dict
+	role_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateUserRequest:
 	"""Request to create a new user"""
 
@@ -41,9 +43,10 @@ class CreateUserRequest:
 	password: str
 	avatar: str | None = None
 	user_metadata: dict | None = None
+	role_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateUserRequest:
 	"""Request to update user (PUT - all fields)"""
 
@@ -51,9 +54,10 @@ class UpdateUserRequest:
 	avatar: str | None = None
 	status: str | None = None
 	user_metadata: dict | None = None
+	role_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PatchUserRequest:
 	"""Request to partially update user (PATCH)"""
 
@@ -61,9 +65,21 @@ class PatchUserRequest:
 	avatar: str | None = None
 	status: str | None = None
 	user_metadata: dict | None = None
+	role_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
+class BulkUserResult:
+	"""Outcome of a single row in a bulk create/upsert"""
+
+	index: int
+	email: str
+	success: bool
+	data: UserResponse | None = None
+	error: str | None = None
+
+
+@dataclass(slots=True)
 class UserStatsResponse:
 	"""User statistics"""
 
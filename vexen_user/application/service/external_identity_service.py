@@ -0,0 +1,42 @@
+"""External identity service that orchestrates use cases."""
+
+from dataclasses import dataclass, field
+
+from vexen_user.application.dto import ExternalLoginRequest, LinkIdentityRequest
+from vexen_user.application.usecase.external_identity import ExternalIdentityUseCaseFactory
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort, IUserRepositoryPort
+
+
+@dataclass
+class ExternalIdentityService:
+	"""Service layer for external (OAuth/OpenID) identity operations"""
+
+	repository: IUserExternalIdentityRepositoryPort
+	user_repository: IUserRepositoryPort
+	usecases: ExternalIdentityUseCaseFactory = field(init=False)
+
+	def __post_init__(self):
+		"""Initialize use case factory"""
+		self.usecases = ExternalIdentityUseCaseFactory(
+			repository=self.repository, user_repository=self.user_repository
+		)
+
+	async def find_user(self, provider: str, provider_user_id: str):
+		"""Get the user linked to a provider identity"""
+		return await self.usecases.find_user_by_identity(provider, provider_user_id)
+
+	async def list(self, user_id: str):
+		"""List the identities linked to a user"""
+		return await self.usecases.list_user_identities(user_id)
+
+	async def link(self, user_id: str, data: LinkIdentityRequest):
+		"""Link a provider identity to a user"""
+		return await self.usecases.link_identity(user_id, data)
+
+	async def unlink(self, user_id: str, provider: str, provider_user_id: str | None = None):
+		"""Unlink a user's identities for a provider"""
+		return await self.usecases.unlink_identity(user_id, provider, provider_user_id)
+
+	async def login(self, data: ExternalLoginRequest):
+		"""Log in with a provider identity (OAuth callback), provisioning the user if new"""
+		return await self.usecases.login_with_identity(data)
@@ -0,0 +1,113 @@
+"""Write-behind buffer for user login timestamps."""
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+from datetime import datetime
+
+from vexen_user.domain.repository import IUserRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginRecorder:
+	"""
+	Buffers login timestamps in memory and writes them in batches.
+
+	record() never touches the database. A background task flushes the buffer
+	every flush_interval seconds, or as soon as max_batch users are pending,
+	through repository.record_logins(). Only the latest login per user is kept,
+	and logins whose flush fails are put back and retried on the next flush.
+
+	Flushes run outside any transaction() of the caller, so a rollback never
+	drops buffered logins. Call close() on shutdown to write what is left.
+	"""
+
+	def __init__(
+		self,
+		repository: IUserRepositoryPort,
+		flush_interval: float = 0.5,
+		max_batch: int = 1000,
+	):
+		"""
+		Args:
+			repository: Repository the buffered logins are written to
+			flush_interval: Seconds between background flushes
+			max_batch: Pending users that trigger an early flush
+		"""
+		self.repository = repository
+		self.flush_interval = flush_interval
+		self.max_batch = max_batch
+		self._pending: dict[str, datetime] = {}
+		self._lock = asyncio.Lock()
+		self._wakeup = asyncio.Event()
+		self._task: asyncio.Task | None = None
+		self._closed = False
+
+	@property
+	def pending(self) -> int:
+		"""Number of users with a login waiting to be written"""
+		return len(self._pending)
+
+	def record(self, user_id: str, logged_in_at: datetime | None = None) -> None:
+		"""Buffer a login; must be called from a running event loop"""
+		if self._closed:
+			raise RuntimeError("LastLoginRecorder is closed")
+
+		self._merge({str(user_id): logged_in_at or datetime.now()})
+
+		if self._task is None:
+			# Empty context: the flush loop must not inherit the caller's transaction
+			self._task = asyncio.get_running_loop().create_task(
+				self._run(), context=contextvars.Context()
+			)
+		if len(self._pending) >= self.max_batch:
+			self._wakeup.set()
+
+	async def flush(self) -> int:
+		"""
+		Write every buffered login now.
+
+		Returns:
+			Number of users updated
+		"""
+		async with self._lock:
+			if not self._pending:
+				return 0
+
+			batch, self._pending = self._pending, {}
+			try:
+				return await asyncio.get_running_loop().create_task(
+					self.repository.record_logins(batch), context=contextvars.Context()
+				)
+			except BaseException:
+				self._merge(batch)
+				raise
+
+	async def close(self) -> None:
+		"""Stop the background task and flush the remaining logins"""
+		self._closed = True
+		if self._task is not None:
+			self._task.cancel()
+			with contextlib.suppress(asyncio.CancelledError):
+				await self._task
+			self._task = None
+		await self.flush()
+
+	def _merge(self, logins: dict[str, datetime]) -> None:
+		"""Add logins to the buffer, keeping the latest timestamp per user"""
+		for user_id, logged_in_at in logins.items():
+			current = self._pending.get(user_id)
+			if current is None or logged_in_at > current:
+				self._pending[user_id] = logged_in_at
+
+	async def _run(self) -> None:
+		while True:
+			with contextlib.suppress(TimeoutError):
+				await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+			self._wakeup.clear()
+			try:
+				await self.flush()
+			except Exception:
+				logger.exception("Failed to write %d buffered last_login updates", self.pending)
@@ -0,0 +1,59 @@
+"""Streaming writers for user exports."""
+
+import csv
+import json
+from collections.abc import AsyncIterable
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import TextIO
+
+from vexen_user.application.dto import UserExpandedResponse
+
+EXPORT_COLUMNS = [f.name for f in fields(UserExpandedResponse)]
+
+
+def _json_default(value):
+	if isinstance(value, datetime):
+		return value.isoformat()
+	raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def write_ndjson(users: AsyncIterable[UserExpandedResponse], file: TextIO) -> int:
+	"""
+	Write users as newline-delimited JSON, one object per line.
+
+	Returns:
+		Number of users written
+	"""
+	count = 0
+	async for user in users:
+		file.write(json.dumps(asdict(user), default=_json_default, ensure_ascii=False))
+		file.write("\n")
+		count += 1
+	return count
+
+
+async def write_csv(users: AsyncIterable[UserExpandedResponse], file: TextIO) -> int:
+	"""
+	Write users as CSV with a header row. user_metadata is written as JSON.
+
+	Open the file with newline="" so the csv module controls line endings.
+
+	Returns:
+		Number of users written
+	"""
+	writer = csv.writer(file)
+	writer.writerow(EXPORT_COLUMNS)
+
+	count = 0
+	async for user in users:
+		row = asdict(user)
+		row["user_metadata"] = json.dumps(row["user_metadata"], ensure_ascii=False)
+		writer.writerow(
+			[
+				value.isoformat() if isinstance(value, datetime) else value
+				for value in (row[column] for column in EXPORT_COLUMNS)
+			]
+		)
+		count += 1
+	return count
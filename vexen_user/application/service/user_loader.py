@@ -0,0 +1,121 @@
+"""Per-request batching loader for users."""
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.repository import IUserRepositoryPort
+
+
+class UserLoader:
+	"""
+	DataLoader-style batching of user lookups.
+
+	Lookups made in the same event-loop tick are collected and dispatched as one
+	get_many_by_ids/get_many_by_emails query. Results are memoized for the
+	lifetime of the loader, so create one loader per request.
+
+	Example:
+		```python
+		loader = user_system.service.loader()
+		authors = await asyncio.gather(*(loader.load(p.author_id) for p in posts))
+		```
+	"""
+
+	def __init__(self, repository: IUserRepositoryPort):
+		self.repository = repository
+		self._by_id: dict[str, asyncio.Future] = {}
+		self._by_email: dict[str, asyncio.Future] = {}
+		self._queued_ids: list[str] = []
+		self._queued_emails: list[str] = []
+		self._dispatch_scheduled = False
+		self._tasks: set[asyncio.Task] = set()
+
+	async def load(self, user_id: str) -> User | None:
+		"""Load a user by ID, batched with other lookups in the same tick"""
+		try:
+			key = str(uuid.UUID(str(user_id)))
+		except (ValueError, AttributeError):
+			return None
+		return await self._enqueue(self._by_id, self._queued_ids, key)
+
+	async def load_by_email(self, email: str) -> User | None:
+		"""Load a user by email, batched with other lookups in the same tick"""
+		return await self._enqueue(self._by_email, self._queued_emails, email)
+
+	async def load_many(self, user_ids: list[str]) -> list[User | None]:
+		"""Load many users by ID, preserving input order"""
+		return list(await asyncio.gather(*(self.load(user_id) for user_id in user_ids)))
+
+	def clear(self) -> None:
+		"""Forget memoized results (e.g. after a write in the same request)"""
+		self._by_id = {key: fut for key, fut in self._by_id.items() if not fut.done()}
+		self._by_email = {key: fut for key, fut in self._by_email.items() if not fut.done()}
+
+	def _enqueue(self, cache: dict[str, asyncio.Future], queue: list[str], key: str):
+		future = cache.get(key)
+		if future is None or future.cancelled():
+			loop = asyncio.get_running_loop()
+			future = loop.create_future()
+			cache[key] = future
+			queue.append(key)
+			if not self._dispatch_scheduled:
+				self._dispatch_scheduled = True
+				loop.call_soon(self._dispatch)
+		# Shared by every caller: cancelling one of them must not cancel the others
+		return asyncio.shield(future)
+
+	def _dispatch(self) -> None:
+		"""Send everything queued during the last tick as batched queries"""
+		self._dispatch_scheduled = False
+		ids, self._queued_ids = self._queued_ids, []
+		emails, self._queued_emails = self._queued_emails, []
+
+		if ids:
+			self._spawn(
+				self._resolve(
+					ids, self._by_id, self.repository.get_many_by_ids, lambda u: str(u.id)
+				)
+			)
+		if emails:
+			self._spawn(
+				self._resolve(
+					emails, self._by_email, self.repository.get_many_by_emails, lambda u: u.email
+				)
+			)
+
+	def _spawn(self, coro) -> None:
+		task = asyncio.ensure_future(coro)
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
+
+	async def _resolve(
+		self,
+		keys: list[str],
+		cache: dict[str, asyncio.Future],
+		fetch: Callable[[list[str]], Awaitable[list[User]]],
+		key_of: Callable[[User], str],
+	) -> None:
+		futures = [cache[key] for key in keys]
+		try:
+			users = await fetch(keys)
+		except BaseException as e:
+			# Do not memoize failures or interrupted fetches so a later load can retry
+			for key, future in zip(keys, futures, strict=True):
+				if cache.get(key) is future:
+					del cache[key]
+				if future.done():
+					continue
+				if isinstance(e, asyncio.CancelledError):
+					future.cancel()
+				else:
+					future.set_exception(e)
+			if not isinstance(e, Exception):
+				raise
+			return
+
+		found = {key_of(user): user for user in users}
+		for key, future in zip(keys, futures, strict=True):
+			if not future.done():
+				future.set_result(found.get(key))
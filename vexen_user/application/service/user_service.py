@@ -1,10 +1,24 @@
 """User service that orchestrates use cases."""
 
+import contextlib
+from collections.abc import AsyncIterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, TextIO
 
-from vexen_user.application.dto import CreateUserRequest, PatchUserRequest, UpdateUserRequest
+from vexen_user.application.dto import (
+	BaseResponse,
+	CreateUserRequest,
+	PatchUserRequest,
+	UpdateUserRequest,
+	UserExpandedResponse,
+)
 from vexen_user.application.usecase.user import UserUseCaseFactory
-from vexen_user.domain.repository import IUserRepositoryPort
+from vexen_user.domain.repository import CountMode, IUserRepositoryPort
+
+from .last_login_recorder import LastLoginRecorder
+from .user_export import write_csv, write_ndjson
+from .user_loader import UserLoader
 
 
 @dataclass
@@ -12,6 +26,7 @@ class UserService:
 	"""Service layer for user operations"""
 
 	repository: IUserRepositoryPort
+	last_logins: LastLoginRecorder | None = None
 	usecases: UserUseCaseFactory = field(init=False)
 
 	def __post_init__(self):
@@ -25,9 +40,22 @@ class UserService:
 		search: str | None = None,
 		role: str | None = None,
 		status: str | None = None,
+		cursor: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
 	):
-		"""List users with pagination and filters"""
-		return await self.usecases.list_users(page, page_size, search, role, status)
+		"""
+		List users with pagination and filters.
+
+		Pass the next_cursor from a previous response as cursor to use keyset
+		pagination, whose cost does not grow with page depth. Use count_mode
+		"none" or "estimated" to skip or approximate the total count.
+		metadata_filters keeps users whose user_metadata has every given
+		key/value pair, e.g. {"department": "eng"}.
+		"""
+		return await self.usecases.list_users(
+			page, page_size, search, role, status, cursor, count_mode, metadata_filters
+		)
 
 	async def get(self, user_id: str):
 		"""Get user by ID with expanded details"""
@@ -37,6 +65,14 @@ class UserService:
 		"""Create a new user"""
 		return await self.usecases.create_user(data)
 
+	async def bulk_create(self, data: Sequence[CreateUserRequest]):
+		"""Create many users in batched inserts, skipping emails that already exist"""
+		return await self.usecases.bulk_create_users(data)
+
+	async def bulk_upsert(self, data: Sequence[CreateUserRequest]):
+		"""Create many users in batched inserts, updating the ones that already exist"""
+		return await self.usecases.bulk_create_users(data, upsert=True)
+
 	async def update(self, user_id: str, data: UpdateUserRequest):
 		"""Update user (PUT)"""
 		return await self.usecases.update_user(user_id, data)
@@ -49,6 +85,7 @@ class UserService:
 			avatar=data.avatar,
 			status=data.status,
 			user_metadata=data.user_metadata,
+			role_id=data.role_id,
 		)
 		return await self.usecases.update_user(user_id, update_data)
 
@@ -56,6 +93,93 @@ class UserService:
 		"""Delete user"""
 		return await self.usecases.delete_user(user_id)
 
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000):
+		"""
+		Remove users soft-deleted more than older_than ago, batch_size rows per transaction.
+
+		Meant to run periodically (cron, task queue) when soft_delete is enabled.
+		"""
+		return await self.usecases.purge_deleted_users(older_than, batch_size)
+
+	async def record_login(self, user_id: str):
+		"""
+		Record that a user logged in.
+
+		With a LastLoginRecorder the timestamp is buffered and written in a later
+		batch; otherwise it is written immediately.
+		"""
+		if self.last_logins is not None:
+			self.last_logins.record(user_id)
+			return BaseResponse.ok(None, message="Login recorded")
+		return await self.usecases.record_login(user_id)
+
 	async def stats(self):
 		"""Get user statistics"""
+		if self.last_logins is not None:
+			# Buffered logins must count in recent_logins; a failed flush is retried later
+			with contextlib.suppress(Exception):
+				await self.last_logins.flush()
 		return await self.usecases.get_stats()
+
+	async def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[UserExpandedResponse]:
+		"""
+		Iterate over every user matching the filters in constant memory.
+
+		Rows come from a server-side cursor batch_size at a time and hold one
+		connection until the iteration ends; close the iterator (or use
+		contextlib.aclosing) when stopping early.
+		"""
+		stream = self.repository.stream_all(batch_size, search, role, status, metadata_filters)
+		async with contextlib.aclosing(stream) as users:
+			async for user in users:
+				yield UserExpandedResponse(
+					id=str(user.id),
+					email=user.email,
+					name=user.name,
+					avatar=user.avatar,
+					status=user.status,
+					created_at=user.created_at,
+					updated_at=user.updated_at,
+					last_login=user.last_login,
+					user_metadata=user.user_metadata or {},
+					role_id=user.role_id,
+				)
+
+	async def export_ndjson(
+		self,
+		file: TextIO,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> int:
+		"""Stream matching users to a text file as NDJSON; returns the number written"""
+		stream = self.stream_all(batch_size, search, role, status, metadata_filters)
+		async with contextlib.aclosing(stream) as users:
+			return await write_ndjson(users, file)
+
+	async def export_csv(
+		self,
+		file: TextIO,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> int:
+		"""Stream matching users to a text file as CSV; returns the number written"""
+		stream = self.stream_all(batch_size, search, role, status, metadata_filters)
+		async with contextlib.aclosing(stream) as users:
+			return await write_csv(users, file)
+
+	def loader(self) -> UserLoader:
+		"""Create a batching loader for user lookups (use one per request)"""
+		return UserLoader(repository=self.repository)
@@ -0,0 +1,17 @@
+"""External identity use cases."""
+
+from .external_identity_usecase_factory import ExternalIdentityUseCaseFactory
+from .find_user_by_identity import FindUserByIdentity
+from .link_identity import LinkIdentity
+from .list_user_identities import ListUserIdentities
+from .login_with_identity import LoginWithIdentity
+from .unlink_identity import UnlinkIdentity
+
+__all__ = [
+	"ExternalIdentityUseCaseFactory",
+	"FindUserByIdentity",
+	"ListUserIdentities",
+	"LinkIdentity",
+	"UnlinkIdentity",
+	"LoginWithIdentity",
+]
@@ -0,0 +1,35 @@
+"""Factory for external identity use cases."""
+
+from dataclasses import dataclass, field
+
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort, IUserRepositoryPort
+
+from .find_user_by_identity import FindUserByIdentity
+from .link_identity import LinkIdentity
+from .list_user_identities import ListUserIdentities
+from .login_with_identity import LoginWithIdentity
+from .unlink_identity import UnlinkIdentity
+
+
+@dataclass
+class ExternalIdentityUseCaseFactory:
+	"""Factory for creating external identity use cases"""
+
+	repository: IUserExternalIdentityRepositoryPort
+	user_repository: IUserRepositoryPort
+
+	find_user_by_identity: FindUserByIdentity = field(init=False)
+	list_user_identities: ListUserIdentities = field(init=False)
+	link_identity: LinkIdentity = field(init=False)
+	unlink_identity: UnlinkIdentity = field(init=False)
+	login_with_identity: LoginWithIdentity = field(init=False)
+
+	def __post_init__(self):
+		"""Initialize all use cases"""
+		self.find_user_by_identity = FindUserByIdentity(repository=self.repository)
+		self.list_user_identities = ListUserIdentities(repository=self.repository)
+		self.link_identity = LinkIdentity(
+			repository=self.repository, user_repository=self.user_repository
+		)
+		self.unlink_identity = UnlinkIdentity(repository=self.repository)
+		self.login_with_identity = LoginWithIdentity(repository=self.repository)
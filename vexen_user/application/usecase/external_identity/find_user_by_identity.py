@@ -0,0 +1,40 @@
+"""Find user by external identity use case."""
+
+from dataclasses import dataclass
+
+from vexen_user.application.dto import BaseResponse, UserExpandedResponse
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+
+
+@dataclass
+class FindUserByIdentity:
+	"""Get the user linked to a provider identity"""
+
+	repository: IUserExternalIdentityRepositoryPort
+
+	async def __call__(
+		self, provider: str, provider_user_id: str
+	) -> BaseResponse[UserExpandedResponse]:
+		try:
+			user = await self.repository.find_user_by_identity(provider, provider_user_id)
+
+			if not user:
+				return BaseResponse.fail(f"No user linked to {provider}:{provider_user_id}")
+
+			response = UserExpandedResponse(
+				id=str(user.id),
+				email=user.email,
+				name=user.name,
+				avatar=user.avatar,
+				status=user.status,
+				created_at=user.created_at,
+				updated_at=user.updated_at,
+				last_login=user.last_login,
+				user_metadata=user.user_metadata or {},
+				role_id=user.role_id,
+			)
+
+			return BaseResponse.ok(response)
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error finding user by identity: {str(e)}")
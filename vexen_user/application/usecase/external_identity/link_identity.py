@@ -0,0 +1,45 @@
+"""Link external identity use case."""
+
+from dataclasses import dataclass
+
+from vexen_user.application.dto import (
+	BaseResponse,
+	ExternalIdentityResponse,
+	LinkIdentityRequest,
+)
+from vexen_user.domain.entity import UserExternalIdentity
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort, IUserRepositoryPort
+
+from .mapping import to_identity_response
+
+
+@dataclass
+class LinkIdentity:
+	"""Link a provider identity to an existing user"""
+
+	repository: IUserExternalIdentityRepositoryPort
+	user_repository: IUserRepositoryPort
+
+	async def __call__(
+		self, user_id: str, data: LinkIdentityRequest
+	) -> BaseResponse[ExternalIdentityResponse]:
+		try:
+			user = await self.user_repository.get_by_id(user_id)
+			if not user:
+				return BaseResponse.fail(f"User with id {user_id} not found")
+
+			identity = await self.repository.link(
+				UserExternalIdentity(
+					id=None,
+					user_id=user.id,
+					provider=data.provider,
+					provider_user_id=data.provider_user_id,
+					email=data.email,
+					provider_data=data.provider_data,
+				)
+			)
+
+			return BaseResponse.ok(to_identity_response(identity))
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error linking identity: {str(e)}")
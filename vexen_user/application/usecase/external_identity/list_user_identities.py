@@ -0,0 +1,23 @@
+"""List user external identities use case."""
+
+from dataclasses import dataclass
+
+from vexen_user.application.dto import BaseResponse, ExternalIdentityResponse
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+
+from .mapping import to_identity_response
+
+
+@dataclass
+class ListUserIdentities:
+	"""List the external identities linked to a user"""
+
+	repository: IUserExternalIdentityRepositoryPort
+
+	async def __call__(self, user_id: str) -> BaseResponse[list[ExternalIdentityResponse]]:
+		try:
+			identities = await self.repository.list_by_user(user_id)
+			return BaseResponse.ok([to_identity_response(identity) for identity in identities])
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error listing identities: {str(e)}")
@@ -0,0 +1,60 @@
+"""Login or provision with external identity use case."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from vexen_user.application.dto import (
+	BaseResponse,
+	ExternalLoginRequest,
+	ExternalLoginResponse,
+	UserResponse,
+)
+from vexen_user.domain.entity import User
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+
+
+@dataclass
+class LoginWithIdentity:
+	"""Log in with a provider identity, creating the user on first login"""
+
+	repository: IUserExternalIdentityRepositoryPort
+
+	async def __call__(self, data: ExternalLoginRequest) -> BaseResponse[ExternalLoginResponse]:
+		try:
+			# Only persisted when the identity is not linked yet
+			new_user = User(
+				id=None,
+				email=data.email,
+				name=data.name,
+				avatar=data.avatar,
+				status="active",
+				created_at=datetime.now(),
+				user_metadata=data.user_metadata or {},
+			)
+
+			user, created = await self.repository.login_or_provision(
+				data.provider,
+				data.provider_user_id,
+				new_user,
+				data.provider_data,
+				data.link_existing_email,
+			)
+
+			response = ExternalLoginResponse(
+				user=UserResponse(
+					id=str(user.id),
+					email=user.email,
+					name=user.name,
+					avatar=user.avatar,
+					status=user.status,
+					created_at=user.created_at,
+					last_login=user.last_login,
+					role_id=user.role_id,
+				),
+				created=created,
+			)
+
+			return BaseResponse.ok(response)
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error logging in with identity: {str(e)}")
@@ -0,0 +1,18 @@
+"""Entity to DTO conversion shared by external identity use cases."""
+
+from vexen_user.application.dto import ExternalIdentityResponse
+from vexen_user.domain.entity import UserExternalIdentity
+
+
+def to_identity_response(identity: UserExternalIdentity) -> ExternalIdentityResponse:
+	"""Convert an external identity entity to its response DTO"""
+	return ExternalIdentityResponse(
+		id=str(identity.id),
+		user_id=str(identity.user_id),
+		provider=identity.provider,
+		provider_user_id=identity.provider_user_id,
+		email=identity.email,
+		provider_data=identity.provider_data or {},
+		created_at=identity.created_at,
+		updated_at=identity.updated_at,
+	)
@@ -0,0 +1,26 @@
+"""Unlink external identity use case."""
+
+from dataclasses import dataclass
+
+from vexen_user.application.dto import BaseResponse
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+
+
+@dataclass
+class UnlinkIdentity:
+	"""Unlink a user's identities for a provider"""
+
+	repository: IUserExternalIdentityRepositoryPort
+
+	async def __call__(
+		self, user_id: str, provider: str, provider_user_id: str | None = None
+	) -> BaseResponse[None]:
+		try:
+			removed = await self.repository.unlink(user_id, provider, provider_user_id)
+			if not removed:
+				return BaseResponse.fail(f"No {provider} identity linked to user {user_id}")
+
+			return BaseResponse.ok(None, message=f"{removed} identity(ies) unlinked")
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error unlinking identity: {str(e)}")
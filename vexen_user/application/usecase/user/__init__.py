@@ -1,10 +1,13 @@
 """User use cases."""
 
+from .bulk_create_users import BulkCreateUsers
 from .create_user import CreateUser
 from .delete_user import DeleteUser
 from .get_user import GetUser
 from .get_user_stats import GetUserStats
 from .list_users import ListUsers
+from .purge_deleted_users import PurgeDeletedUsers
+from .record_login import RecordLogin
 from .update_user import UpdateUser
 from .user_usecase_factory import UserUseCaseFactory
 
@@ -16,4 +19,7 @@ __all__ = [
 	"UpdateUser",
 	"DeleteUser",
 	"GetUserStats",
+	"BulkCreateUsers",
+	"RecordLogin",
+	"PurgeDeletedUsers",
 ]
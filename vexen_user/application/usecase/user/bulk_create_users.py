@@ -0,0 +1,90 @@
+"""Bulk create/upsert users use case."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from vexen_user.application.dto import (
+	BaseResponse,
+	BulkUserResult,
+	CreateUserRequest,
+	UserResponse,
+)
+from vexen_user.domain.entity import User
+from vexen_user.domain.repository import IUserRepositoryPort
+
+
+@dataclass
+class BulkCreateUsers:
+	"""Create (or upsert) many users with batched inserts"""
+
+	repository: IUserRepositoryPort
+
+	async def __call__(
+		self, data: Sequence[CreateUserRequest], upsert: bool = False
+	) -> BaseResponse[list[BulkUserResult]]:
+		try:
+			results: list[BulkUserResult] = []
+			pending: dict[str, int] = {}
+			users: list[User] = []
+			now = datetime.now()
+
+			for index, item in enumerate(data):
+				result = BulkUserResult(index=index, email=item.email, success=False)
+				results.append(result)
+
+				# One statement cannot touch the same email twice
+				if item.email in pending:
+					result.error = f"Duplicate email {item.email} in batch"
+					continue
+
+				try:
+					user = User(
+						id=None,  # Generated client-side by the repository
+						email=item.email,
+						name=item.name,
+						avatar=item.avatar,
+						status="active",
+						created_at=now,
+						updated_at=now if upsert else None,
+						user_metadata=item.user_metadata or {},
+						role_id=item.role_id,
+					)
+				except ValueError as e:
+					result.error = str(e)
+					continue
+
+				pending[item.email] = index
+				users.append(user)
+
+			if users:
+				if upsert:
+					saved_users = await self.repository.bulk_upsert(users)
+				else:
+					saved_users = await self.repository.bulk_create(users)
+			else:
+				saved_users = []
+
+			for saved_user in saved_users:
+				result = results[pending.pop(saved_user.email)]
+				result.success = True
+				result.data = UserResponse(
+					id=str(saved_user.id),
+					email=saved_user.email,
+					name=saved_user.name,
+					avatar=saved_user.avatar,
+					status=saved_user.status,
+					created_at=saved_user.created_at,
+					last_login=saved_user.last_login,
+					role_id=saved_user.role_id,
+				)
+
+			# Rows the database skipped because the email was already taken
+			for email, index in pending.items():
+				results[index].error = f"User with email {email} already exists"
+
+			created = sum(1 for result in results if result.success)
+			return BaseResponse.ok(results, message=f"{created} of {len(data)} users saved")
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error bulk creating users: {str(e)}")
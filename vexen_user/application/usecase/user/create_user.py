@@ -37,6 +37,7 @@ class CreateUser:
 				status="active",
 				created_at=datetime.now(),
 				user_metadata=data.user_metadata or {},
+				role_id=data.role_id,
 			)
 
 			# Save user
@@ -50,6 +51,7 @@ class CreateUser:
 				status=saved_user.status,
 				created_at=saved_user.created_at,
 				last_login=saved_user.last_login,
+				role_id=saved_user.role_id,
 			)
 
 			return BaseResponse.ok(response)
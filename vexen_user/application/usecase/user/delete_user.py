@@ -14,12 +14,11 @@ class DeleteUser:
 
 	async def __call__(self, user_id: str) -> BaseResponse[None]:
 		try:
-			user = await self.repository.get_by_id(user_id)
-			if not user:
+			# One statement: the repository reports whether the user existed
+			deleted = await self.repository.delete(user_id)
+			if not deleted:
 				return BaseResponse.fail(f"User with id {user_id} not found")
 
-			await self.repository.delete(user_id)
-
 			return BaseResponse.ok(None, message="User deleted successfully")
 
 		except Exception as e:
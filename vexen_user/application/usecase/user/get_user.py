@@ -29,6 +29,7 @@ class GetUser:
 				updated_at=user.updated_at,
 				last_login=user.last_login,
 				user_metadata=user.user_metadata or {},
+				role_id=user.role_id,
 			)
 
 			return BaseResponse.ok(response)
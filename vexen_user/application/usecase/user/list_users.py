@@ -1,13 +1,16 @@
 """List users use case."""
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from typing import Any
 
 from vexen_user.application.dto import (
 	PaginatedResponse,
 	PaginationResponse,
 	UserResponse,
 )
-from vexen_user.domain.repository import IUserRepositoryPort
+from vexen_user.domain.repository import CountMode, IUserRepositoryPort
+from vexen_user.domain.vo import UserCursor
 
 
 @dataclass
@@ -23,35 +26,63 @@ class ListUsers:
 		search: str | None = None,
 		role: str | None = None,
 		status: str | None = None,
+		cursor: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
 	) -> PaginatedResponse[UserResponse]:
 		try:
-			users, total = await self.repository.list_paginated(
-				page, page_size, search, role, status
-			)
+			if cursor is not None:
+				# Keyset mode: seek past the cursor, no OFFSET and no total count
+				users, next_cursor = await self.repository.list_summaries_by_cursor(
+					page_size, UserCursor.decode(cursor), search, role, status, metadata_filters
+				)
+				pagination = PaginationResponse(
+					page=page,
+					page_size=page_size,
+					total_pages=None,
+					total_items=None,
+					has_next=next_cursor is not None,
+					has_prev=None,
+					next_cursor=next_cursor.encode() if next_cursor else None,
+					count_mode="none",
+				)
+			else:
+				users, total, has_next = await self.repository.list_summaries(
+					page, page_size, search, role, status, count_mode, metadata_filters
+				)
+
+				total_pages = (total + page_size - 1) // page_size if total is not None else None
+				# Let clients switch to keyset pagination from any page
+				next_cursor = None
+				if has_next and users:
+					next_cursor = UserCursor(created_at=users[-1].created_at, id=users[-1].id)
 
+				pagination = PaginationResponse(
+					page=page,
+					page_size=page_size,
+					total_pages=total_pages,
+					total_items=total,
+					has_next=has_next,
+					has_prev=page > 1,
+					next_cursor=next_cursor.encode() if next_cursor else None,
+					count_mode=count_mode,
+				)
+
+			# Summaries carry exactly the UserResponse fields, straight from the query rows
 			response_data = [
 				UserResponse(
-					id=str(u.id),
-					email=u.email,
-					name=u.name,
-					avatar=u.avatar,
-					status=u.status,
-					created_at=u.created_at,
-					last_login=u.last_login,
+					str(u.id),
+					u.email,
+					u.name,
+					u.avatar,
+					u.status,
+					u.created_at,
+					u.last_login,
+					u.role_id,
 				)
 				for u in users
 			]
 
-			total_pages = (total + page_size - 1) // page_size
-			pagination = PaginationResponse(
-				page=page,
-				page_size=page_size,
-				total_pages=total_pages,
-				total_items=total,
-				has_next=page < total_pages,
-				has_prev=page > 1,
-			)
-
 			return PaginatedResponse.ok(response_data, pagination)
 
 		except Exception as e:
@@ -0,0 +1,22 @@
+"""Purge soft-deleted users use case."""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from vexen_user.application.dto import BaseResponse
+from vexen_user.domain.repository import IUserRepositoryPort
+
+
+@dataclass
+class PurgeDeletedUsers:
+	"""Remove users soft-deleted longer ago than a retention period"""
+
+	repository: IUserRepositoryPort
+
+	async def __call__(self, older_than: timedelta, batch_size: int = 1000) -> BaseResponse[int]:
+		try:
+			purged = await self.repository.purge_deleted(older_than, batch_size)
+			return BaseResponse.ok(purged, message=f"{purged} deleted users purged")
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error purging deleted users: {str(e)}")
@@ -0,0 +1,25 @@
+"""Record login use case."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from vexen_user.application.dto import BaseResponse
+from vexen_user.domain.repository import IUserRepositoryPort
+
+
+@dataclass
+class RecordLogin:
+	"""Write a user's last_login timestamp"""
+
+	repository: IUserRepositoryPort
+
+	async def __call__(self, user_id: str) -> BaseResponse[None]:
+		try:
+			updated = await self.repository.record_logins({user_id: datetime.now()})
+			if not updated:
+				return BaseResponse.fail(f"User with id {user_id} not found")
+
+			return BaseResponse.ok(None, message="Login recorded")
+
+		except Exception as e:
+			return BaseResponse.fail(f"Error recording login: {str(e)}")
@@ -8,6 +8,7 @@ from vexen_user.application.dto import (
 	UpdateUserRequest,
 	UserResponse,
 )
+from vexen_user.domain.entity import User
 from vexen_user.domain.repository import IUserRepositoryPort
 
 
@@ -19,24 +20,23 @@ class UpdateUser:
 
 	async def __call__(self, user_id: str, data: UpdateUserRequest) -> BaseResponse[UserResponse]:
 		try:
-			user = await self.repository.get_by_id(user_id)
-			if not user:
-				return BaseResponse.fail(f"User with id {user_id} not found")
-
-			# Update fields
+			# Only the provided fields are written, in a single UPDATE ... RETURNING
+			fields: dict = {"updated_at": datetime.now()}
 			if data.name is not None:
-				user.name = data.name
+				fields["name"] = data.name
 			if data.avatar is not None:
-				user.avatar = data.avatar
+				fields["avatar"] = data.avatar
 			if data.status is not None:
-				user.status = data.status
+				User.validate_status(data.status)
+				fields["status"] = data.status
 			if data.user_metadata is not None:
-				user.user_metadata = data.user_metadata
+				fields["user_metadata"] = data.user_metadata
+			if data.role_id is not None:
+				fields["role_id"] = data.role_id
 
-			user.updated_at = datetime.now()
-
-			# Save
-			updated_user = await self.repository.save(user)
+			updated_user = await self.repository.update_partial(user_id, fields)
+			if not updated_user:
+				return BaseResponse.fail(f"User with id {user_id} not found")
 
 			response = UserResponse(
 				id=str(updated_user.id),
@@ -46,6 +46,7 @@ class UpdateUser:
 				status=updated_user.status,
 				created_at=updated_user.created_at,
 				last_login=updated_user.last_login,
+				role_id=updated_user.role_id,
 			)
 
 			return BaseResponse.ok(response)
@@ -4,11 +4,14 @@ from dataclasses import dataclass, field
 
 from vexen_user.domain.repository import IUserRepositoryPort
 
+from .bulk_create_users import BulkCreateUsers
 from .create_user import CreateUser
 from .delete_user import DeleteUser
 from .get_user import GetUser
 from .get_user_stats import GetUserStats
 from .list_users import ListUsers
+from .purge_deleted_users import PurgeDeletedUsers
+from .record_login import RecordLogin
 from .update_user import UpdateUser
 
 
@@ -24,6 +27,9 @@ class UserUseCaseFactory:
 	update_user: UpdateUser = field(init=False)
 	delete_user: DeleteUser = field(init=False)
 	get_stats: GetUserStats = field(init=False)
+	bulk_create_users: BulkCreateUsers = field(init=False)
+	record_login: RecordLogin = field(init=False)
+	purge_deleted_users: PurgeDeletedUsers = field(init=False)
 
 	def __post_init__(self):
 		"""Initialize all use cases"""
@@ -33,3 +39,6 @@ class UserUseCaseFactory:
 		self.update_user = UpdateUser(repository=self.repository)
 		self.delete_user = DeleteUser(repository=self.repository)
 		self.get_stats = GetUserStats(repository=self.repository)
+		self.bulk_create_users = BulkCreateUsers(repository=self.repository)
+		self.record_login = RecordLogin(repository=self.repository)
+		self.purge_deleted_users = PurgeDeletedUsers(repository=self.repository)
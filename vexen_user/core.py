@@ -4,28 +4,92 @@ VexenUser - Public API for the vexen-user library.
 This module provides the main entry point for using the vexen-user system.
 """
 
-from dataclasses import dataclass
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Literal
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+	AsyncEngine,
+	AsyncSession,
+	async_sessionmaker,
+	create_async_engine,
+)
 
+from vexen_user.application.service.external_identity_service import ExternalIdentityService
+from vexen_user.application.service.last_login_recorder import LastLoginRecorder
 from vexen_user.application.service.user_service import UserService
-from vexen_user.domain.repository import IUserRepositoryPort
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort, IUserRepositoryPort
+from vexen_user.infraestructure.output.cache import CachedUserRepository, UserCacheConfig
 from vexen_user.infraestructure.output.persistence.sqlalchemy.adapters import (
+	user_external_identity_repository_adapter,
 	user_repository_adapter,
 )
-from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import Base
+from vexen_user.infraestructure.output.persistence.sqlalchemy.adapters.replica_router import (
+	ReplicaRouter,
+	ReplicaStrategy,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.adapters.shard_map import ShardMap
+from vexen_user.infraestructure.output.persistence.sqlalchemy.adapters.sharded_user_external_identity_repository_adapter import (  # noqa: E501
+	ShardedUserExternalIdentityRepositoryAdapter,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.adapters.sharded_user_repository_adapter import (  # noqa: E501
+	ShardedUserRepositoryAdapter,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.migrations import (
+	migrate_uuid_columns,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.pool import InstrumentedAsyncPool
+from vexen_user.infraestructure.output.persistence.sqlalchemy.schema import (
+	SchemaMode,
+	bootstrap_schema,
+	migrate_schema,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.search import (
+	SearchBackendName,
+	UserSearchBackend,
+	resolve_search_backend,
+)
+from vexen_user.shared.instrumentation import Instrumentation
 
 
 @dataclass
 class VexenUserConfig:
-	"""Configuration for VexenUser"""
+	"""
+	Configuration for VexenUser.
+
+	With a shard_map, unique constraints hold per shard: unless the shard key is
+	"email_domain" the same email can be registered on two shards, and concurrent
+	logins with a new external identity can link it on two shards.
+	"""
 
 	database_url: str
 	adapter: Literal["sqlalchemy"] = "sqlalchemy"
 	echo: bool = False
 	pool_size: int = 5
 	max_overflow: int = 10
+	pool_timeout: float = 30.0
+	pool_recycle: int = -1
+	pool_pre_ping: bool = False
+	statement_cache_size: int | None = None
+	stats_cache_ttl: float | None = None
+	search_backend: SearchBackendName | UserSearchBackend = "ilike"
+	metadata_index_keys: list[str] = field(default_factory=list)
+	cache: UserCacheConfig | None = None
+	replica_urls: list[str] = field(default_factory=list)
+	replica_strategy: ReplicaStrategy = "round_robin"
+	read_your_writes_window: float = 5.0
+	shard_map: ShardMap | None = None
+	shard_location_cache_size: int = 100_000
+	shard_location_cache_ttl: float | None = 3600.0
+	shard_max_offset_rows: int = 10_000
+	last_login_flush_interval: float | None = None
+	last_login_batch_size: int = 1000
+	soft_delete: bool = False
+	instrumentation: Instrumentation | None = None
 
 
 class VexenUser:
@@ -58,68 +122,388 @@ class VexenUser:
 		echo: bool = False,
 		pool_size: int = 5,
 		max_overflow: int = 10,
+		pool_timeout: float = 30.0,
+		pool_recycle: int = -1,
+		pool_pre_ping: bool = False,
+		statement_cache_size: int | None = None,
+		stats_cache_ttl: float | None = None,
+		search_backend: SearchBackendName | UserSearchBackend = "ilike",
+		metadata_index_keys: list[str] | None = None,
+		cache: UserCacheConfig | bool | None = None,
+		replica_urls: list[str] | None = None,
+		replica_strategy: ReplicaStrategy = "round_robin",
+		read_your_writes_window: float = 5.0,
+		shard_map: ShardMap | None = None,
+		shard_location_cache_size: int = 100_000,
+		shard_location_cache_ttl: float | None = 3600.0,
+		shard_max_offset_rows: int = 10_000,
+		last_login_flush_interval: float | None = None,
+		last_login_batch_size: int = 1000,
+		soft_delete: bool = False,
+		instrumentation: Instrumentation | None = None,
 	):
 		"""
 		Initialize VexenUser.
 
 		Args:
-			database_url: Database connection string
+			database_url: Database connection string (leave empty with shard_map)
 			adapter: Repository adapter to use (currently only 'sqlalchemy')
 			echo: Enable SQL echo (for debugging)
 			pool_size: Connection pool size
 			max_overflow: Max overflow connections
+			pool_timeout: Seconds to wait for a free connection before failing
+			pool_recycle: Replace connections older than this many seconds (-1 never)
+			pool_pre_ping: Test connections on checkout and reconnect if they are stale
+			statement_cache_size: asyncpg prepared statement cache size per connection
+				(0 disables it, required behind pgbouncer in transaction mode)
+			stats_cache_ttl: Seconds to cache user stats between writes (None disables it)
+			search_backend: User search strategy: 'ilike', 'trigram' (PostgreSQL pg_trgm),
+				'fts5' (SQLite FTS5), 'auto' (best for the dialect) or a UserSearchBackend
+			metadata_index_keys: user_metadata keys often used in metadata_filters. On
+				SQLite each gets an expression index; PostgreSQL serves every key from
+				the GIN index on the JSONB column.
+			cache: Cache users looked up by id/email in memory. Pass True for defaults
+				or a UserCacheConfig to tune size and TTL.
+			replica_urls: Read replica connection strings. Read-only queries are spread
+				across them; writes always go to database_url.
+			replica_strategy: 'round_robin' or 'least_connections'
+			read_your_writes_window: Seconds a written user is read from the primary
+			shard_map: Split users across several databases (one engine per shard).
+				Single-user operations run on the user's shard; lists and stats fan out
+				to every shard and are merged. Cannot be combined with replica_urls.
+				Emails and external identities are only unique per shard; see
+				VexenUserConfig.
+			shard_location_cache_size: User IDs whose shard is remembered with a
+				shard_map; IDs not remembered are looked up on every shard
+			shard_location_cache_ttl: Seconds a remembered shard is kept (None keeps
+				it until evicted)
+			shard_max_offset_rows: Deepest page * page_size served by OFFSET pages
+				with a shard_map, since every shard reads that many rows; deeper
+				pages fail and need cursor pagination
+			last_login_flush_interval: Buffer service.record_login() calls and write them
+				in batches every this many seconds (None writes each login immediately)
+			last_login_batch_size: Buffered logins that trigger an early batch write
+			soft_delete: Delete users by setting deleted_at instead of removing the row.
+				Tombstones are hidden from every query and free their email at once;
+				service.purge_deleted() removes them for good.
+			instrumentation: Collects per-method latency histograms, row counts and
+				connection acquire times, optionally as a callback or tracing spans
 		"""
+		if cache is True:
+			cache = UserCacheConfig()
+
 		self.config = VexenUserConfig(
 			database_url=database_url or "",
 			adapter=adapter,
 			echo=echo,
 			pool_size=pool_size,
 			max_overflow=max_overflow,
+			pool_timeout=pool_timeout,
+			pool_recycle=pool_recycle,
+			pool_pre_ping=pool_pre_ping,
+			statement_cache_size=statement_cache_size,
+			stats_cache_ttl=stats_cache_ttl,
+			search_backend=search_backend,
+			metadata_index_keys=list(metadata_index_keys or []),
+			cache=cache or None,
+			replica_urls=list(replica_urls or []),
+			replica_strategy=replica_strategy,
+			read_your_writes_window=read_your_writes_window,
+			shard_map=shard_map,
+			shard_location_cache_size=shard_location_cache_size,
+			shard_location_cache_ttl=shard_location_cache_ttl,
+			shard_max_offset_rows=shard_max_offset_rows,
+			last_login_flush_interval=last_login_flush_interval,
+			last_login_batch_size=last_login_batch_size,
+			soft_delete=soft_delete,
+			instrumentation=instrumentation,
 		)
 
 		self._engine = None
+		self._replica_engines = []
+		self._shard_engines: dict[str, AsyncEngine] = {}
 		self._session_factory = None
+		self._adapter: (
+			user_repository_adapter.UserRepositoryAdapter | ShardedUserRepositoryAdapter | None
+		) = None
 		self._repository: IUserRepositoryPort | None = None
 		self._service: UserService | None = None
+		self._last_logins: LastLoginRecorder | None = None
+		self._identity_repository: IUserExternalIdentityRepositoryPort | None = None
+		self._identities: ExternalIdentityService | None = None
+		self._search_backend: UserSearchBackend | None = None
 
-	async def init(self) -> None:
+	async def init(
+		self,
+		create_schema: SchemaMode = "create",
+		prewarm_pool: bool = False,
+		on_timing: Callable[[str, float], None] | None = None,
+	) -> None:
 		"""
 		Initialize the user system.
 
 		This creates the database engine, session factory, and initializes repositories.
+
+		Args:
+			create_schema: "create" creates missing tables and search objects on every
+				start, "check" does so only when the schema version table is missing or
+				outdated (a single query on warm starts), False never touches the schema.
+				New nullable columns are added to tables created by an older version;
+				their new indexes are not built (a warning is logged) until
+				migrate_schema() runs
+			prewarm_pool: Open pool_size connections per engine in parallel before
+				returning, so the first requests do not pay for connecting
+			on_timing: Called with (phase, seconds) for the "engine", "schema",
+				"prewarm" and "init" (total) phases
 		"""
+		started = time.perf_counter()
+
+		def report(phase: str, since: float) -> float:
+			now = time.perf_counter()
+			if on_timing is not None:
+				on_timing(phase, now - since)
+			return now
+
 		if self.config.adapter == "sqlalchemy":
-			await self._init_sqlalchemy()
+			await self._init_sqlalchemy(create_schema, prewarm_pool, report)
 		else:
 			raise ValueError(f"Unsupported adapter: {self.config.adapter}")
 
+		if self.config.cache is not None:
+			self._repository = CachedUserRepository(self._repository, self.config.cache)
+
+		if self.config.last_login_flush_interval is not None:
+			self._last_logins = LastLoginRecorder(
+				self._repository,
+				flush_interval=self.config.last_login_flush_interval,
+				max_batch=self.config.last_login_batch_size,
+			)
+
 		# Initialize service
-		self._service = UserService(repository=self._repository)
+		self._service = UserService(repository=self._repository, last_logins=self._last_logins)
+		self._identities = ExternalIdentityService(
+			repository=self._identity_repository, user_repository=self._repository
+		)
+
+		report("init", started)
 
-	async def _init_sqlalchemy(self) -> None:
+	async def _init_sqlalchemy(
+		self,
+		create_schema: SchemaMode,
+		prewarm_pool: bool,
+		report: Callable[[str, float], float],
+	) -> None:
 		"""Initialize SQLAlchemy engine and repositories"""
-		self._engine = create_async_engine(
-			self.config.database_url,
-			echo=self.config.echo,
-			pool_size=self.config.pool_size,
-			max_overflow=self.config.max_overflow,
-		)
+		phase_started = time.perf_counter()
+		shard_map = self.config.shard_map
+		if shard_map is not None:
+			if self.config.database_url or self.config.replica_urls:
+				raise ValueError("shard_map cannot be combined with database_url or replica_urls")
+			self._shard_engines = {
+				name: self._create_engine(url) for name, url in shard_map.urls.items()
+			}
+			# The first shard stands in for the primary in pool_stats()
+			self._engine = next(iter(self._shard_engines.values()))
+		else:
+			self._engine = self._create_engine(self.config.database_url)
 
 		self._session_factory = async_sessionmaker(
 			self._engine, class_=AsyncSession, expire_on_commit=False
 		)
 
-		# Create tables
-		async with self._engine.begin() as conn:
-			await conn.run_sync(Base.metadata.create_all)
+		replica_router = None
+		if self.config.replica_urls:
+			self._replica_engines = [self._create_engine(url) for url in self.config.replica_urls]
+			replica_router = ReplicaRouter(
+				[
+					async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+					for engine in self._replica_engines
+				],
+				strategy=self.config.replica_strategy,
+			)
+
+		search_backend = resolve_search_backend(
+			self.config.search_backend, self._engine.dialect.name
+		)
+		self._search_backend = search_backend
+
+		phase_started = report("engine", phase_started)
+
+		# Create tables and search support objects (on every shard at once)
+		await asyncio.gather(
+			*(
+				bootstrap_schema(
+					engine, search_backend, create_schema, self.config.metadata_index_keys
+				)
+				for engine in self._primary_engines()
+			)
+		)
+		phase_started = report("schema", phase_started)
+
+		if prewarm_pool:
+			await self._prewarm_pool()
+			report("prewarm", phase_started)
 
 		# Initialize repositories
-		self._repository = user_repository_adapter.UserRepositoryAdapter(self._session_factory)
+		if shard_map is not None:
+			shards = {
+				name: self._create_adapter(
+					async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+					search_backend,
+				)
+				for name, engine in self._shard_engines.items()
+			}
+			self._adapter = ShardedUserRepositoryAdapter(
+				shards,
+				shard_map,
+				instrumentation=self.config.instrumentation,
+				location_cache_size=self.config.shard_location_cache_size,
+				location_cache_ttl=self.config.shard_location_cache_ttl,
+				max_offset_rows=self.config.shard_max_offset_rows,
+			)
+			self._identity_repository = ShardedUserExternalIdentityRepositoryAdapter(self._adapter)
+		else:
+			self._adapter = self._create_adapter(
+				self._session_factory, search_backend, replica_router
+			)
+			self._identity_repository = (
+				user_external_identity_repository_adapter.UserExternalIdentityRepositoryAdapter(
+					self._adapter
+				)
+			)
+		self._repository = self._adapter
+
+	def _create_adapter(
+		self,
+		session_factory: async_sessionmaker[AsyncSession],
+		search_backend: UserSearchBackend,
+		replica_router: ReplicaRouter | None = None,
+	) -> user_repository_adapter.UserRepositoryAdapter:
+		return user_repository_adapter.UserRepositoryAdapter(
+			session_factory,
+			stats_cache_ttl=self.config.stats_cache_ttl,
+			search_backend=search_backend,
+			replica_router=replica_router,
+			read_your_writes_window=self.config.read_your_writes_window,
+			instrumentation=self.config.instrumentation,
+			soft_delete=self.config.soft_delete,
+		)
+
+	def _primary_engines(self) -> list[AsyncEngine]:
+		"""Engines that take writes: every shard, or the single primary"""
+		if self._shard_engines:
+			return list(self._shard_engines.values())
+		return [self._engine] if self._engine is not None else []
+
+	def _create_engine(self, url: str) -> AsyncEngine:
+		"""Create an engine with the configured pool options"""
+		connect_args = {}
+		if self.config.statement_cache_size is not None:
+			if make_url(url).get_driver_name() != "asyncpg":
+				raise ValueError("statement_cache_size is only supported with asyncpg")
+			connect_args["statement_cache_size"] = self.config.statement_cache_size
+
+		return create_async_engine(
+			url,
+			echo=self.config.echo,
+			poolclass=InstrumentedAsyncPool,
+			pool_size=self.config.pool_size,
+			max_overflow=self.config.max_overflow,
+			pool_timeout=self.config.pool_timeout,
+			pool_recycle=self.config.pool_recycle,
+			pool_pre_ping=self.config.pool_pre_ping,
+			connect_args=connect_args,
+		)
+
+	async def _prewarm_pool(self) -> None:
+		"""Check out pool_size connections per engine at once, then return them to the pool"""
+		engines = [*self._primary_engines(), *self._replica_engines]
+		async with AsyncExitStack() as stack:
+			await asyncio.gather(
+				*(
+					stack.enter_async_context(engine.connect())
+					for engine in engines
+					for _ in range(self.config.pool_size)
+				)
+			)
+
+	def pool_stats(self) -> dict:
+		"""
+		Get live connection pool metrics.
+
+		Returns:
+			Dictionary with "primary", "replicas" (one entry per replica URL) and
+			"shards" (by shard name; "primary" is the first shard). Each entry has
+			size, checked_out, idle, overflow, max_overflow, waiters, timeouts,
+			acquisitions and acquire_p50_ms/p99_ms/max_ms.
+
+		Raises:
+			RuntimeError: If init() hasn't been called
+		"""
+		if self._engine is None:
+			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
+
+		return {
+			"primary": self._engine.pool.stats(),
+			"replicas": [engine.pool.stats() for engine in self._replica_engines],
+			"shards": {name: engine.pool.stats() for name, engine in self._shard_engines.items()},
+		}
+
+	async def migrate_uuid_columns(self) -> bool:
+		"""
+		Convert id columns written by versions that stored UUIDs as strings.
+
+		Run once after upgrading an existing database: PostgreSQL columns become
+		native uuid and SQLite values become 16-byte blobs. Safe to repeat.
+
+		Returns:
+			True if anything was converted
+
+		Raises:
+			RuntimeError: If init() hasn't been called
+		"""
+		if self._engine is None:
+			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
+
+		converted = False
+		for engine in self._primary_engines():
+			async with engine.begin() as conn:
+				converted = await migrate_uuid_columns(conn) or converted
+		return converted
+
+	async def migrate_schema(self) -> bool:
+		"""
+		Upgrade tables created by an older version: add new columns, convert
+		PostgreSQL json columns to jsonb, build new indexes (including those of
+		the search backend) and drop the ones they replace.
+
+		init() only adds the new nullable columns, so the service works at once;
+		run this once after upgrading, at a time of your choosing, for the rest.
+		On PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY, so
+		writes continue during the build. Safe to repeat.
+
+		Returns:
+			True if anything was changed
+
+		Raises:
+			RuntimeError: If init() hasn't been called
+		"""
+		if self._engine is None:
+			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
+
+		changed = False
+		for engine in self._primary_engines():
+			changed = await migrate_schema(engine, self._search_backend) or changed
+		return changed
 
 	async def close(self) -> None:
 		"""Close database connections and clean up resources"""
-		if self._engine:
-			await self._engine.dispose()
+		# Write buffered logins while the engine is still usable
+		if self._last_logins is not None:
+			await self._last_logins.close()
+			self._last_logins = None
+		for engine in [*self._primary_engines(), *self._replica_engines]:
+			await engine.dispose()
 
 	@property
 	def service(self) -> UserService:
@@ -136,6 +520,21 @@ class VexenUser:
 			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
 		return self._service
 
+	@property
+	def identities(self) -> ExternalIdentityService:
+		"""
+		Get the external identity service (OAuth/OpenID login and account linking).
+
+		Returns:
+			ExternalIdentityService: Service for external identity operations
+
+		Raises:
+			RuntimeError: If init() hasn't been called
+		"""
+		if self._identities is None:
+			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
+		return self._identities
+
 	@property
 	def repository(self) -> IUserRepositoryPort:
 		"""
@@ -151,6 +550,36 @@ class VexenUser:
 			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
 		return self._repository
 
+	@asynccontextmanager
+	async def transaction(self) -> AsyncIterator[UserService]:
+		"""
+		Run several operations in one session and one database transaction.
+
+		Every service/repository call inside the block shares a single connection.
+		The transaction commits when the block exits and rolls back if it raises.
+		Service methods report errors as failed responses instead of raising, so
+		raise yourself to roll back when a step fails.
+
+		Example:
+			```python
+			async with user_system.transaction() as service:
+				created = await service.create(CreateUserRequest(...))
+				if not created.success:
+					raise RuntimeError(created.error)
+				await service.update(created.data.id, UpdateUserRequest(status="inactive"))
+			```
+
+		Raises:
+			RuntimeError: If init() hasn't been called or users are sharded
+		"""
+		if self._adapter is None:
+			raise RuntimeError("VexenUser not initialized. Call await vexen_user.init() first")
+
+		# The entity cache skips rows read inside the block and drops the written
+		# users when it commits or rolls back
+		async with self._adapter.transaction():
+			yield self.service
+
 	# Context manager support
 	async def __aenter__(self):
 		"""Async context manager entry"""
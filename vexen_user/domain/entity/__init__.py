@@ -1,5 +1,6 @@
 """Domain entities."""
 
 from .user import User
+from .user_external_identity import UserExternalIdentity
 
-__all__ = ["User"]
+__all__ = ["User", "UserExternalIdentity"]
@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
 	"""
 	User entity representing a system user.
@@ -22,6 +22,9 @@ class User:
 		updated_at: Timestamp when user was last updated
 		last_login: Timestamp of last login
 		user_metadata: Additional user metadata (department, phone, etc.)
+		role_id: ID of the user's role (managed by vexen-rbac)
+		metadata_loaded: False when the user was read without user_metadata, which
+			is then empty instead of the stored value (saving it keeps the stored one)
 	"""
 
 	id: uuid.UUID | None
@@ -33,18 +36,25 @@ class User:
 	updated_at: datetime | None = None
 	last_login: datetime | None = None
 	user_metadata: dict | None = None
+	role_id: str | None = None
+	metadata_loaded: bool = field(default=True, repr=False, compare=False)
 
 	def __post_init__(self):
 		"""Validation"""
 		if not self.email or "@" not in self.email:
 			raise ValueError("Invalid email format")
 
-		if self.status not in ("active", "inactive"):
-			raise ValueError("Status must be 'active' or 'inactive'")
+		self.validate_status(self.status)
 
 		if self.user_metadata is None:
 			self.user_metadata = {}
 
+	@staticmethod
+	def validate_status(status: str) -> None:
+		"""Raise ValueError if status is not a valid user status"""
+		if status not in ("active", "inactive"):
+			raise ValueError("Status must be 'active' or 'inactive'")
+
 	def is_active(self) -> bool:
 		"""Check if user is active"""
 		return self.status == "active"
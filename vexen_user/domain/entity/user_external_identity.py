@@ -0,0 +1,44 @@
+"""
+User external identity entity for the domain layer.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(slots=True)
+class UserExternalIdentity:
+	"""
+	Link between a user and an identity at an external OAuth/OpenID provider.
+
+	Attributes:
+		id: Unique identifier (UUID v7)
+		user_id: ID of the linked user
+		provider: Provider name (google, azure, github, etc.)
+		provider_user_id: User ID at the provider (the 'sub' claim)
+		email: Email reported by the provider
+		provider_data: Additional provider data (name, picture, locale, etc.)
+		created_at: Timestamp when the identity was linked
+		updated_at: Timestamp when the identity was last updated
+	"""
+
+	id: uuid.UUID | None
+	user_id: uuid.UUID
+	provider: str
+	provider_user_id: str
+	email: str | None = None
+	provider_data: dict | None = None
+	created_at: datetime = field(default_factory=datetime.now)
+	updated_at: datetime | None = None
+
+	def __post_init__(self):
+		"""Validation"""
+		if not self.provider:
+			raise ValueError("Provider is required")
+
+		if not self.provider_user_id:
+			raise ValueError("Provider user ID is required")
+
+		if self.provider_data is None:
+			self.provider_data = {}
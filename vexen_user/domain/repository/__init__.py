@@ -1,5 +1,11 @@
 """Domain repository ports."""
 
-from .user_repository_port import IUserRepositoryPort
+from .user_external_identity_repository_port import IUserExternalIdentityRepositoryPort
+from .user_repository_port import CountMode, IUserRepositoryPort, WriteListener
 
-__all__ = ["IUserRepositoryPort"]
+__all__ = [
+	"CountMode",
+	"IUserRepositoryPort",
+	"IUserExternalIdentityRepositoryPort",
+	"WriteListener",
+]
@@ -0,0 +1,76 @@
+"""User external identity repository port (interface)."""
+
+from abc import ABC, abstractmethod
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.entity.user_external_identity import UserExternalIdentity
+
+
+class IUserExternalIdentityRepositoryPort(ABC):
+	"""
+	Interface for User external identity repository.
+
+	A provider identity is linked to at most one user per database. An
+	implementation spread over several databases checks the others before
+	linking, but that check and the insert are separate steps: concurrent
+	link() or login_or_provision() calls for the same identity can still link
+	it on two databases.
+	"""
+
+	@abstractmethod
+	async def find_user_by_identity(self, provider: str, provider_user_id: str) -> User | None:
+		"""Get the user linked to a provider identity"""
+		pass
+
+	@abstractmethod
+	async def list_by_user(self, user_id: str) -> list[UserExternalIdentity]:
+		"""Get all identities linked to a user"""
+		pass
+
+	@abstractmethod
+	async def link(self, identity: UserExternalIdentity) -> UserExternalIdentity:
+		"""
+		Link a provider identity to a user, refreshing its data if already linked.
+
+		Raises:
+			ValueError: If the identity is linked to a different user
+		"""
+		pass
+
+	@abstractmethod
+	async def unlink(self, user_id: str, provider: str, provider_user_id: str | None = None) -> int:
+		"""
+		Unlink a user's identities for a provider (or a single one).
+
+		Returns:
+			Number of identities removed
+		"""
+		pass
+
+	@abstractmethod
+	async def login_or_provision(
+		self,
+		provider: str,
+		provider_user_id: str,
+		new_user: User,
+		provider_data: dict | None = None,
+		link_existing_email: bool = False,
+	) -> tuple[User, bool]:
+		"""
+		Record a login for a provider identity, creating the user if it is unknown.
+
+		Args:
+			provider: Provider name
+			provider_user_id: User ID at the provider
+			new_user: User to create when the identity is not linked yet
+			provider_data: Provider data stored on the new identity
+			link_existing_email: Link to an existing user with new_user.email instead
+				of failing. Only enable it for providers that verify emails.
+
+		Returns:
+			Tuple of (user, created). The user is read without user_metadata.
+
+		Raises:
+			ValueError: If the email is taken and link_existing_email is False
+		"""
+		pass
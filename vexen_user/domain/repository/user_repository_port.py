@@ -1,12 +1,28 @@
 """User repository port (interface)."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any, Literal
 
 from vexen_user.domain.entity.user import User
+from vexen_user.domain.vo.user_cursor import UserCursor
+from vexen_user.domain.vo.user_summary import UserSummary
+
+CountMode = Literal["exact", "none", "estimated"]
+
+# Called with the IDs of users written by a path the caller did not see
+WriteListener = Callable[[Iterable[str]], None]
 
 
 class IUserRepositoryPort(ABC):
-	"""Interface for User repository"""
+	"""
+	Interface for User repository.
+
+	Emails are unique per database. An implementation spread over several
+	databases may only enforce that per database: when users are not assigned
+	to a database by their email, the same email can exist in two of them.
+	"""
 
 	@abstractmethod
 	async def get_by_id(self, user_id: str) -> User | None:
@@ -14,8 +30,35 @@ class IUserRepositoryPort(ABC):
 		pass
 
 	@abstractmethod
-	async def get_by_email(self, email: str) -> User | None:
-		"""Get user by email"""
+	async def get_by_email(self, email: str, with_metadata: bool = False) -> User | None:
+		"""
+		Get user by email.
+
+		user_metadata is only read with with_metadata=True; otherwise the user
+		comes back with metadata_loaded=False and an empty user_metadata. If
+		several databases hold the email (see the class docstring), one of the
+		users is returned.
+		"""
+		pass
+
+	@abstractmethod
+	async def get_many_by_ids(self, user_ids: list[str]) -> list[User]:
+		"""
+		Get many users by ID in one query.
+
+		Returns:
+			The users found, in no particular order (unknown IDs are left out)
+		"""
+		pass
+
+	@abstractmethod
+	async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+		"""
+		Get many users by email in one query.
+
+		Returns:
+			The users found, in no particular order (unknown emails are left out)
+		"""
 		pass
 
 	@abstractmethod
@@ -24,8 +67,78 @@ class IUserRepositoryPort(ABC):
 		pass
 
 	@abstractmethod
-	async def delete(self, user_id: str) -> None:
-		"""Delete user"""
+	async def update_partial(self, user_id: str, fields: dict) -> User | None:
+		"""
+		Update only the given columns of a user in a single statement.
+
+		Args:
+			user_id: ID of the user to update
+			fields: Column values to set (name, email, avatar, status, updated_at,
+				last_login, user_metadata, role_id)
+
+		Returns:
+			The updated user, or None if it does not exist
+		"""
+		pass
+
+	@abstractmethod
+	async def bulk_create(self, users: list[User]) -> list[User]:
+		"""
+		Insert many users at once, skipping emails that already exist.
+
+		Returns:
+			The users that were inserted (existing emails are left out)
+		"""
+		pass
+
+	@abstractmethod
+	async def bulk_upsert(self, users: list[User]) -> list[User]:
+		"""
+		Insert many users at once, updating the ones whose email already exists.
+
+		Returns:
+			The inserted or updated users
+		"""
+		pass
+
+	@abstractmethod
+	async def record_logins(self, logins: Mapping[str, datetime]) -> int:
+		"""
+		Set last_login for many users in batched statements.
+
+		A user's last_login is never moved backwards.
+
+		Args:
+			logins: Login timestamp by user ID
+
+		Returns:
+			Number of users updated
+		"""
+		pass
+
+	@abstractmethod
+	async def delete(self, user_id: str) -> bool:
+		"""
+		Delete a user with a single statement.
+
+		With soft delete the row is kept as a tombstone (deleted_at is set) and
+		hidden from every query until purge_deleted() removes it.
+
+		Returns:
+			True if a user was deleted, False if none matched
+		"""
+		pass
+
+	@abstractmethod
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000) -> int:
+		"""
+		Remove soft-deleted users (and their identities) deleted more than older_than ago.
+
+		Rows are removed in batches of batch_size, each in its own short transaction.
+
+		Returns:
+			Number of users purged
+		"""
 		pass
 
 	@abstractmethod
@@ -36,12 +149,101 @@ class IUserRepositoryPort(ABC):
 		search: str | None = None,
 		role: str | None = None,
 		status: str | None = None,
-	) -> tuple[list[User], int]:
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], int | None, bool]:
 		"""
 		List users with pagination and filters.
 
+		Args:
+			count_mode: How to compute the total. "exact" runs a count query,
+				"estimated" returns a cheap approximation and "none" skips it.
+			metadata_filters: Keep users whose user_metadata has every one of these
+				key/value pairs (e.g. {"department": "eng"})
+			with_metadata: Read user_metadata too. Without it the JSON column is left
+				out of the query and users have metadata_loaded=False.
+
+		Returns:
+			Tuple of (users, total_count, has_next). total_count is None when
+			count_mode is "none".
+		"""
+		pass
+
+	@abstractmethod
+	async def list_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], UserCursor | None]:
+		"""
+		List users with keyset pagination and filters.
+
+		Users are ordered by (created_at DESC, id DESC) and only those strictly
+		after the cursor are returned, so every page costs the same. As in
+		list_paginated, user_metadata is only read with with_metadata=True.
+
 		Returns:
-			Tuple of (users, total_count)
+			Tuple of (users, next_cursor). next_cursor is None on the last page.
+		"""
+		pass
+
+	@abstractmethod
+	async def list_summaries(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], int | None, bool]:
+		"""
+		Same as list_paginated, but selects only the UserSummary columns.
+
+		Returns:
+			Tuple of (summaries, total_count, has_next)
+		"""
+		pass
+
+	@abstractmethod
+	async def list_summaries_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], UserCursor | None]:
+		"""
+		Same as list_by_cursor, but selects only the UserSummary columns.
+
+		Returns:
+			Tuple of (summaries, next_cursor)
+		"""
+		pass
+
+	@abstractmethod
+	def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[User]:
+		"""
+		Iterate over every user matching the filters with a server-side cursor.
+
+		Rows are fetched batch_size at a time, so memory use does not depend on
+		the number of users. Users are ordered by (created_at DESC, id DESC).
 		"""
 		pass
 
@@ -54,3 +256,18 @@ class IUserRepositoryPort(ABC):
 			Dictionary with stats: total, active, inactive, by_role, etc.
 		"""
 		pass
+
+	@property
+	def in_transaction(self) -> bool:
+		"""Whether calls in the current task share a unit of work not yet committed"""
+		return False
+
+	def add_write_listener(self, listener: WriteListener) -> None:
+		"""
+		Register a callback for writes that bypass the object holding this repository.
+
+		Implementations call listener with the written user IDs after writes made
+		through other adapters (e.g. identity logins) and when a transaction ends.
+		Repositories without such writes never call it.
+		"""
+		return None
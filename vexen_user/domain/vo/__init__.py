@@ -0,0 +1,6 @@
+"""Domain value objects."""
+
+from .user_cursor import UserCursor
+from .user_summary import UserSummary
+
+__all__ = ["UserCursor", "UserSummary"]
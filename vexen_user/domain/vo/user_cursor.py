@@ -0,0 +1,42 @@
+"""Opaque keyset cursor for user listings."""
+
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserCursor:
+	"""
+	Seek position in a user listing ordered by (created_at DESC, id DESC).
+
+	Attributes:
+		created_at: Creation timestamp of the last user on the previous page
+		id: UUID v7 of the last user on the previous page (tie-breaker)
+	"""
+
+	created_at: datetime
+	id: uuid.UUID
+
+	def encode(self) -> str:
+		"""Encode the cursor as an opaque URL-safe token"""
+		raw = f"{self.created_at.isoformat()}|{self.id}"
+		return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+	@classmethod
+	def decode(cls, token: str) -> "UserCursor":
+		"""
+		Decode an opaque token produced by encode().
+
+		Raises:
+			ValueError: If the token is malformed
+		"""
+		try:
+			padded = token + "=" * (-len(token) % 4)
+			raw = base64.urlsafe_b64decode(padded.encode()).decode()
+			created_at, user_id = raw.split("|", 1)
+			return cls(created_at=datetime.fromisoformat(created_at), id=uuid.UUID(user_id))
+		except (ValueError, binascii.Error, UnicodeDecodeError) as e:
+			raise ValueError("Invalid cursor") from e
@@ -0,0 +1,24 @@
+"""Read-only projection of a user for list views."""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserSummary:
+	"""
+	The user columns shown in listings, loaded without the full entity.
+
+	Built straight from database rows: no validation and no user_metadata.
+	Field order matches the projected columns.
+	"""
+
+	id: uuid.UUID
+	email: str
+	name: str
+	avatar: str | None
+	status: str
+	created_at: datetime
+	last_login: datetime | None
+	role_id: str | None
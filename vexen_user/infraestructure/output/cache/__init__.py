@@ -0,0 +1,5 @@
+"""In-process caching decorators for repository ports."""
+
+from .cached_user_repository import CachedUserRepository, UserCacheConfig
+
+__all__ = ["CachedUserRepository", "UserCacheConfig"]
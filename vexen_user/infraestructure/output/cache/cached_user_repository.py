@@ -0,0 +1,288 @@
+"""Read-through cache in front of a user repository."""
+
+import copy
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.repository import CountMode, IUserRepositoryPort, WriteListener
+from vexen_user.domain.vo import UserCursor, UserSummary
+from vexen_user.shared.cache import TTLCache
+
+
+@dataclass
+class UserCacheConfig:
+	"""
+	Configuration for the user entity cache.
+
+	Attributes:
+		maxsize: Maximum number of users kept (least recently used are evicted)
+		ttl: Seconds a cached user stays valid. Bounds staleness for writes made
+			by other processes, which this cache cannot see.
+	"""
+
+	maxsize: int = 10_000
+	ttl: float | None = 30.0
+
+
+class CachedUserRepository(IUserRepositoryPort):
+	"""
+	Repository decorator that caches get_by_id/get_by_email results.
+
+	Writes go straight to the wrapped repository and invalidate the affected
+	entries, as do writes the wrapped repository reports to its write listeners
+	(identity logins, transactions). List and stats queries are not cached.
+	Cached users are copied on the way out so callers can mutate them freely.
+
+	A read only fills the cache if none of its users was invalidated while it
+	was in flight, and never inside a transaction, whose rows may be rolled back.
+	"""
+
+	def __init__(self, repository: IUserRepositoryPort, config: UserCacheConfig | None = None):
+		self._repository = repository
+		self.config = config or UserCacheConfig()
+		self._by_id = TTLCache(maxsize=self.config.maxsize, ttl=self.config.ttl)
+		self._id_by_email = TTLCache(maxsize=self.config.maxsize, ttl=self.config.ttl)
+		# Invalidation generation: a counter, the generation of each recent invalidation
+		# and the newest generation dropped from that bounded map
+		self._generation = 0
+		self._invalidated_at: OrderedDict[str, int] = OrderedDict()
+		self._forgotten_before = 0
+		self.hits = 0
+		self.misses = 0
+		repository.add_write_listener(self._invalidate_many)
+
+	@property
+	def in_transaction(self) -> bool:
+		return self._repository.in_transaction
+
+	def add_write_listener(self, listener: WriteListener) -> None:
+		self._repository.add_write_listener(listener)
+
+	async def get_by_id(self, user_id: str) -> User | None:
+		key = self._normalize_id(user_id)
+		cached = self._by_id.get(key)
+		if cached is not None:
+			self.hits += 1
+			return copy.deepcopy(cached)
+
+		self.misses += 1
+		started = self._generation
+		user = await self._repository.get_by_id(user_id)
+		if user is not None:
+			self._store(user, started)
+		return user
+
+	async def get_by_email(self, email: str, with_metadata: bool = False) -> User | None:
+		user_id = self._id_by_email.get(email)
+		cached = self._by_id.get(user_id) if user_id is not None else None
+		if cached is not None and cached.email == email:
+			self.hits += 1
+			return copy.deepcopy(cached)
+
+		self.misses += 1
+		started = self._generation
+		user = await self._repository.get_by_email(email, with_metadata)
+		# Only complete users are cached, get_by_id hits must carry metadata
+		if user is not None and user.metadata_loaded:
+			self._store(user, started)
+		return user
+
+	async def get_many_by_ids(self, user_ids: list[str]) -> list[User]:
+		users: list[User] = []
+		missing: list[str] = []
+		for user_id in dict.fromkeys(user_ids):
+			cached = self._by_id.get(self._normalize_id(user_id))
+			if cached is not None:
+				users.append(copy.deepcopy(cached))
+			else:
+				missing.append(user_id)
+
+		self.hits += len(users)
+		self.misses += len(missing)
+		if missing:
+			started = self._generation
+			fetched = await self._repository.get_many_by_ids(missing)
+			for user in fetched:
+				self._store(user, started)
+			users.extend(fetched)
+		return users
+
+	async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+		users: list[User] = []
+		missing: list[str] = []
+		for email in dict.fromkeys(emails):
+			user_id = self._id_by_email.get(email)
+			cached = self._by_id.get(user_id) if user_id is not None else None
+			if cached is not None and cached.email == email:
+				users.append(copy.deepcopy(cached))
+			else:
+				missing.append(email)
+
+		self.hits += len(users)
+		self.misses += len(missing)
+		if missing:
+			started = self._generation
+			fetched = await self._repository.get_many_by_emails(missing)
+			for user in fetched:
+				self._store(user, started)
+			users.extend(fetched)
+		return users
+
+	async def save(self, user: User) -> User:
+		if user.id is not None:
+			self.invalidate(str(user.id))
+		result = await self._repository.save(user)
+		self.invalidate(str(result.id))
+		return result
+
+	async def update_partial(self, user_id: str, fields: dict) -> User | None:
+		self.invalidate(user_id)
+		result = await self._repository.update_partial(user_id, fields)
+		self.invalidate(user_id)
+		return result
+
+	async def bulk_create(self, users: list[User]) -> list[User]:
+		return await self._repository.bulk_create(users)
+
+	async def bulk_upsert(self, users: list[User]) -> list[User]:
+		result = await self._repository.bulk_upsert(users)
+		for user in result:
+			self.invalidate(str(user.id))
+		return result
+
+	async def record_logins(self, logins: Mapping[str, datetime]) -> int:
+		updated = await self._repository.record_logins(logins)
+		for user_id in logins:
+			self.invalidate(user_id)
+		return updated
+
+	async def delete(self, user_id: str) -> bool:
+		self.invalidate(user_id)
+		deleted = await self._repository.delete(user_id)
+		self.invalidate(user_id)
+		return deleted
+
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000) -> int:
+		# Tombstones were invalidated when deleted, so nothing cached refers to them
+		return await self._repository.purge_deleted(older_than, batch_size)
+
+	async def list_paginated(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], int | None, bool]:
+		return await self._repository.list_paginated(
+			page, page_size, search, role, status, count_mode, metadata_filters, with_metadata
+		)
+
+	async def list_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], UserCursor | None]:
+		return await self._repository.list_by_cursor(
+			page_size, cursor, search, role, status, metadata_filters, with_metadata
+		)
+
+	async def list_summaries(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], int | None, bool]:
+		return await self._repository.list_summaries(
+			page, page_size, search, role, status, count_mode, metadata_filters
+		)
+
+	async def list_summaries_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], UserCursor | None]:
+		return await self._repository.list_summaries_by_cursor(
+			page_size, cursor, search, role, status, metadata_filters
+		)
+
+	def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[User]:
+		return self._repository.stream_all(batch_size, search, role, status, metadata_filters)
+
+	async def get_stats(self) -> dict:
+		return await self._repository.get_stats()
+
+	def invalidate(self, user_id: str) -> None:
+		"""Drop a user (and its email key) from the cache"""
+		key = self._normalize_id(user_id)
+		cached = self._by_id.pop(key)
+		if cached is not None:
+			self._id_by_email.pop(cached.email)
+
+		# Reads of this user in flight must not store what they fetched
+		self._generation += 1
+		self._invalidated_at[key] = self._generation
+		self._invalidated_at.move_to_end(key)
+		if len(self._invalidated_at) > self.config.maxsize:
+			_, self._forgotten_before = self._invalidated_at.popitem(last=False)
+
+	def _invalidate_many(self, user_ids: Iterable[str]) -> None:
+		for user_id in user_ids:
+			self.invalidate(user_id)
+
+	def clear(self) -> None:
+		"""Drop every cached user"""
+		self._by_id.clear()
+		self._id_by_email.clear()
+		self._generation += 1
+		self._invalidated_at.clear()
+		self._forgotten_before = self._generation
+
+	def cache_info(self) -> dict:
+		"""Return hit/miss counters and current size"""
+		return {"hits": self.hits, "misses": self.misses, "size": len(self._by_id)}
+
+	def _store(self, user: User, started: int) -> None:
+		"""Cache a user read when the generation was started, unless that read is stale"""
+		if self._repository.in_transaction:
+			return
+		key = str(user.id)
+		if started < self._forgotten_before or self._invalidated_at.get(key, 0) > started:
+			return
+		self._by_id.set(key, copy.deepcopy(user))
+		self._id_by_email.set(user.email, key)
+
+	@staticmethod
+	def _normalize_id(user_id: str) -> str:
+		try:
+			return str(uuid.UUID(str(user_id)))
+		except (ValueError, AttributeError):
+			return str(user_id)
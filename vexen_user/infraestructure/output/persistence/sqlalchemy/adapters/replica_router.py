@@ -0,0 +1,55 @@
+"""Session routing across read replicas."""
+
+import itertools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+ReplicaStrategy = Literal["round_robin", "least_connections"]
+
+
+class ReplicaRouter:
+	"""
+	Picks a read replica for each read-only session.
+
+	Strategies:
+		round_robin: Cycle through replicas in order
+		least_connections: Use the replica with the fewest sessions open by this router
+	"""
+
+	def __init__(
+		self,
+		session_factories: list[async_sessionmaker[AsyncSession]],
+		strategy: ReplicaStrategy = "round_robin",
+	):
+		if not session_factories:
+			raise ValueError("ReplicaRouter needs at least one replica")
+		if strategy not in ("round_robin", "least_connections"):
+			raise ValueError(f"Unsupported replica strategy: {strategy}")
+
+		self._session_factories = session_factories
+		self.strategy = strategy
+		self._cycle = itertools.cycle(range(len(session_factories)))
+		self._in_use = [0] * len(session_factories)
+
+	def _pick(self) -> int:
+		if self.strategy == "least_connections":
+			return min(range(len(self._in_use)), key=self._in_use.__getitem__)
+		return next(self._cycle)
+
+	@asynccontextmanager
+	async def session(self) -> AsyncIterator[AsyncSession]:
+		"""Open a session on the selected replica"""
+		index = self._pick()
+		self._in_use[index] += 1
+		try:
+			async with self._session_factories[index]() as session:
+				yield session
+		finally:
+			self._in_use[index] -= 1
+
+	def in_use(self) -> list[int]:
+		"""Sessions currently open per replica"""
+		return list(self._in_use)
@@ -0,0 +1,83 @@
+"""Shard map: which database holds each user."""
+
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from vexen_user.domain.entity.user import User
+
+ShardKey = Literal["email_domain", "tenant"] | Callable[[User], str]
+
+
+@dataclass
+class ShardMap:
+	"""
+	Databases the users table is split across, and how users are assigned to them.
+
+	Each user lives on one shard, chosen from its shard key: the email domain,
+	the tenant stored in user_metadata, or the result of a callable. Keys listed
+	in routes go to the named shard; any other key is hashed (crc32) over the
+	shard names, so adding a shard moves unrouted keys. Pin existing keys in
+	routes before adding shards to a populated map.
+
+	Attributes:
+		urls: Database URL by shard name
+		key: "email_domain", "tenant" or a callable returning the key of a User
+		tenant_key: user_metadata key holding the tenant when key is "tenant"
+		routes: Shard name by shard key, overriding the hash
+	"""
+
+	urls: dict[str, str]
+	key: ShardKey = "email_domain"
+	tenant_key: str = "tenant"
+	routes: dict[str, str] = field(default_factory=dict)
+
+	def __post_init__(self):
+		if not self.urls:
+			raise ValueError("ShardMap needs at least one shard")
+		if not callable(self.key) and self.key not in ("email_domain", "tenant"):
+			raise ValueError(f"Unsupported shard key: {self.key}")
+		self.routes = {key.lower(): name for key, name in self.routes.items()}
+		unknown = set(self.routes.values()) - set(self.urls)
+		if unknown:
+			raise ValueError(f"Routes point to unknown shards: {', '.join(sorted(unknown))}")
+		self._names = sorted(self.urls)
+
+	@property
+	def names(self) -> list[str]:
+		"""Shard names, in the order used for hashing"""
+		return list(self._names)
+
+	def shard_for_key(self, key: str) -> str:
+		"""Shard name for a shard key"""
+		key = key.lower()
+		if key in self.routes:
+			return self.routes[key]
+		return self._names[zlib.crc32(key.encode()) % len(self._names)]
+
+	def shard_for_user(self, user: User) -> str:
+		"""
+		Shard name for a user.
+
+		Raises:
+			ValueError: If key is "tenant" and the user has no tenant in user_metadata
+		"""
+		if callable(self.key):
+			return self.shard_for_key(self.key(user))
+		if self.key == "tenant":
+			tenant = (user.user_metadata or {}).get(self.tenant_key)
+			if tenant is None:
+				raise ValueError(f"User {user.email} has no {self.tenant_key!r} in user_metadata")
+			return self.shard_for_key(str(tenant))
+		return self.shard_for_key(email_domain(user.email))
+
+	def shard_for_email(self, email: str) -> str | None:
+		"""Shard name for an email, or None when the key is not derived from the email"""
+		if self.key == "email_domain":
+			return self.shard_for_key(email_domain(email))
+		return None
+
+
+def email_domain(email: str) -> str:
+	return email.rpartition("@")[2].lower()
@@ -0,0 +1,105 @@
+"""External identity repository adapter spread over several databases."""
+
+import asyncio
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.entity.user_external_identity import UserExternalIdentity
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+
+from .sharded_user_repository_adapter import ShardedUserRepositoryAdapter
+from .user_external_identity_repository_adapter import (
+	INSTRUMENTED_METHODS,
+	UserExternalIdentityRepositoryAdapter,
+)
+
+
+class ShardedUserExternalIdentityRepositoryAdapter(IUserExternalIdentityRepositoryPort):
+	"""
+	External identity repository for sharded users.
+
+	Identities are stored on the shard of their user. Lookups by provider
+	identity ask every shard concurrently; everything else runs on the user's
+	shard.
+
+	The unique (provider, provider_user_id) constraint only covers one shard.
+	link() and login_or_provision() look for the identity on every shard first,
+	but nothing locks it between that lookup and the insert, so two concurrent
+	calls for a new identity can link it on two shards.
+	"""
+
+	def __init__(self, user_adapter: ShardedUserRepositoryAdapter):
+		self._user_adapter = user_adapter
+		self._shards = {
+			name: UserExternalIdentityRepositoryAdapter(shard)
+			for name, shard in user_adapter.shards.items()
+		}
+
+		instrumentation = user_adapter.instrumentation
+		if instrumentation is not None:
+			for name in INSTRUMENTED_METHODS:
+				method = getattr(self, name)
+				setattr(self, name, instrumentation.wrap(f"identity.{name}", method))
+
+	async def _find(self, provider: str, provider_user_id: str) -> tuple[User | None, str | None]:
+		"""The linked user and its shard name"""
+		names = list(self._shards)
+		found = await asyncio.gather(
+			*(
+				self._shards[name].find_user_by_identity(provider, provider_user_id)
+				for name in names
+			)
+		)
+		for name, user in zip(names, found, strict=True):
+			if user is not None:
+				self._user_adapter.remember(name, [user])
+				return user, name
+		return None, None
+
+	async def find_user_by_identity(self, provider: str, provider_user_id: str) -> User | None:
+		user, _ = await self._find(provider, provider_user_id)
+		return user
+
+	async def list_by_user(self, user_id: str) -> list[UserExternalIdentity]:
+		shard = await self._user_adapter.locate(user_id)
+		if shard is None:
+			return []
+		return await self._shards[shard].list_by_user(user_id)
+
+	async def link(self, identity: UserExternalIdentity) -> UserExternalIdentity:
+		shard = await self._user_adapter.locate(str(identity.user_id))
+		if shard is None:
+			raise ValueError(f"User {identity.user_id} not found")
+
+		# The unique (provider, provider_user_id) constraint only covers one shard
+		_, linked_on = await self._find(identity.provider, identity.provider_user_id)
+		if linked_on is not None and linked_on != shard:
+			raise ValueError(
+				f"Identity {identity.provider}:{identity.provider_user_id} "
+				"is already linked to another user"
+			)
+		return await self._shards[shard].link(identity)
+
+	async def unlink(self, user_id: str, provider: str, provider_user_id: str | None = None) -> int:
+		shard = await self._user_adapter.locate(user_id)
+		if shard is None:
+			return 0
+		return await self._shards[shard].unlink(user_id, provider, provider_user_id)
+
+	async def login_or_provision(
+		self,
+		provider: str,
+		provider_user_id: str,
+		new_user: User,
+		provider_data: dict | None = None,
+		link_existing_email: bool = False,
+	) -> tuple[User, bool]:
+		# Known identities log in on their user's shard; new ones go to new_user's shard
+		_, shard = await self._find(provider, provider_user_id)
+		if shard is None:
+			shard = self._user_adapter.shard_map.shard_for_user(new_user)
+
+		user, created = await self._shards[shard].login_or_provision(
+			provider, provider_user_id, new_user, provider_data, link_existing_email
+		)
+		self._user_adapter.remember(shard, [user])
+		return user, created
@@ -0,0 +1,438 @@
+"""User repository adapter spread over several databases."""
+
+import asyncio
+import dataclasses
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from contextlib import AsyncExitStack, aclosing
+from datetime import datetime, timedelta
+from typing import Any, TypeVar
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.repository import CountMode, IUserRepositoryPort, WriteListener
+from vexen_user.domain.vo import UserCursor, UserSummary
+from vexen_user.shared.cache import TTLCache
+from vexen_user.shared.instrumentation import Instrumentation
+
+from .shard_map import ShardMap
+from .user_repository_adapter import INSTRUMENTED_METHODS, UserRepositoryAdapter
+
+T = TypeVar("T")
+Item = TypeVar("Item", User, UserSummary)
+
+# Shard call returning (items, total, has_next) for the first rows of the list
+ListWindow = Callable[[UserRepositoryAdapter, int], Awaitable[tuple[list, int | None, bool]]]
+
+
+def _order_key(item: User | UserSummary) -> tuple:
+	"""Sort key of the list order, (created_at DESC, id DESC) with reverse=True"""
+	return (item.created_at, item.id)
+
+
+def _merge(pages: Iterable[list[Item]]) -> list[Item]:
+	"""Merge per-shard pages, each already in list order"""
+	return sorted((item for page in pages for item in page), key=_order_key, reverse=True)
+
+
+class ShardedUserRepositoryAdapter(IUserRepositoryPort):
+	"""
+	User repository whose users are split across databases by a ShardMap.
+
+	Operations on one user run on one shard: lookups by email and inserts are
+	routed by the shard key, operations by ID use the shard where the ID was
+	last seen and only ask every shard (concurrently) for unknown IDs. Lists,
+	streams and stats fan out to every shard with asyncio.gather and merge the
+	results in (created_at DESC, id DESC) order, so cursors work unchanged.
+
+	Users never move between shards: writes that would change a user's shard
+	key raise ValueError. A user read without user_metadata is saved on the
+	shard it is on, since its stored metadata is not rewritten. transaction()
+	is not supported, since a transaction cannot span databases.
+
+	Unique constraints hold per shard. With the "email_domain" key an email
+	always maps to one shard, so emails stay unique; with "tenant" or a callable
+	key the same email can be created on two shards, and get_by_email returns
+	the first shard's user.
+	"""
+
+	def __init__(
+		self,
+		shards: Mapping[str, UserRepositoryAdapter],
+		shard_map: ShardMap,
+		instrumentation: Instrumentation | None = None,
+		location_cache_size: int = 100_000,
+		location_cache_ttl: float | None = 3600.0,
+		max_offset_rows: int = 10_000,
+	):
+		"""
+		Args:
+			shards: Adapter of each shard, by shard name
+			shard_map: Assignment of users to shards
+			instrumentation: Timing collector for repository calls (None disables it)
+			location_cache_size: User IDs whose shard is remembered (least recently
+				used ones are forgotten and found again by asking every shard)
+			location_cache_ttl: Seconds a remembered shard is kept (None = until evicted)
+			max_offset_rows: Deepest OFFSET page allowed, as page * page_size; each
+				shard reads that many rows for it. Deeper pages need cursors.
+		"""
+		if set(shards) != set(shard_map.urls):
+			raise ValueError("Shard adapters must match the shard map")
+
+		self.shards = dict(shards)
+		self.shard_map = shard_map
+		# Shard name by user ID; IDs never change shard, so entries only go stale on delete
+		self._locations = TTLCache(maxsize=location_cache_size, ttl=location_cache_ttl)
+		self.max_offset_rows = max_offset_rows
+
+		self.instrumentation = instrumentation
+		if instrumentation is not None:
+			# Shard adapters called from these methods are not timed again
+			for name in INSTRUMENTED_METHODS:
+				setattr(self, name, instrumentation.wrap(name, getattr(self, name)))
+
+	@property
+	def in_transaction(self) -> bool:
+		return False
+
+	def add_write_listener(self, listener: WriteListener) -> None:
+		for shard in self.shards.values():
+			shard.add_write_listener(listener)
+
+	def transaction(self):
+		"""
+		Raises:
+			RuntimeError: Always, transactions cannot span shards
+		"""
+		raise RuntimeError("transaction() is not supported with a shard map")
+
+	@staticmethod
+	def _id_key(user_id: Any) -> str:
+		try:
+			return str(uuid.UUID(str(user_id)))
+		except (ValueError, AttributeError):
+			return str(user_id)
+
+	def remember(self, shard: str, users: Iterable[User]) -> None:
+		"""Record the shard holding these users"""
+		for user in users:
+			self._locations.set(self._id_key(user.id), shard)
+
+	async def locate(self, user_id: str) -> str | None:
+		"""Name of the shard holding a user, or None if no shard has it"""
+		shard = self._locations.get(self._id_key(user_id))
+		if shard is None:
+			_, shard = await self._find_by_id(user_id)
+		return shard
+
+	async def _fan_out(self, call: Callable[[UserRepositoryAdapter], Awaitable[T]]) -> dict[str, T]:
+		"""Run call on every shard concurrently; results by shard name"""
+		names = list(self.shards)
+		results = await asyncio.gather(*(call(self.shards[name]) for name in names))
+		return dict(zip(names, results, strict=True))
+
+	async def _run_batches(
+		self,
+		batches: Mapping[str, list],
+		call: Callable[[UserRepositoryAdapter, list], Awaitable[T]],
+	) -> dict[str, T]:
+		"""Run call with each shard's non-empty batch concurrently; results by shard name"""
+		names = [name for name, batch in batches.items() if batch]
+		results = await asyncio.gather(*(call(self.shards[name], batches[name]) for name in names))
+		return dict(zip(names, results, strict=True))
+
+	def _batches_by_id(self, user_ids: Iterable[str]) -> dict[str, list[str]]:
+		"""Group IDs by known shard; IDs not located yet go to every shard"""
+		batches: dict[str, list[str]] = {name: [] for name in self.shards}
+		for user_id in user_ids:
+			shard = self._locations.get(self._id_key(user_id))
+			for name in [shard] if shard is not None else self.shards:
+				batches[name].append(user_id)
+		return batches
+
+	async def _find_by_id(self, user_id: str) -> tuple[User | None, str | None]:
+		found = await self._fan_out(lambda shard: shard.get_by_id(user_id))
+		for name, user in found.items():
+			if user is not None:
+				self.remember(name, [user])
+				return user, name
+		return None, None
+
+	async def get_by_id(self, user_id: str) -> User | None:
+		shard = self._locations.get(self._id_key(user_id))
+		if shard is not None:
+			return await self.shards[shard].get_by_id(user_id)
+		user, _ = await self._find_by_id(user_id)
+		return user
+
+	async def get_by_email(self, email: str, with_metadata: bool = False) -> User | None:
+		shard = self.shard_map.shard_for_email(email)
+		if shard is not None:
+			user = await self.shards[shard].get_by_email(email, with_metadata)
+			if user is not None:
+				self.remember(shard, [user])
+			return user
+
+		# The key is not derived from the email: the first shard having it wins
+		found = await self._fan_out(lambda shard: shard.get_by_email(email, with_metadata))
+		for name, user in found.items():
+			if user is not None:
+				self.remember(name, [user])
+				return user
+		return None
+
+	async def get_many_by_ids(self, user_ids: list[str]) -> list[User]:
+		results = await self._run_batches(
+			self._batches_by_id(user_ids), lambda shard, ids: shard.get_many_by_ids(ids)
+		)
+		return self._collect(results)
+
+	async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+		batches: dict[str, list[str]] = {name: [] for name in self.shards}
+		for email in emails:
+			shard = self.shard_map.shard_for_email(email)
+			for name in [shard] if shard is not None else self.shards:
+				batches[name].append(email)
+		results = await self._run_batches(
+			batches, lambda shard, batch: shard.get_many_by_emails(batch)
+		)
+		return self._collect(results)
+
+	def _collect(self, results: Mapping[str, list[User]]) -> list[User]:
+		"""Flatten per-shard users, remembering where each one lives"""
+		users = []
+		for name, shard_users in results.items():
+			self.remember(name, shard_users)
+			users.extend(shard_users)
+		return users
+
+	async def save(self, user: User) -> User:
+		current = await self.locate(str(user.id)) if user.id else None
+		key_may_read_metadata = self.shard_map.key != "email_domain"
+		if current is not None and key_may_read_metadata and not user.metadata_loaded:
+			# The stored metadata is kept as is, so a key read from it cannot have changed
+			shard = current
+		else:
+			shard = self.shard_map.shard_for_user(user)
+			if current is not None and current != shard:
+				raise ValueError(f"User {user.id} is on shard {current} and cannot move to {shard}")
+
+		result = await self.shards[shard].save(user)
+		self.remember(shard, [result])
+		return result
+
+	async def update_partial(self, user_id: str, fields: dict) -> User | None:
+		shard = await self.locate(user_id)
+		if shard is None:
+			return None
+
+		if self._may_change_shard(fields):
+			current = await self.shards[shard].get_by_id(user_id)
+			if current is None:
+				return None
+			target = self.shard_map.shard_for_user(dataclasses.replace(current, **fields))
+			if target != shard:
+				raise ValueError(f"User {user_id} is on shard {shard} and cannot move to {target}")
+
+		return await self.shards[shard].update_partial(user_id, fields)
+
+	def _may_change_shard(self, fields: dict) -> bool:
+		if self.shard_map.key == "email_domain":
+			return "email" in fields
+		if self.shard_map.key == "tenant":
+			return "user_metadata" in fields
+		return bool(fields)
+
+	async def bulk_create(self, users: list[User]) -> list[User]:
+		results = await self._run_batches(
+			self._batches_by_key(users), lambda shard, batch: shard.bulk_create(batch)
+		)
+		return self._collect(results)
+
+	async def bulk_upsert(self, users: list[User]) -> list[User]:
+		results = await self._run_batches(
+			self._batches_by_key(users), lambda shard, batch: shard.bulk_upsert(batch)
+		)
+		return self._collect(results)
+
+	def _batches_by_key(self, users: Iterable[User]) -> dict[str, list[User]]:
+		batches: dict[str, list[User]] = {name: [] for name in self.shards}
+		for user in users:
+			batches[self.shard_map.shard_for_user(user)].append(user)
+		return batches
+
+	async def record_logins(self, logins: Mapping[str, datetime]) -> int:
+		# Shards without the user match no row, so the counts add up
+		results = await self._run_batches(
+			self._batches_by_id(logins),
+			lambda shard, ids: shard.record_logins({user_id: logins[user_id] for user_id in ids}),
+		)
+		return sum(results.values())
+
+	async def delete(self, user_id: str) -> bool:
+		shard = await self.locate(user_id)
+		if shard is None:
+			return False
+		deleted = await self.shards[shard].delete(user_id)
+		self._locations.pop(self._id_key(user_id))
+		return deleted
+
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000) -> int:
+		results = await self._fan_out(lambda shard: shard.purge_deleted(older_than, batch_size))
+		return sum(results.values())
+
+	async def list_paginated(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], int | None, bool]:
+		return await self._merged_page(
+			page,
+			page_size,
+			lambda shard, window: shard.list_paginated(
+				1, window, search, role, status, count_mode, metadata_filters, with_metadata
+			),
+		)
+
+	async def list_summaries(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], int | None, bool]:
+		return await self._merged_page(
+			page,
+			page_size,
+			lambda shard, window: shard.list_summaries(
+				1, window, search, role, status, count_mode, metadata_filters
+			),
+		)
+
+	async def _merged_page(
+		self,
+		page: int,
+		page_size: int,
+		list_window: Callable[
+			[UserRepositoryAdapter, int], Awaitable[tuple[list, int | None, bool]]
+		],
+	) -> tuple[list, int | None, bool]:
+		"""
+		Build an OFFSET page from the first page * page_size rows of every shard.
+
+		Any row of the merged page is among the first page * page_size rows of
+		its own shard, so deeper pages cost more on every shard.
+
+		Raises:
+			ValueError: If page * page_size exceeds max_offset_rows; the cursor
+				pagination merges one page per shard at any depth
+		"""
+		window = page * page_size
+		if window > self.max_offset_rows:
+			raise ValueError(
+				f"Page {page} needs {window} rows from every shard (limit "
+				f"{self.max_offset_rows}); use cursor pagination for deep pages"
+			)
+		results = await self._fan_out(lambda shard: list_window(shard, window))
+
+		items = _merge(result[0] for result in results.values())
+		totals = [result[1] for result in results.values()]
+		total = None if None in totals else sum(totals)
+		has_next = len(items) > window or any(result[2] for result in results.values())
+
+		return items[window - page_size : window], total, has_next
+
+	async def list_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], UserCursor | None]:
+		return await self._merged_cursor_page(
+			page_size,
+			lambda shard: shard.list_by_cursor(
+				page_size, cursor, search, role, status, metadata_filters, with_metadata
+			),
+		)
+
+	async def list_summaries_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], UserCursor | None]:
+		return await self._merged_cursor_page(
+			page_size,
+			lambda shard: shard.list_summaries_by_cursor(
+				page_size, cursor, search, role, status, metadata_filters
+			),
+		)
+
+	async def _merged_cursor_page(
+		self,
+		page_size: int,
+		list_page: Callable[[UserRepositoryAdapter], Awaitable[tuple[list, UserCursor | None]]],
+	) -> tuple[list, UserCursor | None]:
+		"""Merge one keyset page per shard; every shard seeks past the same cursor"""
+		results = await self._fan_out(list_page)
+
+		items = _merge(result[0] for result in results.values())
+		has_next = len(items) > page_size or any(result[1] for result in results.values())
+		items = items[:page_size]
+
+		if not has_next or not items:
+			return items, None
+		return items, UserCursor(created_at=items[-1].created_at, id=items[-1].id)
+
+	async def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[User]:
+		# One server-side cursor per shard, merged as they are read
+		async with AsyncExitStack() as stack:
+			streams = [
+				await stack.enter_async_context(
+					aclosing(shard.stream_all(batch_size, search, role, status, metadata_filters))
+				)
+				for shard in self.shards.values()
+			]
+			firsts = await asyncio.gather(*(anext(stream, None) for stream in streams))
+			heads = {index: user for index, user in enumerate(firsts) if user is not None}
+
+			while heads:
+				index = max(heads, key=lambda i: _order_key(heads[i]))
+				yield heads[index]
+				user = await anext(streams[index], None)
+				if user is None:
+					del heads[index]
+				else:
+					heads[index] = user
+
+	async def get_stats(self) -> dict:
+		results = await self._fan_out(lambda shard: shard.get_stats())
+
+		# Every counter is a plain count, so the totals are sums
+		stats: dict = {}
+		for shard_stats in results.values():
+			for key, value in shard_stats.items():
+				stats[key] = stats.get(key, 0) + value
+		return stats
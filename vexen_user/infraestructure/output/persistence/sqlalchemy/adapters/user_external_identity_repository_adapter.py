@@ -0,0 +1,72 @@
+"""User external identity repository adapter for session management."""
+
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.entity.user_external_identity import UserExternalIdentity
+from vexen_user.domain.repository import IUserExternalIdentityRepositoryPort
+from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.user_external_identity_repository import (  # noqa: E501
+	UserExternalIdentityRepository,
+)
+
+from .user_repository_adapter import UserRepositoryAdapter
+
+INSTRUMENTED_METHODS = (
+	"find_user_by_identity",
+	"list_by_user",
+	"link",
+	"unlink",
+	"login_or_provision",
+)
+
+
+class UserExternalIdentityRepositoryAdapter(IUserExternalIdentityRepositoryPort):
+	"""
+	Adapter that manages SQLAlchemy sessions for the external identity repository.
+
+	Sessions come from the user adapter, so identity calls join its transaction(),
+	use its replicas for reads and refresh its caches after writes.
+	"""
+
+	def __init__(self, user_adapter: UserRepositoryAdapter):
+		self._user_adapter = user_adapter
+
+		instrumentation = user_adapter.instrumentation
+		if instrumentation is not None:
+			for name in INSTRUMENTED_METHODS:
+				method = getattr(self, name)
+				setattr(self, name, instrumentation.wrap(f"identity.{name}", method))
+
+	async def find_user_by_identity(self, provider: str, provider_user_id: str) -> User | None:
+		async with self._user_adapter.session_scope() as session:
+			repository = UserExternalIdentityRepository(session)
+			return await repository.find_user_by_identity(provider, provider_user_id)
+
+	async def list_by_user(self, user_id: str) -> list[UserExternalIdentity]:
+		async with self._user_adapter.session_scope() as session:
+			repository = UserExternalIdentityRepository(session)
+			return await repository.list_by_user(user_id)
+
+	async def link(self, identity: UserExternalIdentity) -> UserExternalIdentity:
+		async with self._user_adapter.session_scope(write=True) as session:
+			repository = UserExternalIdentityRepository(session)
+			return await repository.link(identity)
+
+	async def unlink(self, user_id: str, provider: str, provider_user_id: str | None = None) -> int:
+		async with self._user_adapter.session_scope(write=True) as session:
+			repository = UserExternalIdentityRepository(session)
+			return await repository.unlink(user_id, provider, provider_user_id)
+
+	async def login_or_provision(
+		self,
+		provider: str,
+		provider_user_id: str,
+		new_user: User,
+		provider_data: dict | None = None,
+		link_existing_email: bool = False,
+	) -> tuple[User, bool]:
+		async with self._user_adapter.session_scope(write=True) as session:
+			repository = UserExternalIdentityRepository(session)
+			user, created = await repository.login_or_provision(
+				provider, provider_user_id, new_user, provider_data, link_existing_email
+			)
+		self._user_adapter.after_write([user])
+		return user, created
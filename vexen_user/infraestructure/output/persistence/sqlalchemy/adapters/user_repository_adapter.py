@@ -1,45 +1,356 @@
 """User repository adapter for session management."""
 
+import itertools
+import time
+import uuid
+from collections.abc import AsyncIterator, Hashable, Iterable, Mapping
+from contextlib import aclosing, asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from vexen_user.domain.entity.user import User
-from vexen_user.domain.repository import IUserRepositoryPort
+from vexen_user.domain.repository import CountMode, IUserRepositoryPort, WriteListener
+from vexen_user.domain.vo import UserCursor, UserSummary
 from vexen_user.infraestructure.output.persistence.sqlalchemy.repositories.user_repository import (
 	UserRepository,
 )
+from vexen_user.infraestructure.output.persistence.sqlalchemy.search import UserSearchBackend
+from vexen_user.shared.cache import TTLCache
+from vexen_user.shared.instrumentation import Instrumentation
+from vexen_user.shared.single_flight import SingleFlight
+
+from .replica_router import ReplicaRouter
+
+# Port methods timed when instrumentation is enabled (stream_all is a generator, not a call)
+INSTRUMENTED_METHODS = (
+	"get_by_id",
+	"get_by_email",
+	"get_many_by_ids",
+	"get_many_by_emails",
+	"save",
+	"update_partial",
+	"bulk_create",
+	"bulk_upsert",
+	"record_logins",
+	"delete",
+	"purge_deleted",
+	"list_paginated",
+	"list_by_cursor",
+	"list_summaries",
+	"list_summaries_by_cursor",
+	"get_stats",
+)
+
+# (primary, with_metadata) combinations a lookup can be coalesced under
+LOOKUP_VARIANTS = tuple(itertools.product((False, True), repeat=2))
 
 
 class UserRepositoryAdapter(IUserRepositoryPort):
-	"""Adapter that manages SQLAlchemy sessions for user repository"""
+	"""
+	Adapter that manages SQLAlchemy sessions for user repository.
 
-	def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+	Each call opens its own session unless it runs inside transaction(), in which
+	case every call shares the transaction's session. Read-only calls never commit.
+
+	With a replica router, read-only calls outside a transaction go to a replica,
+	except lookups of a user written by this adapter within the read-your-writes
+	window, which stay on the primary.
+	"""
+
+	def __init__(
+		self,
+		session_factory: async_sessionmaker[AsyncSession],
+		stats_cache_ttl: float | None = None,
+		search_backend: UserSearchBackend | None = None,
+		replica_router: ReplicaRouter | None = None,
+		read_your_writes_window: float = 5.0,
+		instrumentation: Instrumentation | None = None,
+		soft_delete: bool = False,
+	):
+		"""
+		Args:
+			session_factory: Factory for AsyncSession instances
+			stats_cache_ttl: Seconds to cache get_stats() results (None disables the cache).
+				The cached stats are dropped on every save/delete.
+			search_backend: Strategy used for the search filter of list queries
+			replica_router: Router for read-only sessions (None sends everything to primary)
+			read_your_writes_window: Seconds after a write during which lookups of the
+				same user are served by the primary
+			instrumentation: Timing collector for repository calls (None disables it)
+			soft_delete: Keep deleted users as tombstones until purge_deleted() removes them
+		"""
 		self._session_factory = session_factory
+		self._search_backend = search_backend
+		self._soft_delete = soft_delete
+		# Cached totals for count_mode="estimated" on dialects without planner estimates
+		self._count_cache = TTLCache(maxsize=256, ttl=60.0)
+		self._stats_cache = TTLCache(maxsize=1, ttl=stats_cache_ttl) if stats_cache_ttl else None
+		# Bumped by every stats invalidation, so stats read before one are not cached
+		self._stats_generation = 0
+		# Concurrent lookups for the same key share one query and one connection
+		self._single_flight = SingleFlight()
+		self._replica_router = replica_router
+		# Users written recently, read from the primary until replicas catch up
+		self._recent_writes = TTLCache(maxsize=100_000, ttl=read_your_writes_window)
+		# Session bound by transaction() for the current task
+		self._current_session: ContextVar[AsyncSession | None] = ContextVar(
+			f"vexen_user_session_{id(self)}", default=None
+		)
+		# IDs written inside transaction(), reported to listeners when it ends
+		self._transaction_writes: ContextVar[set[str] | None] = ContextVar(
+			f"vexen_user_transaction_writes_{id(self)}", default=None
+		)
+		self._write_listeners: list[WriteListener] = []
 
-	async def get_by_id(self, user_id: str) -> User | None:
-		async with self._session_factory() as session:
-			repository = UserRepository(session)
-			result = await repository.get_by_id(user_id)
-			await session.commit()
-			return result
+		self.instrumentation = instrumentation
+		if instrumentation is not None:
+			# Shadow the methods on this instance only: no overhead when disabled
+			for name in INSTRUMENTED_METHODS:
+				setattr(self, name, instrumentation.wrap(name, getattr(self, name)))
+
+	@property
+	def in_transaction(self) -> bool:
+		"""Whether the current task runs inside transaction()"""
+		return self._current_session.get() is not None
+
+	@asynccontextmanager
+	async def transaction(self) -> AsyncIterator[None]:
+		"""
+		Bind one session to every repository call made inside the block.
+
+		The session is committed when the block exits normally and rolled back
+		if it raises. Nested transaction() blocks join the outer one.
+		"""
+		if self.in_transaction:
+			yield
+			return
+
+		written: set[str] = set()
+		writes_token = self._transaction_writes.set(written)
+		try:
+			async with self._session_factory() as session:
+				token = self._current_session.set(session)
+				try:
+					yield
+					await session.commit()
+				except BaseException:
+					await session.rollback()
+					raise
+				finally:
+					self._current_session.reset(token)
+		finally:
+			# Committed or rolled back, rows cached meanwhile may be stale
+			self._transaction_writes.reset(writes_token)
+			self._notify_write(written)
+			self._invalidate_stats()
+
+	@asynccontextmanager
+	async def session_scope(
+		self, write: bool = False, primary: bool = False
+	) -> AsyncIterator[AsyncSession]:
+		"""
+		Yield the transaction's session, a replica session or a primary session.
+
+		Fresh sessions are committed on exit only when write is True. Other
+		adapters sharing this database use it to join transaction().
+		"""
+		session = self._current_session.get()
+		if session is not None:
+			yield session
+			return
+
+		if not write and not primary and self._replica_router is not None:
+			async with self._replica_router.session() as session:
+				await self._timed_acquire(session)
+				yield session
+			return
 
-	async def get_by_email(self, email: str) -> User | None:
 		async with self._session_factory() as session:
-			repository = UserRepository(session)
-			result = await repository.get_by_email(email)
-			await session.commit()
-			return result
+			await self._timed_acquire(session)
+			yield session
+			if write:
+				await session.commit()
+
+	async def _timed_acquire(self, session: AsyncSession) -> None:
+		"""Check out the session's connection up front so its wait is measured"""
+		if self.instrumentation is None:
+			return
+		started = time.perf_counter()
+		await session.connection()
+		self.instrumentation.record_acquire(time.perf_counter() - started)
+
+	@asynccontextmanager
+	async def _repository(
+		self, write: bool = False, primary: bool = False
+	) -> AsyncIterator[UserRepository]:
+		"""Yield a repository on the session chosen by session_scope()"""
+		async with self.session_scope(write=write, primary=primary) as session:
+			yield self._make_repository(session)
+
+	def add_write_listener(self, listener: WriteListener) -> None:
+		self._write_listeners.append(listener)
+
+	def after_write(self, users: Iterable[User]) -> None:
+		"""
+		Drop cached stats, restart lookups of written users and pin them to the primary.
+
+		Write listeners are told about the users, at once or when the current
+		transaction ends.
+		"""
+		users = list(users)
+		keys = [key for user in users for key in self._user_keys(user)]
+		self._forget_lookups(keys)
+		self._mark_written(keys)
+		self._notify_write(str(user.id) for user in users)
+		self._invalidate_stats()
+
+	def _notify_write(self, user_ids: Iterable[str]) -> None:
+		"""Report written user IDs to the listeners, deferred to the end of a transaction"""
+		pending = self._transaction_writes.get()
+		if pending is not None:
+			pending.update(user_ids)
+			return
+		user_ids = list(user_ids)
+		if not user_ids:
+			return
+		for listener in self._write_listeners:
+			listener(user_ids)
+
+	def _user_keys(self, user: User) -> tuple[Hashable, Hashable]:
+		return self._id_key(str(user.id)), ("email", user.email)
+
+	@staticmethod
+	def _id_key(user_id: str) -> tuple[str, str]:
+		try:
+			return ("id", str(uuid.UUID(str(user_id))))
+		except (ValueError, AttributeError):
+			return ("id", str(user_id))
+
+	def _written_recently(self, key: Hashable) -> bool:
+		return self._replica_router is not None and key in self._recent_writes
+
+	def _mark_written(self, keys: Iterable[Hashable]) -> None:
+		"""Pin lookups of these keys to the primary for the read-your-writes window"""
+		if self._replica_router is None:
+			return
+		for key in keys:
+			self._recent_writes.set(key, True)
+
+	def _forget_lookups(self, keys: Iterable[Hashable]) -> None:
+		"""Stop coalescing with lookups of these keys that started before a write"""
+		for key in keys:
+			for variant in LOOKUP_VARIANTS:
+				self._single_flight.forget((key, *variant))
+
+	def _make_repository(self, session: AsyncSession) -> UserRepository:
+		return UserRepository(
+			session,
+			count_cache=self._count_cache,
+			search_backend=self._search_backend,
+			soft_delete=self._soft_delete,
+		)
+
+	async def get_by_id(self, user_id: str) -> User | None:
+		primary = self._written_recently(self._id_key(user_id))
+		if self.in_transaction:
+			return await self._get_by_id(user_id, primary)
+		return await self._single_flight.do(
+			(self._id_key(user_id), primary, True), lambda: self._get_by_id(user_id, primary)
+		)
+
+	async def _get_by_id(self, user_id: str, primary: bool = False) -> User | None:
+		async with self._repository(primary=primary) as repository:
+			return await repository.get_by_id(user_id)
+
+	async def get_by_email(self, email: str, with_metadata: bool = False) -> User | None:
+		primary = self._written_recently(("email", email))
+		if self.in_transaction:
+			return await self._get_by_email(email, primary, with_metadata)
+		return await self._single_flight.do(
+			(("email", email), primary, with_metadata),
+			lambda: self._get_by_email(email, primary, with_metadata),
+		)
+
+	async def _get_by_email(
+		self, email: str, primary: bool = False, with_metadata: bool = False
+	) -> User | None:
+		async with self._repository(primary=primary) as repository:
+			return await repository.get_by_email(email, with_metadata)
+
+	async def get_many_by_ids(self, user_ids: list[str]) -> list[User]:
+		primary = any(self._written_recently(self._id_key(user_id)) for user_id in user_ids)
+		async with self._repository(primary=primary) as repository:
+			return await repository.get_many_by_ids(user_ids)
+
+	async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+		primary = any(self._written_recently(("email", email)) for email in emails)
+		async with self._repository(primary=primary) as repository:
+			return await repository.get_many_by_emails(emails)
 
 	async def save(self, user: User) -> User:
-		async with self._session_factory() as session:
-			repository = UserRepository(session)
+		async with self._repository(write=True) as repository:
 			result = await repository.save(user)
-			await session.commit()
-			return result
+		self.after_write([result])
+		return result
 
-	async def delete(self, user_id: str) -> None:
-		async with self._session_factory() as session:
-			repository = UserRepository(session)
-			await repository.delete(user_id)
-			await session.commit()
+	async def update_partial(self, user_id: str, fields: dict) -> User | None:
+		async with self._repository(write=True) as repository:
+			result = await repository.update_partial(user_id, fields)
+		if result is not None:
+			self.after_write([result])
+		else:
+			self._invalidate_stats()
+		return result
+
+	async def bulk_create(self, users: list[User]) -> list[User]:
+		async with self._repository(write=True) as repository:
+			result = await repository.bulk_create(users)
+		self.after_write(result)
+		return result
+
+	async def bulk_upsert(self, users: list[User]) -> list[User]:
+		async with self._repository(write=True) as repository:
+			result = await repository.bulk_upsert(users)
+		self.after_write(result)
+		return result
+
+	async def record_logins(self, logins: Mapping[str, datetime]) -> int:
+		async with self._repository(write=True) as repository:
+			updated = await repository.record_logins(logins)
+		# Not pinned to the primary: a slightly stale last_login on a replica is harmless
+		if updated:
+			self._forget_lookups(self._id_key(user_id) for user_id in logins)
+			self._notify_write(logins)
+			self._invalidate_stats()
+		return updated
+
+	async def delete(self, user_id: str) -> bool:
+		async with self._repository(write=True) as repository:
+			deleted = await repository.delete(user_id)
+		self._forget_lookups([self._id_key(user_id)])
+		self._mark_written([self._id_key(user_id)])
+		self._notify_write([user_id])
+		self._invalidate_stats()
+		return deleted
+
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000) -> int:
+		if self.in_transaction:
+			async with self._repository(write=True) as repository:
+				return await repository.purge_deleted(older_than, batch_size)
+		if batch_size < 1:
+			raise ValueError("batch_size must be at least 1")
+
+		# One commit per batch, so no transaction holds its row locks for the whole purge
+		cutoff = datetime.now() - older_than
+		purged = 0
+		while True:
+			async with self._repository(write=True) as repository:
+				count = await repository.purge_deleted_batch(cutoff, batch_size)
+			purged += count
+			if count < batch_size:
+				return purged
 
 	async def list_paginated(
 		self,
@@ -48,16 +359,93 @@ class UserRepositoryAdapter(IUserRepositoryPort):
 		search: str | None = None,
 		role: str | None = None,
 		status: str | None = None,
-	) -> tuple[list[User], int]:
-		async with self._session_factory() as session:
-			repository = UserRepository(session)
-			result = await repository.list_paginated(page, page_size, search, role, status)
-			await session.commit()
-			return result
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], int | None, bool]:
+		async with self._repository() as repository:
+			return await repository.list_paginated(
+				page, page_size, search, role, status, count_mode, metadata_filters, with_metadata
+			)
+
+	async def list_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], UserCursor | None]:
+		async with self._repository() as repository:
+			return await repository.list_by_cursor(
+				page_size, cursor, search, role, status, metadata_filters, with_metadata
+			)
+
+	async def list_summaries(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], int | None, bool]:
+		async with self._repository() as repository:
+			return await repository.list_summaries(
+				page, page_size, search, role, status, count_mode, metadata_filters
+			)
+
+	async def list_summaries_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], UserCursor | None]:
+		async with self._repository() as repository:
+			return await repository.list_summaries_by_cursor(
+				page_size, cursor, search, role, status, metadata_filters
+			)
+
+	async def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[User]:
+		# The session stays checked out until the iteration ends or is closed
+		async with self._repository() as repository:
+			stream = repository.stream_all(batch_size, search, role, status, metadata_filters)
+			async with aclosing(stream) as users:
+				async for user in users:
+					yield user
 
 	async def get_stats(self) -> dict:
-		async with self._session_factory() as session:
-			repository = UserRepository(session)
+		# Inside a transaction the stats must reflect its uncommitted writes
+		use_cache = self._stats_cache is not None and not self.in_transaction
+		if use_cache:
+			cached = self._stats_cache.get("stats")
+			if cached is not None:
+				return dict(cached)
+
+		started = self._stats_generation
+		async with self._repository() as repository:
 			result = await repository.get_stats()
-			await session.commit()
-			return result
+
+		# A write committed meanwhile may be missing from result
+		if use_cache and started == self._stats_generation:
+			self._stats_cache.set("stats", dict(result))
+		return result
+
+	def _invalidate_stats(self) -> None:
+		"""Drop cached stats after a write"""
+		if self._stats_cache is not None:
+			self._stats_generation += 1
+			self._stats_cache.clear()
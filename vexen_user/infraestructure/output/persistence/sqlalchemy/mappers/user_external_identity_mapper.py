@@ -0,0 +1,40 @@
+"""Mapper between UserExternalIdentity entity and UserExternalIdentityModel."""
+
+from uuid6 import uuid7
+
+from vexen_user.domain.entity.user_external_identity import UserExternalIdentity
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user_external_identity import (
+	UserExternalIdentityModel,
+)
+
+
+class UserExternalIdentityMapper:
+	"""Maps between UserExternalIdentity entity and UserExternalIdentityModel"""
+
+	@staticmethod
+	def to_entity(model: UserExternalIdentityModel) -> UserExternalIdentity:
+		"""Convert model to entity"""
+		return UserExternalIdentity(
+			id=model.id,
+			user_id=model.user_id,
+			provider=model.provider,
+			provider_user_id=model.provider_user_id,
+			email=model.email,
+			provider_data=model.provider_data or {},
+			created_at=model.created_at,
+			updated_at=model.updated_at,
+		)
+
+	@staticmethod
+	def to_row(entity: UserExternalIdentity) -> dict:
+		"""Convert entity to a column dict for insert statements (generates UUID v7 if missing)"""
+		return {
+			"id": entity.id or uuid7(),
+			"user_id": entity.user_id,
+			"provider": entity.provider,
+			"provider_user_id": entity.provider_user_id,
+			"email": entity.email,
+			"provider_data": entity.provider_data,
+			"created_at": entity.created_at,
+			"updated_at": entity.updated_at,
+		}
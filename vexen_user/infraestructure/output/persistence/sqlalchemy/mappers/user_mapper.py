@@ -1,5 +1,7 @@
 """Mapper between User entity and UserModel."""
 
+from uuid6 import uuid7
+
 from vexen_user.domain.entity.user import User
 from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import (
 	UserModel,
@@ -10,8 +12,13 @@ class UserMapper:
 	"""Maps between User entity and UserModel"""
 
 	@staticmethod
-	def to_entity(model: UserModel) -> User:
-		"""Convert model to entity"""
+	def to_entity(model: UserModel, with_metadata: bool = True) -> User:
+		"""
+		Convert model to entity.
+
+		Pass with_metadata=False for models loaded with user_metadata deferred;
+		the attribute is not touched, since reading it would load it.
+		"""
 		return User(
 			id=model.id,
 			email=model.email,
@@ -21,7 +28,9 @@ class UserMapper:
 			created_at=model.created_at,
 			updated_at=model.updated_at,
 			last_login=model.last_login,
-			user_metadata=model.user_metadata or {},
+			user_metadata=(model.user_metadata or {}) if with_metadata else {},
+			role_id=model.role_id,
+			metadata_loaded=with_metadata,
 		)
 
 	@staticmethod
@@ -37,6 +46,7 @@ class UserMapper:
 			"updated_at": entity.updated_at,
 			"last_login": entity.last_login,
 			"user_metadata": entity.user_metadata,
+			"role_id": entity.role_id,
 		}
 
 		# Only include id if it exists
@@ -55,4 +65,39 @@ class UserMapper:
 		model.updated_at = entity.updated_at
 		model.last_login = entity.last_login
 		model.user_metadata = entity.user_metadata
+		model.role_id = entity.role_id
 		return model
+
+	@staticmethod
+	def to_row(entity: User) -> dict:
+		"""Convert entity to a column dict for bulk statements (generates UUID v7 if missing)"""
+		return {
+			"id": entity.id or uuid7(),
+			"email": entity.email,
+			"name": entity.name,
+			"avatar": entity.avatar,
+			"status": entity.status,
+			"created_at": entity.created_at,
+			"updated_at": entity.updated_at,
+			"last_login": entity.last_login,
+			"user_metadata": entity.user_metadata,
+			"role_id": entity.role_id,
+		}
+
+	@staticmethod
+	def to_update_values(entity: User) -> dict:
+		"""Convert entity to the column dict written when updating an existing row"""
+		values = {
+			"email": entity.email,
+			"name": entity.name,
+			"avatar": entity.avatar,
+			"status": entity.status,
+			"updated_at": entity.updated_at,
+			"last_login": entity.last_login,
+			"user_metadata": entity.user_metadata,
+			"role_id": entity.role_id,
+		}
+		# An entity read without metadata must not blank the stored value
+		if not entity.metadata_loaded:
+			del values["user_metadata"]
+		return values
@@ -0,0 +1,116 @@
+"""Migration helpers for databases created by older versions."""
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# (table, column) pairs stored with UUIDType
+UUID_COLUMNS = (
+	("users", "id"),
+	("user_external_identities", "id"),
+	("user_external_identities", "user_id"),
+)
+
+# Rows converted per round trip on SQLite
+SQLITE_BATCH_SIZE = 10_000
+
+
+async def migrate_uuid_columns(conn: AsyncConnection) -> bool:
+	"""
+	Convert UUID columns stored as 36-char strings to the current storage.
+
+	PostgreSQL columns are altered to the native uuid type (the foreign key from
+	user_external_identities is dropped and recreated around it). On SQLite the
+	values are rewritten in place as 16-byte blobs. Safe to run more than once;
+	run it inside a transaction (engine.begin()).
+
+	Returns:
+		True if anything was converted
+
+	Raises:
+		ValueError: If the dialect is not PostgreSQL or SQLite
+	"""
+	dialect_name = conn.dialect.name
+	if dialect_name == "postgresql":
+		return await _migrate_postgresql(conn)
+	if dialect_name == "sqlite":
+		return await _migrate_sqlite(conn)
+	raise ValueError(f"UUID migration is not supported on {dialect_name}")
+
+
+async def _migrate_postgresql(conn: AsyncConnection) -> bool:
+	pending = []
+	for table, column in UUID_COLUMNS:
+		result = await conn.execute(
+			text(
+				"SELECT data_type FROM information_schema.columns "
+				"WHERE table_schema = current_schema() "
+				"AND table_name = :table AND column_name = :column"
+			),
+			{"table": table, "column": column},
+		)
+		data_type = result.scalar_one_or_none()
+		if data_type is not None and data_type != "uuid":
+			pending.append((table, column))
+
+	if not pending:
+		return False
+
+	# Both sides of a foreign key must share a type, so drop it while converting
+	result = await conn.execute(
+		text(
+			"SELECT conname FROM pg_constraint "
+			"WHERE contype = 'f' AND conrelid = 'user_external_identities'::regclass"
+		)
+	)
+	foreign_keys = result.scalars().all()
+	for name in foreign_keys:
+		await conn.execute(text(f'ALTER TABLE user_external_identities DROP CONSTRAINT "{name}"'))
+
+	for table, column in pending:
+		await conn.execute(
+			text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid")
+		)
+
+	for name in foreign_keys:
+		await conn.execute(
+			text(
+				f'ALTER TABLE user_external_identities ADD CONSTRAINT "{name}" '
+				"FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+			)
+		)
+	return True
+
+
+async def _migrate_sqlite(conn: AsyncConnection) -> bool:
+	# Parent ids change before the children pointing at them
+	await conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+
+	converted = False
+	for table, column in UUID_COLUMNS:
+		result = await conn.execute(
+			text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :table"),
+			{"table": table},
+		)
+		if result.scalar_one_or_none() is None:
+			continue
+
+		while True:
+			result = await conn.execute(
+				text(
+					f"SELECT rowid, {column} FROM {table} "
+					f"WHERE typeof({column}) = 'text' LIMIT {SQLITE_BATCH_SIZE}"
+				)
+			)
+			rows = result.all()
+			if not rows:
+				break
+
+			await conn.execute(
+				text(f"UPDATE {table} SET {column} = :value WHERE rowid = :row_id"),
+				[{"value": uuid.UUID(value).bytes, "row_id": row_id} for row_id, value in rows],
+			)
+			converted = True
+
+	return converted
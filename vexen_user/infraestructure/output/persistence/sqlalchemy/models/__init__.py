@@ -1,6 +1,7 @@
 """SQLAlchemy models."""
 
+from .schema_version import SchemaVersionModel
 from .user import Base, UserModel, UUIDType
 from .user_external_identity import UserExternalIdentityModel
 
-__all__ = ["Base", "UserModel", "UUIDType", "UserExternalIdentityModel"]
+__all__ = ["Base", "UserModel", "UUIDType", "UserExternalIdentityModel", "SchemaVersionModel"]
@@ -0,0 +1,20 @@
+"""SQLAlchemy schema version model."""
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .user import Base
+
+
+class SchemaVersionModel(Base):
+	"""
+	Versions of the schema objects created by init().
+
+	One row per component: "schema" for the tables and indexes, and
+	"search:<backend>" for the objects of each search backend that was set up.
+	"""
+
+	__tablename__ = "vexen_user_schema_version"
+
+	component: Mapped[str] = mapped_column(String(100), primary_key=True)
+	version: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -5,35 +5,50 @@ from datetime import datetime
 
 from uuid6 import uuid7
 
-from sqlalchemy import JSON, DateTime, String, TypeDecorator, event, func
+from sqlalchemy import BINARY, JSON, DateTime, Index, String, TypeDecorator, event, func, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class UUIDType(TypeDecorator):
-	"""Platform-independent UUID type that stores as string."""
+	"""
+	Platform-independent UUID type.
 
-	impl = String
+	Uses the native UUID type on PostgreSQL and 16-byte BINARY elsewhere.
+	Databases created by older versions stored 36-char strings; see
+	migrations.migrate_uuid_columns().
+	"""
+
+	impl = BINARY(16)
 	cache_ok = True
 
+	def load_dialect_impl(self, dialect):
+		if dialect.name == "postgresql":
+			return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+		return dialect.type_descriptor(BINARY(16))
+
 	def process_bind_param(self, value, dialect):
-		"""Convert UUID to string for database storage."""
+		"""Convert UUID to the dialect's storage format."""
 		if value is None:
 			return None
-		if isinstance(value, uuid.UUID):
-			return str(value)
-		# Try to convert string to UUID first to validate
-		try:
-			return str(uuid.UUID(str(value)))
-		except (ValueError, AttributeError):
-			return None
+		if not isinstance(value, uuid.UUID):
+			# Validate strings and other representations, unknown values match nothing
+			try:
+				value = uuid.UUID(str(value))
+			except (ValueError, AttributeError):
+				return None
+		if dialect.name == "postgresql":
+			return value
+		return value.bytes
 
 	def process_result_value(self, value, dialect):
-		"""Convert string back to UUID when retrieving from database."""
-		if value is None:
-			return None
-		if isinstance(value, uuid.UUID):
+		"""Convert stored value back to UUID when retrieving from database."""
+		if value is None or isinstance(value, uuid.UUID):
 			return value
 		try:
+			if isinstance(value, bytes):
+				return uuid.UUID(bytes=value)
+			# Row not yet converted by migrate_uuid_columns()
 			return uuid.UUID(value)
 		except (ValueError, AttributeError, TypeError):
 			return None
@@ -49,16 +64,74 @@ class UserModel(Base):
 	__tablename__ = "users"
 
 	id: Mapped[uuid.UUID] = mapped_column(UUIDType, primary_key=True, nullable=False)
-	email: Mapped[str] = mapped_column(String, unique=True, nullable=False, index=True)
+	email: Mapped[str] = mapped_column(String, nullable=False)
 	name: Mapped[str] = mapped_column(String, nullable=False)
 	avatar: Mapped[str | None] = mapped_column(String, nullable=True)
-	status: Mapped[str] = mapped_column(String, nullable=False, default="active", index=True)
+	status: Mapped[str] = mapped_column(String, nullable=False, default="active")
+	role_id: Mapped[str | None] = mapped_column(String, nullable=True)
 	created_at: Mapped[datetime] = mapped_column(
 		DateTime(timezone=True), server_default=func.now(), nullable=False
 	)
 	updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 	last_login: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-	user_metadata: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+	# JSONB on PostgreSQL so metadata filters can use containment and a GIN index
+	user_metadata: Mapped[dict | None] = mapped_column(
+		JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True
+	)
+	# Set by soft delete; tombstones are hidden from every query until purged
+	deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# Partial indexes over live rows: tombstones neither bloat them nor block their email
+LIVE_USERS = text("deleted_at IS NULL")
+
+Index(
+	"ux_users_live_email",
+	UserModel.email,
+	unique=True,
+	postgresql_where=LIVE_USERS,
+	sqlite_where=LIVE_USERS,
+)
+# Seek key for keyset pagination ordered by (created_at DESC, id DESC)
+Index(
+	"ix_users_live_created_at_id",
+	UserModel.created_at,
+	UserModel.id,
+	postgresql_where=LIVE_USERS,
+	sqlite_where=LIVE_USERS,
+)
+# Filtered list pages: equality prefix, then the list order, so pages are range scans
+Index(
+	"ix_users_live_status_created_at",
+	UserModel.status,
+	UserModel.created_at.desc(),
+	UserModel.id.desc(),
+	postgresql_where=LIVE_USERS,
+	sqlite_where=LIVE_USERS,
+)
+Index(
+	"ix_users_live_role_status_created_at",
+	UserModel.role_id,
+	UserModel.status,
+	UserModel.created_at.desc(),
+	UserModel.id.desc(),
+	postgresql_where=LIVE_USERS,
+	sqlite_where=LIVE_USERS,
+)
+# Only tombstones: purge_deleted() finds expired ones without scanning live users
+Index(
+	"ix_users_deleted_at",
+	UserModel.deleted_at,
+	postgresql_where=text("deleted_at IS NOT NULL"),
+	sqlite_where=text("deleted_at IS NOT NULL"),
+)
+# Metadata filters compile to user_metadata @> '{...}' on PostgreSQL
+Index(
+	"ix_users_metadata_gin",
+	UserModel.user_metadata,
+	postgresql_using="gin",
+	postgresql_ops={"user_metadata": "jsonb_path_ops"},
+).ddl_if(dialect="postgresql")
 
 
 # Generate UUID v7 for new users before insert
@@ -0,0 +1,71 @@
+"""Connection pool with acquire metrics."""
+
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Acquisitions kept for latency percentiles
+LATENCY_WINDOW = 1024
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+	"""
+	AsyncAdaptedQueuePool that tracks how long connections take to acquire.
+
+	Acquire latency covers waiting for a free connection, opening new ones and
+	pre-ping. Metrics start over when the pool is recreated (e.g. on dispose).
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.waiters = 0
+		self.timeouts = 0
+		self.acquisitions = 0
+		self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+	def connect(self):
+		self.waiters += 1
+		started = time.perf_counter()
+		try:
+			connection = super().connect()
+		except PoolTimeoutError:
+			self.timeouts += 1
+			raise
+		finally:
+			self.waiters -= 1
+		self._latencies.append(time.perf_counter() - started)
+		self.acquisitions += 1
+		return connection
+
+	def stats(self) -> dict:
+		"""
+		Snapshot of the pool.
+
+		Returns:
+			Dictionary with size, checked_out, idle, overflow, max_overflow,
+			waiters, timeouts, acquisitions and acquire_p50_ms/p99_ms/max_ms
+			over the last LATENCY_WINDOW acquisitions
+		"""
+		latencies = sorted(self._latencies)
+		return {
+			"size": self.size(),
+			"checked_out": self.checkedout(),
+			"idle": self.checkedin(),
+			"overflow": max(self.overflow(), 0),
+			"max_overflow": self._max_overflow,
+			"waiters": self.waiters,
+			"timeouts": self.timeouts,
+			"acquisitions": self.acquisitions,
+			"acquire_p50_ms": _percentile_ms(latencies, 0.50),
+			"acquire_p99_ms": _percentile_ms(latencies, 0.99),
+			"acquire_max_ms": latencies[-1] * 1000 if latencies else None,
+		}
+
+
+def _percentile_ms(ordered: list[float], quantile: float) -> float | None:
+	if not ordered:
+		return None
+	index = min(len(ordered) - 1, int(quantile * len(ordered)))
+	return ordered[index] * 1000
@@ -0,0 +1,43 @@
+"""Dialect-specific statement helpers."""
+
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+
+async def upsert_insert(session: AsyncSession):
+	"""
+	Return the insert() construct supporting ON CONFLICT for the session's dialect.
+
+	Raises:
+		ValueError: If the dialect has no ON CONFLICT support here
+	"""
+	connection = await session.connection()
+	dialect_name = connection.dialect.name
+	if dialect_name == "postgresql":
+		return postgresql.insert
+	if dialect_name == "sqlite":
+		return sqlite.insert
+	raise ValueError(f"Upsert statements are not supported on {dialect_name}")
+
+
+class ExplainJson(Executable, ClauseElement):
+	"""
+	PostgreSQL EXPLAIN (FORMAT JSON) of a select, executed like any statement.
+
+	The select is compiled inline, so its parameters go through their types'
+	bind processors (e.g. JSONB serialization) as in a normal execution.
+	"""
+
+	inherit_cache = False
+
+	def __init__(self, statement: Select):
+		self.statement = statement
+
+
+@compiles(ExplainJson, "postgresql")
+def _compile_explain_json(element: ExplainJson, compiler, **kw) -> str:
+	return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
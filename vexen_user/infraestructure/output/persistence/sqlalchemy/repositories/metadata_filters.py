@@ -0,0 +1,76 @@
+"""Filters on user_metadata keys."""
+
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, func, literal_column, type_coerce
+from sqlalchemy.dialects import postgresql
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+
+# Keys are inlined in JSON paths and index names, so only word characters are allowed
+METADATA_KEY_PATTERN = re.compile(r"^\w+$", re.ASCII)
+
+
+def validate_metadata_key(key: str) -> str:
+	"""
+	Check that a metadata key can be used in a JSON path.
+
+	Raises:
+		ValueError: If the key has characters other than letters, digits and "_"
+	"""
+	if not isinstance(key, str) or not METADATA_KEY_PATTERN.match(key):
+		raise ValueError(f"Invalid metadata key: {key!r}")
+	return key
+
+
+def sqlite_metadata_expression(key: str) -> ColumnElement:
+	"""
+	json_extract() of one metadata key.
+
+	The path is rendered inline, not as a bind parameter, so the expression
+	matches the index created by sqlite_metadata_index_ddl() for the same key.
+	"""
+	path = literal_column(f"'$.{validate_metadata_key(key)}'")
+	return func.json_extract(UserModel.user_metadata, path)
+
+
+def sqlite_metadata_index_ddl(key: str) -> str:
+	"""CREATE INDEX statement for a hot metadata key on SQLite"""
+	key = validate_metadata_key(key)
+	return (
+		f"CREATE INDEX IF NOT EXISTS ix_users_metadata_{key} "
+		f"ON users (json_extract(user_metadata, '$.{key}'))"
+	)
+
+
+def metadata_filter_clause(dialect_name: str, filters: Mapping[str, Any]) -> ColumnElement:
+	"""
+	Build the WHERE clause matching users whose metadata has every key/value pair.
+
+	On PostgreSQL this is JSONB containment (user_metadata @> filters), served by
+	the GIN index on the column, so values may be nested objects or lists. On
+	SQLite each pair becomes json_extract(user_metadata, '$.key') = value, which
+	uses the expression index of keys declared in metadata_index_keys; values
+	must be scalars there.
+
+	Raises:
+		ValueError: If a key or value is not supported on the dialect
+	"""
+	if dialect_name == "postgresql":
+		return type_coerce(UserModel.user_metadata, postgresql.JSONB).contains(dict(filters))
+
+	if dialect_name != "sqlite":
+		raise ValueError(f"Metadata filters are not supported on {dialect_name}")
+
+	clauses = []
+	for key, value in filters.items():
+		if isinstance(value, dict | list):
+			raise ValueError(f"Nested metadata filter values require PostgreSQL (key {key!r})")
+		if value is None:
+			# Present with a JSON null, as containment would match; a missing key does not
+			path = literal_column(f"'$.{validate_metadata_key(key)}'")
+			clauses.append(func.json_type(UserModel.user_metadata, path) == "null")
+		else:
+			clauses.append(sqlite_metadata_expression(key) == value)
+	return and_(*clauses)
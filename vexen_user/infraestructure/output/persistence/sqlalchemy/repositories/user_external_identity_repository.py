@@ -0,0 +1,211 @@
+"""SQLAlchemy User external identity repository implementation."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, exists, literal_column, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from vexen_user.domain.entity.user import User
+from vexen_user.domain.entity.user_external_identity import UserExternalIdentity
+from vexen_user.domain.repository.user_external_identity_repository_port import (
+	IUserExternalIdentityRepositoryPort,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.mappers.user_external_identity_mapper import (  # noqa: E501
+	UserExternalIdentityMapper,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.mappers.user_mapper import UserMapper
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user_external_identity import (
+	UserExternalIdentityModel,
+)
+
+from .dialect import upsert_insert
+from .user_repository import NOT_DELETED, WITHOUT_METADATA
+
+
+class UserExternalIdentityRepository(IUserExternalIdentityRepositoryPort):
+	"""SQLAlchemy 2.0 async implementation of user external identity repository"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def find_user_by_identity(self, provider: str, provider_user_id: str) -> User | None:
+		"""Get the linked user with one join on the (provider, provider_user_id) index"""
+		stmt = (
+			select(UserModel)
+			.join(UserExternalIdentityModel, UserExternalIdentityModel.user_id == UserModel.id)
+			.where(
+				UserExternalIdentityModel.provider == provider,
+				UserExternalIdentityModel.provider_user_id == provider_user_id,
+				NOT_DELETED,
+			)
+		)
+		result = await self.session.execute(stmt)
+		model = result.scalar_one_or_none()
+
+		if model is None:
+			return None
+
+		return UserMapper.to_entity(model)
+
+	async def list_by_user(self, user_id: str) -> list[UserExternalIdentity]:
+		"""Get all identities linked to a user"""
+		try:
+			uuid_id = uuid.UUID(str(user_id))
+		except (ValueError, AttributeError):
+			return []
+
+		stmt = (
+			select(UserExternalIdentityModel)
+			.where(UserExternalIdentityModel.user_id == uuid_id)
+			.order_by(UserExternalIdentityModel.created_at)
+		)
+		result = await self.session.execute(stmt)
+		return [UserExternalIdentityMapper.to_entity(model) for model in result.scalars().all()]
+
+	async def link(self, identity: UserExternalIdentity) -> UserExternalIdentity:
+		"""
+		Link an identity with INSERT ... ON CONFLICT DO UPDATE.
+
+		An identity linked to another user is only taken over when that user is
+		no longer live: soft-deleted, or gone while the identity was left behind.
+		"""
+		dialect_insert = await upsert_insert(self.session)
+		stmt = dialect_insert(UserExternalIdentityModel).values(
+			UserExternalIdentityMapper.to_row(identity)
+		)
+		stmt = stmt.on_conflict_do_update(
+			index_elements=[
+				UserExternalIdentityModel.provider,
+				UserExternalIdentityModel.provider_user_id,
+			],
+			set_={
+				"user_id": stmt.excluded.user_id,
+				"email": stmt.excluded.email,
+				"provider_data": stmt.excluded.provider_data,
+				"updated_at": datetime.now(),
+			},
+			# Never move an identity away from a live user: one indexed lookup of the
+			# current owner. INSERT does not correlate subqueries, so the conflicting
+			# row's column is named literally instead of adding a FROM for it.
+			where=or_(
+				UserExternalIdentityModel.user_id == stmt.excluded.user_id,
+				~exists(
+					select(1).where(
+						UserModel.id
+						== literal_column(f"{UserExternalIdentityModel.__tablename__}.user_id"),
+						NOT_DELETED,
+					)
+				),
+			),
+		).returning(UserExternalIdentityModel)
+
+		result = await self.session.scalars(stmt, execution_options={"populate_existing": True})
+		model = result.one_or_none()
+		if model is None:
+			raise ValueError(
+				f"Identity {identity.provider}:{identity.provider_user_id} "
+				"is already linked to another user"
+			)
+
+		return UserExternalIdentityMapper.to_entity(model)
+
+	async def unlink(self, user_id: str, provider: str, provider_user_id: str | None = None) -> int:
+		"""Unlink identities with a single DELETE"""
+		try:
+			uuid_id = uuid.UUID(str(user_id))
+		except (ValueError, AttributeError):
+			return 0
+
+		stmt = delete(UserExternalIdentityModel).where(
+			UserExternalIdentityModel.user_id == uuid_id,
+			UserExternalIdentityModel.provider == provider,
+		)
+		if provider_user_id is not None:
+			stmt = stmt.where(UserExternalIdentityModel.provider_user_id == provider_user_id)
+
+		result = await self.session.execute(stmt, execution_options={"synchronize_session": False})
+		return result.rowcount
+
+	async def login_or_provision(
+		self,
+		provider: str,
+		provider_user_id: str,
+		new_user: User,
+		provider_data: dict | None = None,
+		link_existing_email: bool = False,
+	) -> tuple[User, bool]:
+		"""
+		Record a login for an identity, provisioning the user on first login.
+
+		Known identities take a single UPDATE users ... FROM user_external_identities
+		... RETURNING statement. Provisioning inserts the user and the identity.
+		The user is returned without user_metadata.
+		"""
+		now = datetime.now()
+
+		login_stmt = (
+			update(UserModel)
+			.where(
+				UserModel.id == UserExternalIdentityModel.user_id,
+				UserExternalIdentityModel.provider == provider,
+				UserExternalIdentityModel.provider_user_id == provider_user_id,
+				NOT_DELETED,
+			)
+			.values(last_login=now)
+			.returning(UserModel)
+			.options(WITHOUT_METADATA)
+		)
+		result = await self.session.scalars(
+			login_stmt,
+			execution_options={"populate_existing": True, "synchronize_session": False},
+		)
+		model = result.one_or_none()
+		if model is not None:
+			return UserMapper.to_entity(model, with_metadata=False), False
+
+		# First login with this identity: create the user unless the email is taken
+		new_user.last_login = now
+		dialect_insert = await upsert_insert(self.session)
+		user_stmt = (
+			dialect_insert(UserModel)
+			.values(UserMapper.to_row(new_user))
+			.on_conflict_do_nothing(index_elements=[UserModel.email], index_where=NOT_DELETED)
+			.returning(UserModel)
+			.options(WITHOUT_METADATA)
+		)
+		result = await self.session.scalars(
+			user_stmt, execution_options={"populate_existing": True}
+		)
+		model = result.one_or_none()
+		created = model is not None
+
+		if model is None:
+			if not link_existing_email:
+				raise ValueError(f"User with email {new_user.email} already exists")
+			existing_stmt = (
+				update(UserModel)
+				.where(UserModel.email == new_user.email, NOT_DELETED)
+				.values(last_login=now)
+				.returning(UserModel)
+				.options(WITHOUT_METADATA)
+			)
+			result = await self.session.scalars(
+				existing_stmt,
+				execution_options={"populate_existing": True, "synchronize_session": False},
+			)
+			model = result.one()
+
+		await self.link(
+			UserExternalIdentity(
+				id=None,
+				user_id=model.id,
+				provider=provider,
+				provider_user_id=provider_user_id,
+				email=new_user.email,
+				provider_data=provider_data,
+				created_at=now,
+			)
+		)
+
+		return UserMapper.to_entity(model, with_metadata=False), created
@@ -1,21 +1,91 @@
 """SQLAlchemy User repository implementation."""
 
+import json
 import uuid
+from collections.abc import AsyncIterator, Mapping, Sequence
 from datetime import datetime, timedelta
-
-from sqlalchemy import func, or_, select
+from typing import Any
+
+from sqlalchemy import (
+	DateTime,
+	Row,
+	Select,
+	and_,
+	bindparam,
+	case,
+	column,
+	delete,
+	func,
+	insert,
+	or_,
+	select,
+	update,
+	values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from vexen_user.domain.entity.user import User
-from vexen_user.domain.repository.user_repository_port import IUserRepositoryPort
+from vexen_user.domain.repository.user_repository_port import CountMode, IUserRepositoryPort
+from vexen_user.domain.vo.user_cursor import UserCursor
+from vexen_user.domain.vo.user_summary import UserSummary
 from vexen_user.infraestructure.output.persistence.sqlalchemy.mappers.user_mapper import UserMapper
-from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import (
+	UserModel,
+	UUIDType,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user_external_identity import (
+	UserExternalIdentityModel,
+)
+from vexen_user.infraestructure.output.persistence.sqlalchemy.search import (
+	IlikeSearchBackend,
+	UserSearchBackend,
+)
+from vexen_user.shared.cache import TTLCache
+
+from .dialect import ExplainJson, upsert_insert
+from .metadata_filters import metadata_filter_clause
+
+# Columns that update_partial may write
+UPDATABLE_FIELDS = frozenset(
+	{"name", "email", "avatar", "status", "updated_at", "last_login", "user_metadata", "role_id"}
+)
+
+# Columns of UserSummary, in field order
+SUMMARY_COLUMNS = (
+	UserModel.id,
+	UserModel.email,
+	UserModel.name,
+	UserModel.avatar,
+	UserModel.status,
+	UserModel.created_at,
+	UserModel.last_login,
+	UserModel.role_id,
+)
+
+# Rows not soft-deleted; every query reads only these
+NOT_DELETED = UserModel.deleted_at.is_(None)
+
+# Loader option leaving the user_metadata JSON out of a select of UserModel
+WITHOUT_METADATA = defer(UserModel.user_metadata)
+
+# Rows per INSERT statement in bulk operations (keeps bind parameters under driver limits)
+BULK_CHUNK_SIZE = 1000
 
 
 class UserRepository(IUserRepositoryPort):
 	"""SQLAlchemy 2.0 async implementation of user repository"""
 
-	def __init__(self, session: AsyncSession):
+	def __init__(
+		self,
+		session: AsyncSession,
+		count_cache: TTLCache | None = None,
+		search_backend: UserSearchBackend | None = None,
+		soft_delete: bool = False,
+	):
 		self.session = session
+		self.count_cache = count_cache
+		self.search_backend = search_backend or IlikeSearchBackend()
+		self.soft_delete = soft_delete
 
 	async def get_by_id(self, user_id: str) -> User | None:
 		"""Get user by ID"""
@@ -25,7 +95,7 @@ class UserRepository(IUserRepositoryPort):
 		except (ValueError, AttributeError):
 			return None
 
-		stmt = select(UserModel).where(UserModel.id == uuid_id)
+		stmt = select(UserModel).where(UserModel.id == uuid_id, NOT_DELETED)
 		result = await self.session.execute(stmt)
 		model = result.scalar_one_or_none()
 
@@ -34,55 +104,285 @@ class UserRepository(IUserRepositoryPort):
 
 		return UserMapper.to_entity(model)
 
-	async def get_by_email(self, email: str) -> User | None:
+	async def get_by_email(self, email: str, with_metadata: bool = False) -> User | None:
 		"""Get user by email"""
-		stmt = select(UserModel).where(UserModel.email == email)
+		stmt = self._select_users(with_metadata).where(UserModel.email == email, NOT_DELETED)
 		result = await self.session.execute(stmt)
 		model = result.scalar_one_or_none()
 
 		if model is None:
 			return None
 
-		return UserMapper.to_entity(model)
+		return UserMapper.to_entity(model, with_metadata)
+
+	@staticmethod
+	def _select_users(with_metadata: bool) -> Select:
+		"""select(UserModel), leaving out user_metadata unless with_metadata"""
+		stmt = select(UserModel)
+		return stmt if with_metadata else stmt.options(WITHOUT_METADATA)
+
+	async def get_many_by_ids(self, user_ids: list[str]) -> list[User]:
+		"""Get many users by ID with WHERE id IN (...)"""
+		uuid_ids = []
+		for user_id in user_ids:
+			try:
+				uuid_ids.append(uuid.UUID(str(user_id)))
+			except (ValueError, AttributeError):
+				continue
+
+		return await self._get_many(UserModel.id, list(dict.fromkeys(uuid_ids)))
+
+	async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+		"""Get many users by email with WHERE email IN (...)"""
+		return await self._get_many(UserModel.email, list(dict.fromkeys(emails)))
+
+	async def _get_many(self, column, values: list) -> list[User]:
+		"""Select users whose column is in values, chunked to stay under bind limits"""
+		users: list[User] = []
+		for start in range(0, len(values), BULK_CHUNK_SIZE):
+			chunk = values[start : start + BULK_CHUNK_SIZE]
+			stmt = select(UserModel).where(column.in_(chunk), NOT_DELETED)
+			result = await self.session.execute(stmt)
+			users.extend(UserMapper.to_entity(model) for model in result.scalars().all())
+		return users
 
 	async def save(self, user: User) -> User:
-		"""Create or update user"""
+		"""Create or update user with a single RETURNING statement"""
 		if user.id:
 			# Update existing
-			stmt = select(UserModel).where(UserModel.id == user.id)
-			result = await self.session.execute(stmt)
-			existing_model = result.scalar_one_or_none()
+			model = await self._update_returning(user.id, UserMapper.to_update_values(user))
+			if model is not None:
+				return UserMapper.to_entity(model)
 
-			if existing_model:
-				model = UserMapper.update_model_from_entity(existing_model, user)
-			else:
-				model = UserMapper.to_model(user)
-				self.session.add(model)
-		else:
-			# Create new - the model will auto-generate UUID v7
-			model = UserMapper.to_model(user)
-			self.session.add(model)
+		# Create new - ids are generated client-side as UUID v7
+		stmt = insert(UserModel).values(UserMapper.to_row(user)).returning(UserModel)
+		result = await self.session.scalars(stmt, execution_options={"populate_existing": True})
+		return UserMapper.to_entity(result.one())
 
-		await self.session.flush()
-		await self.session.refresh(model)
+	async def update_partial(self, user_id: str, fields: dict) -> User | None:
+		"""Update only the given columns with UPDATE ... RETURNING"""
+		unknown = set(fields) - UPDATABLE_FIELDS
+		if unknown:
+			raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
 
-		return UserMapper.to_entity(model)
+		try:
+			uuid_id = uuid.UUID(str(user_id))
+		except (ValueError, AttributeError):
+			return None
+
+		model = await self._update_returning(uuid_id, fields)
+		return UserMapper.to_entity(model) if model is not None else None
+
+	async def _update_returning(self, user_id: uuid.UUID, values: dict) -> UserModel | None:
+		stmt = (
+			update(UserModel)
+			.where(UserModel.id == user_id, NOT_DELETED)
+			.values(values)
+			.returning(UserModel)
+		)
+		result = await self.session.scalars(
+			stmt,
+			execution_options={"populate_existing": True, "synchronize_session": False},
+		)
+		return result.one_or_none()
+
+	async def bulk_create(self, users: list[User]) -> list[User]:
+		"""Insert many users, skipping emails that already exist"""
+		return await self._bulk_insert(users, update_existing=False)
+
+	async def bulk_upsert(self, users: list[User]) -> list[User]:
+		"""Insert many users, updating the ones whose email already exists"""
+		return await self._bulk_insert(users, update_existing=True)
+
+	async def _bulk_insert(self, users: list[User], update_existing: bool) -> list[User]:
+		"""
+		Run INSERT ... ON CONFLICT (email) in chunks and return the affected users.
+
+		The conflict target is the partial unique index over live users, so a
+		soft-deleted user never blocks its email.
+		"""
+		dialect_insert = await upsert_insert(self.session)
+
+		saved: list[User] = []
+		for start in range(0, len(users), BULK_CHUNK_SIZE):
+			rows = [UserMapper.to_row(user) for user in users[start : start + BULK_CHUNK_SIZE]]
+
+			stmt = dialect_insert(UserModel)
+			if update_existing:
+				stmt = stmt.on_conflict_do_update(
+					index_elements=[UserModel.email],
+					index_where=NOT_DELETED,
+					set_={
+						"name": stmt.excluded.name,
+						"avatar": stmt.excluded.avatar,
+						"status": stmt.excluded.status,
+						"updated_at": stmt.excluded.updated_at,
+						"user_metadata": stmt.excluded.user_metadata,
+						"role_id": stmt.excluded.role_id,
+					},
+				)
+			else:
+				stmt = stmt.on_conflict_do_nothing(
+					index_elements=[UserModel.email], index_where=NOT_DELETED
+				)
 
-	async def delete(self, user_id: str) -> None:
-		"""Delete user"""
+			result = await self.session.scalars(
+				stmt.returning(UserModel),
+				rows,
+				execution_options={"populate_existing": True},
+			)
+			saved.extend(UserMapper.to_entity(model) for model in result.all())
+
+		return saved
+
+	async def record_logins(self, logins: Mapping[str, datetime]) -> int:
+		"""Set last_login for many users with batched UPDATE statements"""
+		rows = []
+		for user_id, logged_in_at in logins.items():
+			try:
+				rows.append((uuid.UUID(str(user_id)), logged_in_at))
+			except (ValueError, AttributeError):
+				continue
+
+		connection = await self.session.connection()
+		updated = 0
+		for start in range(0, len(rows), BULK_CHUNK_SIZE):
+			chunk = rows[start : start + BULK_CHUNK_SIZE]
+			if connection.dialect.name == "postgresql":
+				updated += await self._record_logins_from_values(chunk)
+			else:
+				updated += await self._record_logins_executemany(chunk)
+		return updated
+
+	async def _record_logins_from_values(self, rows: list[tuple[uuid.UUID, datetime]]) -> int:
+		"""UPDATE users ... FROM (VALUES ...): one statement per chunk"""
+		logins = values(
+			column("id", UUIDType()),
+			column("last_login", DateTime(timezone=True)),
+			name="logins",
+		).data(rows)
+		stmt = (
+			update(UserModel)
+			.where(
+				UserModel.id == logins.c.id,
+				NOT_DELETED,
+				or_(UserModel.last_login.is_(None), UserModel.last_login < logins.c.last_login),
+			)
+			.values(last_login=logins.c.last_login)
+		)
+		result = await self.session.execute(stmt, execution_options={"synchronize_session": False})
+		return result.rowcount
+
+	async def _record_logins_executemany(self, rows: list[tuple[uuid.UUID, datetime]]) -> int:
+		"""Parameterized UPDATE run as executemany, for dialects without VALUES aliases"""
+		users = UserModel.__table__
+		stmt = (
+			update(users)
+			.where(
+				users.c.id == bindparam("login_id"),
+				users.c.deleted_at.is_(None),
+				or_(users.c.last_login.is_(None), users.c.last_login < bindparam("login_at")),
+			)
+			.values(last_login=bindparam("login_at"))
+		)
+		result = await self.session.execute(
+			stmt, [{"login_id": user_id, "login_at": at} for user_id, at in rows]
+		)
+		return result.rowcount
+
+	async def delete(self, user_id: str) -> bool:
+		"""Delete user: UPDATE ... SET deleted_at (soft delete) or DELETE with its identities"""
 		# Convert string to UUID for querying
 		try:
-			uuid_id = uuid.UUID(user_id)
+			uuid_id = uuid.UUID(str(user_id))
 		except (ValueError, AttributeError):
-			return
+			return False
 
-		stmt = select(UserModel).where(UserModel.id == uuid_id)
-		result = await self.session.execute(stmt)
-		model = result.scalar_one_or_none()
+		if self.soft_delete:
+			stmt = (
+				update(UserModel)
+				.where(UserModel.id == uuid_id, NOT_DELETED)
+				.values(deleted_at=datetime.now())
+			)
+		else:
+			# SQLite does not enforce ON DELETE CASCADE, so identities are removed explicitly
+			await self.session.execute(
+				delete(UserExternalIdentityModel).where(
+					UserExternalIdentityModel.user_id == uuid_id
+				),
+				execution_options={"synchronize_session": False},
+			)
+			stmt = delete(UserModel).where(UserModel.id == uuid_id)
+
+		result = await self.session.execute(stmt, execution_options={"synchronize_session": False})
+		return result.rowcount > 0
+
+	async def purge_deleted(self, older_than: timedelta, batch_size: int = 1000) -> int:
+		"""Purge expired tombstones batch by batch within this session"""
+		if batch_size < 1:
+			raise ValueError("batch_size must be at least 1")
+		cutoff = datetime.now() - older_than
+		purged = 0
+		while True:
+			count = await self.purge_deleted_batch(cutoff, batch_size)
+			purged += count
+			if count < batch_size:
+				return purged
+
+	async def purge_deleted_batch(self, deleted_before: datetime, batch_size: int) -> int:
+		"""
+		Remove up to batch_size users soft-deleted before deleted_before.
+
+		The ids come from the tombstone index; their identities are deleted
+		explicitly so databases without enforced foreign keys keep no orphans.
+		"""
+		stmt = (
+			select(UserModel.id)
+			.where(UserModel.deleted_at < deleted_before)
+			.order_by(UserModel.deleted_at)
+			.limit(batch_size)
+		)
+		user_ids = list((await self.session.scalars(stmt)).all())
+		if not user_ids:
+			return 0
+
+		await self.session.execute(
+			delete(UserExternalIdentityModel).where(
+				UserExternalIdentityModel.user_id.in_(user_ids)
+			),
+			execution_options={"synchronize_session": False},
+		)
+		await self.session.execute(
+			delete(UserModel).where(UserModel.id.in_(user_ids)),
+			execution_options={"synchronize_session": False},
+		)
+		return len(user_ids)
 
-		if model:
-			await self.session.delete(model)
-			await self.session.flush()
+	def _apply_filters(
+		self,
+		stmt: Select,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> Select:
+		"""Apply list filters to a select statement, leaving out soft-deleted users"""
+		stmt = stmt.where(NOT_DELETED)
+
+		if search:
+			stmt = self.search_backend.apply(stmt, search)
+
+		if role:
+			stmt = stmt.where(UserModel.role_id == role)
+
+		if status:
+			stmt = stmt.where(UserModel.status == status)
+
+		if metadata_filters:
+			dialect_name = self.session.get_bind().dialect.name
+			stmt = stmt.where(metadata_filter_clause(dialect_name, metadata_filters))
+
+		return stmt
 
 	async def list_paginated(
 		self,
@@ -91,82 +391,250 @@ class UserRepository(IUserRepositoryPort):
 		search: str | None = None,
 		role: str | None = None,
 		status: str | None = None,
-	) -> tuple[list[User], int]:
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], int | None, bool]:
 		"""List users with pagination and filters"""
+		rows, total, has_next = await self._list_page(
+			self._select_users(with_metadata),
+			page,
+			page_size,
+			search,
+			role,
+			status,
+			count_mode,
+			metadata_filters,
+		)
+		users = [UserMapper.to_entity(row[0], with_metadata) for row in rows]
+		return users, total, has_next
+
+	async def list_summaries(
+		self,
+		page: int,
+		page_size: int,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		count_mode: CountMode = "exact",
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], int | None, bool]:
+		"""List user summaries with pagination and filters, selecting only their columns"""
+		rows, total, has_next = await self._list_page(
+			select(*SUMMARY_COLUMNS),
+			page,
+			page_size,
+			search,
+			role,
+			status,
+			count_mode,
+			metadata_filters,
+		)
+		return [UserSummary(*row) for row in rows], total, has_next
+
+	async def _list_page(
+		self,
+		stmt: Select,
+		page: int,
+		page_size: int,
+		search: str | None,
+		role: str | None,
+		status: str | None,
+		count_mode: CountMode,
+		metadata_filters: Mapping[str, Any] | None,
+	) -> tuple[Sequence[Row], int | None, bool]:
+		"""Run an OFFSET page of a select and count its matches according to count_mode"""
 		offset = (page - 1) * page_size
 
 		# Build query with filters
-		stmt = select(UserModel)
+		stmt = self._apply_filters(stmt, search, role, status, metadata_filters)
 
-		if search:
-			stmt = stmt.where(
-				or_(
-					UserModel.name.ilike(f"%{search}%"),
-					UserModel.email.ilike(f"%{search}%"),
-				)
-			)
+		# Get total count
+		if count_mode == "exact":
+			total = await self._count_exact(stmt)
+		elif count_mode == "estimated":
+			key = (search, role, status, self._metadata_key(metadata_filters))
+			total = await self._count_estimated(stmt, key)
+		elif count_mode == "none":
+			total = None
+		else:
+			raise ValueError(f"Unsupported count mode: {count_mode}")
 
-		if role:
-			stmt = stmt.where(UserModel.role_id == role)
+		# Get paginated results, fetching one extra row to know whether there is a next page
+		stmt = (
+			stmt.order_by(UserModel.created_at.desc(), UserModel.id.desc())
+			.offset(offset)
+			.limit(page_size + 1)
+		)
+		result = await self.session.execute(stmt)
+		rows = result.all()
 
-		if status:
-			stmt = stmt.where(UserModel.status == status)
+		return rows[:page_size], total, len(rows) > page_size
 
-		# Get total count
+	async def _count_exact(self, stmt: Select) -> int:
+		"""Count the rows matched by a filtered select"""
 		count_stmt = select(func.count()).select_from(stmt.subquery())
 		total_result = await self.session.execute(count_stmt)
-		total = total_result.scalar_one()
+		return total_result.scalar_one()
+
+	@staticmethod
+	def _metadata_key(metadata_filters: Mapping[str, Any] | None) -> str | None:
+		"""Hashable form of metadata filters for the count cache"""
+		if not metadata_filters:
+			return None
+		return json.dumps(metadata_filters, sort_keys=True, default=str)
+
+	async def _count_estimated(self, stmt: Select, key: tuple) -> int:
+		"""
+		Approximate the rows matched by a filtered select.
+
+		On PostgreSQL this reads the planner estimate from EXPLAIN, which never
+		touches the table. Other dialects fall back to an exact count cached
+		per filter combination.
+		"""
+		connection = await self.session.connection()
+
+		if connection.dialect.name == "postgresql":
+			result = await self.session.execute(ExplainJson(stmt.with_only_columns(UserModel.id)))
+			plan = result.scalar_one()
+			if isinstance(plan, str):
+				plan = json.loads(plan)
+			return int(plan[0]["Plan"]["Plan Rows"])
+
+		if self.count_cache is not None:
+			cached = self.count_cache.get(key)
+			if cached is not None:
+				return cached
+
+		total = await self._count_exact(stmt)
+		if self.count_cache is not None:
+			self.count_cache.set(key, total)
+		return total
+
+	async def list_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+		with_metadata: bool = False,
+	) -> tuple[list[User], UserCursor | None]:
+		"""List users with keyset pagination and filters"""
+		rows, has_next = await self._list_after_cursor(
+			self._select_users(with_metadata),
+			page_size,
+			cursor,
+			search,
+			role,
+			status,
+			metadata_filters,
+		)
+		users = [UserMapper.to_entity(row[0], with_metadata) for row in rows]
+		return users, self._next_cursor(users, has_next)
+
+	async def list_summaries_by_cursor(
+		self,
+		page_size: int,
+		cursor: UserCursor | None = None,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> tuple[list[UserSummary], UserCursor | None]:
+		"""List user summaries with keyset pagination, selecting only their columns"""
+		rows, has_next = await self._list_after_cursor(
+			select(*SUMMARY_COLUMNS), page_size, cursor, search, role, status, metadata_filters
+		)
+		summaries = [UserSummary(*row) for row in rows]
+		return summaries, self._next_cursor(summaries, has_next)
 
-		# Get paginated results
-		stmt = stmt.offset(offset).limit(page_size).order_by(UserModel.created_at.desc())
+	async def _list_after_cursor(
+		self,
+		stmt: Select,
+		page_size: int,
+		cursor: UserCursor | None,
+		search: str | None,
+		role: str | None,
+		status: str | None,
+		metadata_filters: Mapping[str, Any] | None,
+	) -> tuple[Sequence[Row], bool]:
+		"""Run a keyset page of a select; returns the rows and whether more follow"""
+		stmt = self._apply_filters(stmt, search, role, status, metadata_filters)
+
+		# Seek past the cursor using the (created_at, id) index instead of OFFSET
+		if cursor is not None:
+			stmt = stmt.where(
+				or_(
+					UserModel.created_at < cursor.created_at,
+					and_(UserModel.created_at == cursor.created_at, UserModel.id < cursor.id),
+				)
+			)
+
+		# Fetch one extra row to know whether there is a next page
+		stmt = stmt.order_by(UserModel.created_at.desc(), UserModel.id.desc()).limit(page_size + 1)
 		result = await self.session.execute(stmt)
-		models = result.scalars().all()
+		rows = result.all()
 
-		users = [UserMapper.to_entity(model) for model in models]
-		return users, total
+		return rows[:page_size], len(rows) > page_size
 
-	async def get_stats(self) -> dict:
-		"""Get user statistics"""
-		# Total users
-		total_stmt = select(func.count()).select_from(UserModel)
-		total_result = await self.session.execute(total_stmt)
-		total = total_result.scalar_one()
-
-		# Active users
-		active_stmt = (
-			select(func.count()).select_from(UserModel).where(UserModel.status == "active")
-		)
-		active_result = await self.session.execute(active_stmt)
-		active = active_result.scalar_one()
+	@staticmethod
+	def _next_cursor(items: list[User] | list[UserSummary], has_next: bool) -> UserCursor | None:
+		if not has_next or not items:
+			return None
+		last = items[-1]
+		return UserCursor(created_at=last.created_at, id=last.id)
 
-		# Inactive users
-		inactive = total - active
+	async def stream_all(
+		self,
+		batch_size: int = 1000,
+		search: str | None = None,
+		role: str | None = None,
+		status: str | None = None,
+		metadata_filters: Mapping[str, Any] | None = None,
+	) -> AsyncIterator[User]:
+		"""Stream users with a server-side cursor, batch_size rows per fetch"""
+		stmt = self._apply_filters(select(UserModel), search, role, status, metadata_filters)
+		stmt = stmt.order_by(UserModel.created_at.desc(), UserModel.id.desc())
+
+		result = await self.session.stream_scalars(
+			stmt, execution_options={"yield_per": batch_size}
+		)
+		try:
+			async for model in result:
+				yield UserMapper.to_entity(model)
+		finally:
+			await result.close()
 
-		# New users this month
+	async def get_stats(self) -> dict:
+		"""Get user statistics in a single aggregate query"""
 		now = datetime.now()
 		first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-		new_this_month_stmt = (
-			select(func.count())
-			.select_from(UserModel)
-			.where(UserModel.created_at >= first_day_of_month)
-		)
-		new_this_month_result = await self.session.execute(new_this_month_stmt)
-		new_this_month = new_this_month_result.scalar_one()
-
-		# Recent logins (last 7 days)
 		seven_days_ago = now - timedelta(days=7)
-		recent_logins_stmt = (
-			select(func.count())
+
+		# COUNT(CASE WHEN ... THEN 1 END) is portable and lets one scan feed every counter
+		stmt = (
+			select(
+				func.count().label("total"),
+				func.count(case((UserModel.status == "active", 1))).label("active"),
+				func.count(case((UserModel.created_at >= first_day_of_month, 1))).label(
+					"new_this_month"
+				),
+				func.count(case((UserModel.last_login >= seven_days_ago, 1))).label(
+					"recent_logins"
+				),
+			)
 			.select_from(UserModel)
-			.where(UserModel.last_login >= seven_days_ago)
+			.where(NOT_DELETED)
 		)
-		recent_logins_result = await self.session.execute(recent_logins_stmt)
-		recent_logins = recent_logins_result.scalar_one()
+		result = await self.session.execute(stmt)
+		row = result.one()
 
 		return {
-			"total": total,
-			"active": active,
-			"inactive": inactive,
-			"new_this_month": new_this_month,
-			"recent_logins": recent_logins,
+			"total": row.total,
+			"active": row.active,
+			"inactive": row.total - row.active,
+			"new_this_month": row.new_this_month,
+			"recent_logins": row.recent_logins,
 		}
@@ -0,0 +1,409 @@
+"""Schema bootstrap for VexenUser.init() and upgrades for VexenUser.migrate_schema()."""
+
+import logging
+from collections.abc import Sequence
+from typing import Literal
+
+from sqlalchemy import (
+	JSON,
+	Column,
+	Connection,
+	Index,
+	Table,
+	delete,
+	insert,
+	inspect,
+	select,
+	text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex
+
+from .models import Base, SchemaVersionModel
+from .repositories.metadata_filters import sqlite_metadata_index_ddl, validate_metadata_key
+from .search import UserSearchBackend
+
+logger = logging.getLogger(__name__)
+
+# Bump when tables or indexes change so "check" mode looks for missing objects
+SCHEMA_VERSION = 6
+
+# Indexes replaced by partial indexes over live users, dropped by migrate_schema().
+# ix_users_email and ix_users_status come from the original index=True columns,
+# the *_trgm ones from the trigram search backend.
+OBSOLETE_INDEXES = (
+	"ix_users_email",
+	"ix_users_status",
+	"ix_users_created_at_id",
+	"ix_users_status_created_at",
+	"ix_users_role_status_created_at",
+	"ix_users_name_trgm",
+	"ix_users_email_trgm",
+)
+
+# Advisory locks serializing bootstraps, and migrations, of one PostgreSQL database
+SCHEMA_LOCK_NAME = "vexen_user_schema"
+MIGRATION_LOCK_NAME = "vexen_user_migration"
+
+SchemaMode = Literal[False, "check", "create"]
+
+
+def _expected_versions(
+	search_backend: UserSearchBackend, metadata_index_keys: Sequence[str]
+) -> dict[str, int]:
+	expected = {"schema": SCHEMA_VERSION, f"search:{search_backend.name}": SCHEMA_VERSION}
+	for key in metadata_index_keys:
+		expected[f"metadata:{key}"] = SCHEMA_VERSION
+	return expected
+
+
+async def _schema_is_current(engine: AsyncEngine, expected: dict[str, int]) -> bool:
+	"""Read the version table in one query; a missing table means not current"""
+	try:
+		async with engine.connect() as conn:
+			return await _versions_match(conn, expected)
+	except DBAPIError:
+		return False
+
+
+async def _versions_match(conn: AsyncConnection, expected: dict[str, int]) -> bool:
+	result = await conn.execute(select(SchemaVersionModel.component, SchemaVersionModel.version))
+	versions = dict(result.all())
+	return all(versions.get(component) == version for component, version in expected.items())
+
+
+def _has_version_table(conn: Connection) -> bool:
+	return inspect(conn).has_table(SchemaVersionModel.__tablename__)
+
+
+def _create_tables(conn: Connection, search_indexes: Sequence[str] = ()) -> list[str]:
+	"""
+	Create missing tables and columns, and list what existing tables still lack.
+
+	Queries need every column, and adding a nullable one only changes the
+	catalog, so missing columns are added here. Building indexes and rewriting
+	json columns as jsonb hold locks for as long as the table is large, so those
+	upgrades wait for migrate_schema().
+	"""
+	Base.metadata.create_all(conn)
+	_add_columns(conn)
+	return _pending_upgrades(conn, search_indexes)
+
+
+def _pending_upgrades(conn: Connection, search_indexes: Sequence[str] = ()) -> list[str]:
+	"""Describe the columns and indexes migrate_schema() would convert, add or drop"""
+	inspector = inspect(conn)
+	indexes = _index_names(conn)
+	pending = []
+	for table in Base.metadata.sorted_tables:
+		reflected = {column["name"]: column for column in inspector.get_columns(table.name)}
+		pending.extend(
+			f"jsonb column {table.name}.{column.name}"
+			for column in _json_columns(conn, table, reflected)
+		)
+		pending.extend(
+			f"index {index.name}"
+			for index in _table_indexes(table, conn)
+			if index.name not in indexes
+		)
+	pending.extend(f"index {name}" for name in search_indexes if name not in indexes)
+	pending.extend(f"obsolete index {name}" for name in OBSOLETE_INDEXES if name in indexes)
+	return pending
+
+
+def _missing_columns(table: Table, present: set[str]) -> list[Column]:
+	"""Columns of table absent from the database; only nullable ones can be added"""
+	return [column for column in table.columns if column.name not in present and column.nullable]
+
+
+def _add_columns(conn: Connection) -> bool:
+	"""Add missing nullable columns (no table rewrite: existing rows read as NULL)"""
+	inspector = inspect(conn)
+	added = False
+	for table in Base.metadata.sorted_tables:
+		present = {column["name"] for column in inspector.get_columns(table.name)}
+		for column in _missing_columns(table, present):
+			column_type = column.type.compile(dialect=conn.dialect)
+			conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+			added = True
+	return added
+
+
+def _convert_json_columns(conn: Connection) -> bool:
+	"""Convert PostgreSQL json columns declared as JSONB to jsonb"""
+	inspector = inspect(conn)
+	changed = False
+	for table in Base.metadata.sorted_tables:
+		reflected = {column["name"]: column for column in inspector.get_columns(table.name)}
+		# Rewrites the table under an exclusive lock, but only once
+		for column in _json_columns(conn, table, reflected):
+			conn.execute(
+				text(
+					f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+					f"TYPE jsonb USING {column.name}::jsonb"
+				)
+			)
+			changed = True
+	return changed
+
+
+def _create_indexes(conn: Connection, search_indexes: dict[str, str]) -> bool:
+	"""Build missing indexes, then drop the obsolete ones they replace"""
+	existing = _index_names(conn)
+	changed = False
+	for table in Base.metadata.sorted_tables:
+		for index in _table_indexes(table, conn):
+			if index.name not in existing:
+				index.create(conn)
+				changed = True
+	for name, definition in sorted(search_indexes.items()):
+		if name not in existing:
+			conn.execute(text(f"CREATE INDEX {name} {definition}"))
+			changed = True
+
+	for name in OBSOLETE_INDEXES:
+		if name in existing:
+			conn.execute(text(f"DROP INDEX {name}"))
+			changed = True
+	return changed
+
+
+def _table_indexes(table: Table, conn: Connection | AsyncConnection) -> list[Index]:
+	"""Indexes of table that create_all() builds on conn's dialect, honouring ddl_if()"""
+	return [
+		index
+		for index in sorted(table.indexes, key=lambda index: index.name)
+		if index._ddl_if is None or index._ddl_if._should_execute(CreateIndex(index), index, conn)
+	]
+
+
+def _index_names(conn: Connection) -> set[str]:
+	"""Names of the indexes on the existing tables of Base.metadata (on SQLite, of all)"""
+	if conn.dialect.name == "sqlite":
+		# The inspector skips expression indexes such as a search backend's
+		return set(conn.scalars(text("SELECT name FROM sqlite_master WHERE type = 'index'")))
+	inspector = inspect(conn)
+	tables = set(inspector.get_table_names())
+	return {
+		index["name"]
+		for table in Base.metadata.sorted_tables
+		if table.name in tables
+		for index in inspector.get_indexes(table.name)
+	}
+
+
+def _concurrent_index_ddl(index: Index, conn: AsyncConnection) -> str:
+	# CreateIndex only emits CONCURRENTLY for indexes declared with postgresql_concurrently
+	ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+	return ddl.replace(" INDEX ", " INDEX CONCURRENTLY ", 1)
+
+
+async def _create_indexes_concurrently(engine: AsyncEngine, search_indexes: dict[str, str]) -> bool:
+	"""
+	Build missing PostgreSQL indexes with CREATE INDEX CONCURRENTLY, then drop
+	the obsolete ones with DROP INDEX CONCURRENTLY.
+
+	Both run outside a transaction, so writes to the table continue meanwhile.
+	A build interrupted earlier leaves an invalid index, which is dropped and
+	built again.
+	"""
+	changed = False
+	async with engine.connect() as conn:
+		await conn.execution_options(isolation_level="AUTOCOMMIT")
+		await conn.execute(
+			text("SELECT pg_advisory_lock(hashtext(:name))"), {"name": MIGRATION_LOCK_NAME}
+		)
+		try:
+			builds = [
+				(index.name, _concurrent_index_ddl(index, conn))
+				for table in Base.metadata.sorted_tables
+				for index in _table_indexes(table, conn)
+			]
+			builds.extend(
+				(name, f"CREATE INDEX CONCURRENTLY {name} {definition}")
+				for name, definition in sorted(search_indexes.items())
+			)
+			for name, ddl in builds:
+				result = await conn.execute(
+					text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+					{"name": name},
+				)
+				valid = result.scalar_one_or_none()
+				if valid:
+					continue
+				if valid is False:
+					await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+				await conn.execute(text(ddl))
+				changed = True
+
+			for name in OBSOLETE_INDEXES:
+				result = await conn.execute(
+					text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+				)
+				if result.scalar_one():
+					await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+					changed = True
+		finally:
+			await conn.execute(
+				text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": MIGRATION_LOCK_NAME}
+			)
+	return changed
+
+
+def _json_columns(conn: Connection, table: Table, reflected: dict[str, dict]) -> list[Column]:
+	"""Columns declared as JSONB that PostgreSQL still stores as json"""
+	if conn.dialect.name != "postgresql":
+		return []
+
+	columns = []
+	for column in table.columns:
+		current = reflected.get(column.name)
+		if current is None or column.type.compile(dialect=conn.dialect) != "JSONB":
+			continue
+		if isinstance(current["type"], JSON) and not isinstance(current["type"], postgresql.JSONB):
+			columns.append(column)
+	return columns
+
+
+async def _create_schema(
+	conn: AsyncConnection,
+	search_backend: UserSearchBackend,
+	metadata_index_keys: Sequence[str],
+	expected: dict[str, int],
+) -> None:
+	pending = await conn.run_sync(_create_tables, list(search_backend.indexes()))
+	await search_backend.setup(conn)
+	# PostgreSQL filters every key through the GIN index; SQLite needs one index per key
+	if conn.dialect.name == "sqlite":
+		for key in metadata_index_keys:
+			await conn.execute(text(sqlite_metadata_index_ddl(key)))
+
+	if pending:
+		logger.warning(
+			"Tables created by an older version need VexenUser.migrate_schema(): %s",
+			", ".join(pending),
+		)
+		# Without the schema row "check" mode keeps looking until the migration runs
+		expected = {key: version for key, version in expected.items() if key != "schema"}
+	await _write_versions(conn, expected)
+
+
+async def _write_versions(conn: AsyncConnection, expected: dict[str, int]) -> None:
+	"""Upsert the version rows, so a concurrent bootstrap never hits a duplicate key"""
+	rows = [{"component": component, "version": version} for component, version in expected.items()]
+	dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(
+		conn.dialect.name
+	)
+	if dialect_insert is None:
+		await conn.execute(
+			delete(SchemaVersionModel).where(SchemaVersionModel.component.in_(list(expected)))
+		)
+		await conn.execute(insert(SchemaVersionModel), rows)
+		return
+
+	stmt = dialect_insert(SchemaVersionModel)
+	stmt = stmt.on_conflict_do_update(
+		index_elements=[SchemaVersionModel.component], set_={"version": stmt.excluded.version}
+	)
+	await conn.execute(stmt, rows)
+
+
+async def _lock_schema(conn: AsyncConnection) -> None:
+	"""
+	Take a lock held until the transaction ends, before anything else runs on conn.
+
+	Processes starting together then bootstrap one after the other instead of
+	racing on CREATE TABLE and the version rows: PostgreSQL takes an advisory
+	lock, SQLite opens the transaction with BEGIN IMMEDIATE (the database write
+	lock, waited for up to the driver's busy timeout).
+	"""
+	if conn.dialect.name == "postgresql":
+		await conn.execute(
+			text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": SCHEMA_LOCK_NAME}
+		)
+	elif conn.dialect.name == "sqlite":
+		await conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+async def bootstrap_schema(
+	engine: AsyncEngine,
+	search_backend: UserSearchBackend,
+	mode: SchemaMode = "create",
+	metadata_index_keys: Sequence[str] = (),
+) -> bool:
+	"""
+	Create the tables, search objects and metadata key indexes according to mode.
+
+	"create" always runs create_all and the search backend setup, which checks
+	every table. "check" reads the version table once and only creates the
+	schema when it is missing or outdated. False leaves the database untouched.
+	On PostgreSQL concurrent bootstraps are serialized by an advisory lock, and
+	in "check" mode the ones that waited skip the work another process just did.
+
+	metadata_index_keys are user_metadata keys filtered often; on SQLite each
+	gets a json_extract() expression index.
+
+	Returns:
+		True if the schema was created or refreshed
+
+	Raises:
+		ValueError: If mode is not one of False, "check" or "create", or a
+			metadata key is invalid
+	"""
+	if mode is False:
+		return False
+	if mode not in ("check", "create"):
+		raise ValueError(f"Unsupported create_schema mode: {mode!r}")
+
+	metadata_index_keys = [validate_metadata_key(key) for key in metadata_index_keys]
+	expected = _expected_versions(search_backend, metadata_index_keys)
+	if mode == "check" and await _schema_is_current(engine, expected):
+		return False
+
+	async with engine.begin() as conn:
+		await _lock_schema(conn)
+		if (
+			mode == "check"
+			and await conn.run_sync(_has_version_table)
+			and await _versions_match(conn, expected)
+		):
+			return False
+		await _create_schema(conn, search_backend, metadata_index_keys, expected)
+	return True
+
+
+async def migrate_schema(
+	engine: AsyncEngine, search_backend: UserSearchBackend | None = None
+) -> bool:
+	"""
+	Bring tables created by an older version up to date.
+
+	Adds missing nullable columns (init() does too), converts PostgreSQL json
+	columns declared as JSONB, builds missing indexes, including those of
+	search_backend, and drops those in OBSOLETE_INDEXES. On PostgreSQL the
+	indexes are built and dropped CONCURRENTLY outside a transaction; elsewhere
+	everything runs in one transaction. Safe to run more than once.
+
+	Returns:
+		True if anything was changed
+	"""
+	search_indexes = search_backend.indexes() if search_backend is not None else {}
+	concurrent = engine.dialect.name == "postgresql"
+	async with engine.begin() as conn:
+		await _lock_schema(conn)
+		changed = await conn.run_sync(_add_columns)
+		changed = await conn.run_sync(_convert_json_columns) or changed
+		if search_backend is not None:
+			# The search indexes may need objects from setup(), e.g. pg_trgm
+			await search_backend.setup(conn)
+		if not concurrent:
+			changed = await conn.run_sync(_create_indexes, search_indexes) or changed
+
+	if concurrent:
+		changed = await _create_indexes_concurrently(engine, search_indexes) or changed
+
+	async with engine.begin() as conn:
+		await _write_versions(conn, {"schema": SCHEMA_VERSION})
+	return changed
@@ -0,0 +1,16 @@
+"""SQLAlchemy user search backends."""
+
+from .base import UserSearchBackend
+from .factory import SearchBackendName, resolve_search_backend
+from .ilike import IlikeSearchBackend
+from .sqlite_fts import SqliteFtsSearchBackend
+from .trigram import TrigramSearchBackend
+
+__all__ = [
+	"UserSearchBackend",
+	"IlikeSearchBackend",
+	"TrigramSearchBackend",
+	"SqliteFtsSearchBackend",
+	"SearchBackendName",
+	"resolve_search_backend",
+]
@@ -0,0 +1,33 @@
+"""Base class for user search backends."""
+
+from abc import ABC, abstractmethod
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+class UserSearchBackend(ABC):
+	"""
+	Strategy that turns a free-text search term into a filter on the users query.
+
+	Backends that need supporting schema (shadow tables, extensions) create it
+	in setup(), which must be idempotent since init() may run it on every start.
+	Indexes on the users table are declared by indexes() instead: building them
+	locks a large table, so migrate_schema() builds them and init() only
+	reports the missing ones.
+	"""
+
+	name: str
+
+	async def setup(self, conn: AsyncConnection) -> None:
+		"""Create the schema objects this backend relies on"""
+		return None
+
+	def indexes(self) -> dict[str, str]:
+		"""Indexes on users by name, each as the CREATE INDEX text after its name"""
+		return {}
+
+	@abstractmethod
+	def apply(self, stmt: Select, search: str) -> Select:
+		"""Restrict a users select to rows matching the search term"""
+		pass
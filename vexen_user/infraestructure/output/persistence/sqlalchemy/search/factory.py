@@ -0,0 +1,34 @@
+"""Search backend selection."""
+
+from typing import Literal
+
+from .base import UserSearchBackend
+from .ilike import IlikeSearchBackend
+from .sqlite_fts import SqliteFtsSearchBackend
+from .trigram import TrigramSearchBackend
+
+SearchBackendName = Literal["ilike", "trigram", "fts5", "auto"]
+
+
+def resolve_search_backend(
+	backend: SearchBackendName | UserSearchBackend, dialect_name: str
+) -> UserSearchBackend:
+	"""
+	Resolve a backend name (or instance) to a search backend.
+
+	"auto" picks trigram on PostgreSQL, fts5 on SQLite and ilike elsewhere.
+	"""
+	if isinstance(backend, UserSearchBackend):
+		return backend
+
+	if backend == "auto":
+		backend = {"postgresql": "trigram", "sqlite": "fts5"}.get(dialect_name, "ilike")
+
+	if backend == "ilike":
+		return IlikeSearchBackend()
+	if backend == "trigram":
+		return TrigramSearchBackend()
+	if backend == "fts5":
+		return SqliteFtsSearchBackend()
+
+	raise ValueError(f"Unsupported search backend: {backend}")
@@ -0,0 +1,20 @@
+"""Plain ILIKE search backend."""
+
+from sqlalchemy import Select, or_
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+
+from .base import UserSearchBackend
+
+
+class IlikeSearchBackend(UserSearchBackend):
+	"""Substring search with ILIKE on name and email (sequential scan without extra indexes)"""
+
+	name = "ilike"
+
+	def apply(self, stmt: Select, search: str) -> Select:
+		return stmt.where(
+			or_(
+				UserModel.name.ilike(f"%{search}%"),
+				UserModel.email.ilike(f"%{search}%"),
+			)
+		)
@@ -0,0 +1,117 @@
+"""SQLite FTS5 search backend."""
+
+from sqlalchemy import Select, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from vexen_user.infraestructure.output.persistence.sqlalchemy.models.user import UserModel
+
+from .ilike import IlikeSearchBackend
+
+# The trigram tokenizer needs at least three characters to match anything
+MIN_TRIGRAM_LENGTH = 3
+
+
+# Triggers of the layout that mirrored users through its implicit rowid
+LEGACY_TRIGGERS = ("users_fts_ai", "users_fts_ad", "users_fts_au")
+
+
+class SqliteFtsSearchBackend(IlikeSearchBackend):
+	"""
+	Substring search through an FTS5 trigram shadow table on SQLite.
+
+	users_fts is a regular FTS5 table over (name, email). users has no INTEGER
+	PRIMARY KEY, so its implicit rowids can change on VACUUM; users_fts_keys
+	gives every user id a stable integer key instead, which is the rowid of its
+	users_fts row. Triggers keep both in sync on every insert, update and
+	delete, so repository writes need no extra work. Terms shorter than three
+	characters fall back to ILIKE.
+	"""
+
+	name = "fts5"
+
+	async def setup(self, conn: AsyncConnection) -> None:
+		if conn.dialect.name != "sqlite":
+			raise ValueError("FTS5 search backend requires SQLite")
+
+		# Earlier versions used an external-content table keyed by users.rowid
+		legacy = await conn.scalar(
+			text(
+				"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts' "
+				"AND sql LIKE '%content=''users''%'"
+			)
+		)
+		if legacy:
+			for trigger in LEGACY_TRIGGERS:
+				await conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+			await conn.execute(text("DROP TABLE users_fts"))
+
+		exists = await conn.scalar(
+			text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts_keys'")
+		)
+
+		await conn.execute(
+			text(
+				"CREATE TABLE IF NOT EXISTS users_fts_keys ("
+				"rowid INTEGER PRIMARY KEY, user_id BLOB NOT NULL UNIQUE)"
+			)
+		)
+		await conn.execute(
+			text(
+				"CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5("
+				"name, email, tokenize='trigram')"
+			)
+		)
+		await conn.execute(
+			text(
+				"CREATE TRIGGER IF NOT EXISTS users_fts_keys_ai AFTER INSERT ON users BEGIN "
+				"INSERT INTO users_fts_keys(user_id) VALUES (new.id); "
+				"INSERT INTO users_fts(rowid, name, email) "
+				"SELECT rowid, new.name, new.email FROM users_fts_keys WHERE user_id = new.id; "
+				"END"
+			)
+		)
+		await conn.execute(
+			text(
+				"CREATE TRIGGER IF NOT EXISTS users_fts_keys_ad AFTER DELETE ON users BEGIN "
+				"DELETE FROM users_fts WHERE rowid = "
+				"(SELECT rowid FROM users_fts_keys WHERE user_id = old.id); "
+				"DELETE FROM users_fts_keys WHERE user_id = old.id; "
+				"END"
+			)
+		)
+		await conn.execute(
+			text(
+				"CREATE TRIGGER IF NOT EXISTS users_fts_keys_au "
+				"AFTER UPDATE OF id, name, email ON users BEGIN "
+				"UPDATE users_fts_keys SET user_id = new.id WHERE user_id = old.id; "
+				"UPDATE users_fts SET name = new.name, email = new.email WHERE rowid = "
+				"(SELECT rowid FROM users_fts_keys WHERE user_id = new.id); "
+				"END"
+			)
+		)
+
+		# Index rows that existed before the shadow tables were created
+		if not exists:
+			await conn.execute(text("DELETE FROM users_fts"))
+			await conn.execute(text("INSERT INTO users_fts_keys(user_id) SELECT id FROM users"))
+			await conn.execute(
+				text(
+					"INSERT INTO users_fts(rowid, name, email) "
+					"SELECT k.rowid, u.name, u.email "
+					"FROM users_fts_keys AS k JOIN users AS u ON u.id = k.user_id"
+				)
+			)
+
+	def apply(self, stmt: Select, search: str) -> Select:
+		if len(search) < MIN_TRIGRAM_LENGTH:
+			return super().apply(stmt, search)
+
+		# Quote the term as an FTS5 phrase so operators in user input are literal
+		phrase = '"' + search.replace('"', '""') + '"'
+		matches = (
+			select(literal_column("users_fts_keys.user_id"))
+			.select_from(
+				text("users_fts JOIN users_fts_keys ON users_fts_keys.rowid = users_fts.rowid")
+			)
+			.where(literal_column("users_fts").op("MATCH")(phrase))
+		)
+		return stmt.where(UserModel.id.in_(matches))
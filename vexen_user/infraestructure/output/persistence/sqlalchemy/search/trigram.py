@@ -0,0 +1,35 @@
+"""PostgreSQL pg_trgm search backend."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .ilike import IlikeSearchBackend
+
+
+class TrigramSearchBackend(IlikeSearchBackend):
+	"""
+	ILIKE search served by pg_trgm GIN indexes on name and email.
+
+	The query is the same as IlikeSearchBackend; PostgreSQL uses the trigram
+	indexes for '%term%' patterns instead of scanning the table. The indexes
+	only cover live users, like every search, and are built by migrate_schema().
+	"""
+
+	name = "trigram"
+
+	async def setup(self, conn: AsyncConnection) -> None:
+		if conn.dialect.name != "postgresql":
+			raise ValueError("Trigram search backend requires PostgreSQL")
+
+		# Only adds the operator classes to the catalog; no table is touched
+		await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+	def indexes(self) -> dict[str, str]:
+		return {
+			"ix_users_live_name_trgm": (
+				"ON users USING gin (name gin_trgm_ops) WHERE deleted_at IS NULL"
+			),
+			"ix_users_live_email_trgm": (
+				"ON users USING gin (email gin_trgm_ops) WHERE deleted_at IS NULL"
+			),
+		}
@@ -0,0 +1,66 @@
+"""Small in-process TTL/LRU cache."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+	"""
+	Bounded mapping whose entries expire after a time-to-live.
+
+	When full, the least recently used entry is evicted. Not thread-safe; it is
+	meant to be used from a single event loop.
+
+	Attributes:
+		maxsize: Maximum number of entries kept
+		ttl: Seconds an entry stays valid (None = never expires)
+	"""
+
+	def __init__(self, maxsize: int = 1024, ttl: float | None = 60.0):
+		if maxsize <= 0:
+			raise ValueError("maxsize must be greater than 0")
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		"""Get a value, or default if missing or expired"""
+		entry = self._data.get(key)
+		if entry is None:
+			return default
+
+		expires_at, value = entry
+		if expires_at < time.monotonic():
+			del self._data[key]
+			return default
+
+		self._data.move_to_end(key)
+		return value
+
+	def set(self, key: Hashable, value: Any) -> None:
+		"""Store a value, evicting the least recently used entry if full"""
+		expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+		self._data[key] = (expires_at, value)
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+	def pop(self, key: Hashable, default: Any = None) -> Any:
+		"""Remove a key and return its value (expired entries return default)"""
+		entry = self._data.pop(key, None)
+		if entry is None or entry[0] < time.monotonic():
+			return default
+		return entry[1]
+
+	def clear(self) -> None:
+		"""Remove all entries"""
+		self._data.clear()
+
+	def __contains__(self, key: Hashable) -> bool:
+		entry = self._data.get(key)
+		return entry is not None and entry[0] >= time.monotonic()
+
+	def __len__(self) -> int:
+		return len(self._data)
@@ -0,0 +1,232 @@
+"""Timing instrumentation for repository calls."""
+
+import bisect
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+DEFAULT_BUCKETS_MS = (1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+
+
+class Span(Protocol):
+	"""The subset of the OpenTelemetry Span API used here"""
+
+	def set_attribute(self, key: str, value: Any) -> None: ...
+
+
+class Tracer(Protocol):
+	"""The subset of the OpenTelemetry Tracer API used here"""
+
+	def start_as_current_span(self, name: str) -> Any: ...
+
+
+@dataclass(slots=True)
+class OperationRecord:
+	"""
+	Timing of one repository call.
+
+	Attributes:
+		name: Repository method name (e.g. "list_paginated")
+		duration: Seconds spent in the call, including acquire
+		acquire: Seconds spent acquiring the session's connection (None when the
+			call reused a transaction's session)
+		rows: Rows returned or affected, when known
+		error: Exception raised by the call, if any
+	"""
+
+	name: str
+	duration: float = 0.0
+	acquire: float | None = None
+	rows: int | None = None
+	error: BaseException | None = None
+
+
+class LatencyHistogram:
+	"""Fixed-bucket latency histogram for one operation"""
+
+	def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+		self.bounds = tuple(buckets_ms)
+		self.counts = [0] * (len(self.bounds) + 1)
+		self.count = 0
+		self.errors = 0
+		self.rows = 0
+		self.total_ms = 0.0
+		self.max_ms = 0.0
+		self.acquire_total_ms = 0.0
+		self.acquire_count = 0
+
+	def add(self, record: OperationRecord) -> None:
+		duration_ms = record.duration * 1000
+		self.counts[bisect.bisect_left(self.bounds, duration_ms)] += 1
+		self.count += 1
+		self.total_ms += duration_ms
+		self.max_ms = max(self.max_ms, duration_ms)
+		if record.error is not None:
+			self.errors += 1
+		if record.rows:
+			self.rows += record.rows
+		if record.acquire is not None:
+			self.acquire_total_ms += record.acquire * 1000
+			self.acquire_count += 1
+
+	def percentile_ms(self, quantile: float) -> float | None:
+		"""Upper bound of the bucket holding the quantile (max observed for the last bucket)"""
+		if not self.count:
+			return None
+		target = quantile * self.count
+		cumulative = 0
+		for index, bucket_count in enumerate(self.counts):
+			cumulative += bucket_count
+			if cumulative >= target and bucket_count:
+				return self.bounds[index] if index < len(self.bounds) else self.max_ms
+		return self.max_ms
+
+	def snapshot(self) -> dict:
+		return {
+			"count": self.count,
+			"errors": self.errors,
+			"rows": self.rows,
+			"mean_ms": self.total_ms / self.count if self.count else None,
+			"p50_ms": self.percentile_ms(0.50),
+			"p99_ms": self.percentile_ms(0.99),
+			"max_ms": self.max_ms if self.count else None,
+			"acquire_mean_ms": (
+				self.acquire_total_ms / self.acquire_count if self.acquire_count else None
+			),
+			"buckets": {
+				**{
+					f"le_{bound:g}": count
+					for bound, count in zip(self.bounds, self.counts[:-1], strict=True)
+				},
+				"le_inf": self.counts[-1],
+			},
+		}
+
+
+class Instrumentation:
+	"""
+	Collects per-method latency histograms for repository calls.
+
+	Every call is also reported to the optional callback as an OperationRecord
+	and, with a tracer, wrapped in a span named "<prefix>.<method>". Any
+	OpenTelemetry Tracer works; spans get db.operation.name,
+	vexen_user.rows and vexen_user.acquire_ms attributes.
+
+	Repositories only wrap their methods when an instance is configured, so
+	disabled instrumentation costs nothing.
+	"""
+
+	def __init__(
+		self,
+		callback: Callable[[OperationRecord], None] | None = None,
+		tracer: Tracer | None = None,
+		buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS,
+		prefix: str = "vexen_user",
+	):
+		"""
+		Args:
+			callback: Called with the OperationRecord of every finished call
+			tracer: OpenTelemetry-compatible tracer for per-call spans
+			buckets_ms: Upper bounds of the latency histogram buckets
+			prefix: Prefix of span names
+		"""
+		self.callback = callback
+		self.tracer = tracer
+		self.buckets_ms = tuple(sorted(buckets_ms))
+		self.prefix = prefix
+		self._histograms: dict[str, LatencyHistogram] = {}
+		self._current: ContextVar[OperationRecord | None] = ContextVar(
+			f"vexen_user_operation_{id(self)}", default=None
+		)
+
+	def wrap(self, name: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+		"""Return fn timed and reported under name"""
+
+		@functools.wraps(fn)
+		async def instrumented(*args, **kwargs):
+			# Nested instrumented calls are part of the outer one
+			if self._current.get() is not None:
+				return await fn(*args, **kwargs)
+
+			record = OperationRecord(name=name)
+			token = self._current.set(record)
+			started = time.perf_counter()
+			try:
+				if self.tracer is None:
+					result = await fn(*args, **kwargs)
+					record.rows = count_rows(result)
+				else:
+					with self.tracer.start_as_current_span(f"{self.prefix}.{name}") as span:
+						span.set_attribute("db.operation.name", name)
+						result = await fn(*args, **kwargs)
+						record.rows = count_rows(result)
+						if record.rows is not None:
+							span.set_attribute("vexen_user.rows", record.rows)
+						if record.acquire is not None:
+							span.set_attribute("vexen_user.acquire_ms", record.acquire * 1000)
+				return result
+			except BaseException as e:
+				record.error = e
+				raise
+			finally:
+				record.duration = time.perf_counter() - started
+				self._current.reset(token)
+				self._finish(record)
+
+		return instrumented
+
+	def record_acquire(self, seconds: float) -> None:
+		"""Add connection acquire time to the call running in this context"""
+		record = self._current.get()
+		if record is not None:
+			record.acquire = (record.acquire or 0.0) + seconds
+
+	def snapshot(self) -> dict[str, dict]:
+		"""
+		Get the histograms collected so far.
+
+		Returns:
+			Dictionary by method name with count, errors, rows, mean_ms, p50_ms,
+			p99_ms, max_ms, acquire_mean_ms and bucket counts
+		"""
+		return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+	def reset(self) -> None:
+		"""Drop all collected histograms"""
+		self._histograms.clear()
+
+	def _finish(self, record: OperationRecord) -> None:
+		histogram = self._histograms.get(record.name)
+		if histogram is None:
+			histogram = self._histograms[record.name] = LatencyHistogram(self.buckets_ms)
+		histogram.add(record)
+
+		if self.callback is not None:
+			try:
+				self.callback(record)
+			except Exception:
+				logger.exception("Instrumentation callback failed for %s", record.name)
+
+
+def count_rows(result: Any) -> int | None:
+	"""Rows returned by a repository call, inferred from its result"""
+	if result is None:
+		return 0
+	if isinstance(result, bool):
+		return None
+	if isinstance(result, int):
+		return result
+	if isinstance(result, list):
+		return len(result)
+	if isinstance(result, tuple) and result and isinstance(result[0], list):
+		return len(result[0])
+	if isinstance(result, dict):
+		return None
+	return 1
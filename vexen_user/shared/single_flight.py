@@ -0,0 +1,51 @@
+"""Single-flight deduplication of concurrent async calls."""
+
+import asyncio
+import copy
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+	"""
+	Coalesces concurrent calls that share a key into one execution.
+
+	The first caller for a key starts the call; callers arriving while it is in
+	flight await the same result (or exception). Followers receive a deep copy
+	so results can be mutated independently. Cancelling one caller does not
+	cancel the shared call.
+	"""
+
+	def __init__(self):
+		self._inflight: dict[Hashable, asyncio.Future] = {}
+
+	async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+		"""Run fn() unless a call for key is already in flight, then share its result"""
+		inflight = self._inflight.get(key)
+		if inflight is not None:
+			result = await asyncio.shield(inflight)
+			return copy.deepcopy(result)
+
+		task = asyncio.ensure_future(fn())
+		self._inflight[key] = task
+		task.add_done_callback(lambda _: self._forget(key, task))
+		return await asyncio.shield(task)
+
+	def forget(self, key: Hashable) -> None:
+		"""
+		Detach the call in flight for key, if any.
+
+		Callers already waiting still get its result; later callers start a new
+		call. Used after a write so readers do not join a read that began before it.
+		"""
+		self._inflight.pop(key, None)
+
+	def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+		if self._inflight.get(key) is task:
+			del self._inflight[key]
+		# Mark the exception as retrieved when every waiter was cancelled
+		if not task.cancelled():
+			task.exception()
+
+	def __len__(self) -> int:
+		return len(self._inflight)